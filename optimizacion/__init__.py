@@ -0,0 +1,6 @@
+"""Herramientas compartidas para los problemas de optimización del paper.
+
+Los scripts ``Problema N/Problema N*.py`` se mantienen tal cual fueron
+publicados (referencia y variantes generadas por LLM); este paquete agrupa
+el código que los ejecuta, compara y extiende.
+"""
@@ -0,0 +1,248 @@
+"""Ejecución en lote de todos los scripts ``Problema N*.py``.
+
+Cada script corre en su propio proceso (un pool de workers lanza los
+subprocesos), con timeout individual, y de cada ``LpProblem`` que construye
+se recoge estado, funcional y valores de las variables en una única tabla.
+
+Uso::
+
+    python -m optimizacion.batch                 # todos los scripts
+    python -m optimizacion.batch "Problema 2"    # filtra por texto en la ruta
+    python -m optimizacion.batch -j 8 -t 30 --json resultados.json
+    python -m optimizacion.batch --backend highs  # sin subprocesos (ver abajo)
+
+Con ``--backend`` los scripts no se ejecutan tal cual: ``optimizacion.loader``
+carga sus modelos sin resolverlos y se resuelven en este proceso con
+``optimizacion.solvers.solve``; el tiempo de la tabla es sólo el de la
+resolución.
+
+Las opciones de ``optimizacion.config`` (``--time-limit``, ``--mip-gap``,
+``--threads``, ``--presolve``, ``--solver-seed`` o las variables
+``OPTIMIZACION_*``) se aplican en los dos modos: con ``--backend`` se pasan a
+``solve`` y sin él reemplazan al CBC por defecto de ``prob.solve()`` en cada
+subproceso. Cada fila guarda en ``options`` las que se aplicaron.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import runpy
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import pulp
+
+from optimizacion.config import SolverOptions, add_arguments, install_default
+from optimizacion.results import Result
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPT_GLOB = "Problema */Problema *.py"
+DEFAULT_TIMEOUT = 60.0
+
+
+@dataclass
+class BatchRow:
+    """Una fila de la tabla de resultados: un modelo de un script."""
+
+    script: str
+    problem: str
+    variant: str
+    model: str | None = None
+    status: str = "Not Run"
+    objective: float | None = None
+    variables: dict[str, float | None] = field(default_factory=dict)
+    elapsed: float = 0.0
+    error: str | None = None
+    options: dict = field(default_factory=dict)
+
+
+def discover_scripts(root: Path = REPO_ROOT, filters: list[str] | None = None) -> list[Path]:
+    """Devuelve los scripts de problemas ordenados, opcionalmente filtrados."""
+    scripts = sorted(root.glob(SCRIPT_GLOB))
+    if filters:
+        scripts = [s for s in scripts if any(f in str(s.relative_to(root)) for f in filters)]
+    return scripts
+
+
+def describe_script(path: Path) -> tuple[str, str]:
+    """Separa ``Problema 1_Grok.py`` en (``Problema 1``, ``Grok``)."""
+    problem, _, variant = path.stem.partition("_")
+    return problem, variant or "Referencia"
+
+
+def collect_problems(namespace: dict) -> list[tuple[str, pulp.LpProblem]]:
+    """Busca los ``LpProblem`` distintos definidos en el espacio de nombres de un script."""
+    found = {}
+    for name, obj in namespace.items():
+        if isinstance(obj, pulp.LpProblem) and id(obj) not in found:
+            found[id(obj)] = (name, obj)
+    return list(found.values())
+
+
+def run_script(path: Path) -> list[dict]:
+    """Ejecuta un script en este proceso y devuelve los resultados de sus modelos.
+
+    La salida del script (``print``) se descarta; los errores se propagan.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        namespace = runpy.run_path(str(path), run_name="__main__")
+    results = []
+    for _, prob in collect_problems(namespace):
+        result = Result.from_problem(prob)
+        results.append({"model": prob.name, **asdict(result)})
+    return results
+
+
+def _worker(path: Path) -> None:
+    """Punto de entrada del subproceso: ejecuta ``path`` y escribe JSON por stdout.
+
+    El descriptor 1 se redirige a ``/dev/null`` mientras corre el script para
+    que la salida de CBC (un proceso hijo que hereda el descriptor) no se
+    mezcle con el JSON del resultado.
+    """
+    out = os.fdopen(os.dup(1), "w")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    sys.argv = [str(path)]
+    try:
+        install_default(SolverOptions.from_env())
+        payload = {"results": run_script(path)}
+    except BaseException as exc:  # el script puede llamar a exit() o fallar al importar
+        payload = {"error": f"{type(exc).__name__}: {exc}"}
+    json.dump(payload, out)
+    out.close()
+
+
+def run_one(path: Path, timeout: float = DEFAULT_TIMEOUT, root: Path = REPO_ROOT,
+            options: SolverOptions | None = None) -> list[BatchRow]:
+    """Ejecuta un script en un subproceso y lo convierte en filas de la tabla.
+
+    ``options`` (por defecto, las del entorno) llega al subproceso como
+    variables ``OPTIMIZACION_*``.
+    """
+    options = SolverOptions.from_env() if options is None else options
+    problem, variant = describe_script(path)
+    base = BatchRow(script=str(path.relative_to(root)), problem=problem, variant=variant,
+                    options=options.effective("cbc"))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])),
+               **options.to_env())
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "optimizacion.batch", "--worker", str(path.resolve())],
+            cwd=path.parent,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        base.elapsed = time.perf_counter() - start
+        base.status = "Timeout"
+        base.error = f"superó {timeout:g} s"
+        return [base]
+    base.elapsed = time.perf_counter() - start
+
+    try:
+        payload = json.loads(proc.stdout)
+    except json.JSONDecodeError:
+        base.status = "Error"
+        base.error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"código {proc.returncode}"
+        return [base]
+    if "error" in payload:
+        base.status = "Error"
+        base.error = payload["error"]
+        return [base]
+    if not payload["results"]:
+        base.status = "Error"
+        base.error = "el script no define ningún LpProblem"
+        return [base]
+    return [BatchRow(**{**asdict(base), **res}) for res in payload["results"]]
+
+
+def solve_loaded(path: Path, backend: str = "highs", root: Path = REPO_ROOT,
+                 solver_options: SolverOptions | None = None, **options) -> list[BatchRow]:
+    """Carga los modelos de ``path`` sin ejecutar el solver del script y los resuelve con ``backend``.
+
+    ``solver_options`` se traduce con ``SolverOptions.for_backend``; ``options``
+    se pasa tal cual a ``solve`` (con los nombres del backend).
+    """
+    from optimizacion.loader import load_script
+    from optimizacion.solvers import solve
+
+    if solver_options is not None:
+        options = {**solver_options.for_backend(backend), **options}
+    loaded = load_script(path)
+    base = BatchRow(script=str(path.relative_to(root)), problem=loaded.problem, variant=loaded.variant,
+                    options=solver_options.effective(backend) if solver_options is not None else dict(options))
+    if not loaded.models:
+        base.status = "Error"
+        base.error = loaded.error or "el script no define ningún LpProblem"
+        return [base]
+    rows = []
+    for _, prob in loaded.models:
+        start = time.perf_counter()
+        result = solve(prob, backend, **options)
+        elapsed = time.perf_counter() - start
+        rows.append(BatchRow(**{**asdict(base), "model": prob.name, **asdict(result), "elapsed": elapsed}))
+    return rows
+
+
+def run_batch(scripts: list[Path], jobs: int | None = None, timeout: float = DEFAULT_TIMEOUT,
+              root: Path = REPO_ROOT, options: SolverOptions | None = None) -> list[BatchRow]:
+    """Ejecuta los scripts en paralelo y devuelve las filas en el orden de ``scripts``."""
+    jobs = jobs or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_one, s, timeout, root, options) for s in scripts]
+        return [row for fut in futures for row in fut.result()]
+
+
+def format_table(rows: list[BatchRow]) -> str:
+    """Tabla de texto con una línea por modelo."""
+    header = ("Problema", "Variante", "Estado", "Objetivo", "Vars", "Tiempo (s)")
+    lines = [header]
+    for r in rows:
+        objective = "" if r.objective is None else f"{r.objective:.6g}"
+        status = r.status if r.error is None else f"{r.status} ({r.error})"
+        lines.append((r.problem, r.variant, status, objective, str(len(r.variables)), f"{r.elapsed:.2f}"))
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return "\n".join("  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip() for line in lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Ejecuta en paralelo todos los scripts Problema N*.py")
+    parser.add_argument("filters", nargs="*", help="texto que debe aparecer en la ruta del script")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="procesos en paralelo (por defecto, núcleos)")
+    parser.add_argument("-t", "--timeout", type=float, default=DEFAULT_TIMEOUT, help="timeout por script, en segundos")
+    parser.add_argument("--json", type=Path, help="guarda la tabla completa (con variables) en JSON")
+    parser.add_argument("--backend", help="resuelve los modelos cargados en este proceso (cbc, highs o scipy)")
+    parser.add_argument("--worker", type=Path, help=argparse.SUPPRESS)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        _worker(args.worker)
+        return 0
+
+    options = SolverOptions.from_args(args)
+    scripts = discover_scripts(filters=args.filters)
+    if args.backend:
+        rows = [row for path in scripts for row in solve_loaded(path, args.backend, solver_options=options)]
+    else:
+        rows = run_batch(scripts, jobs=args.jobs, timeout=args.timeout, options=options)
+    print(format_table(rows))
+    if args.json:
+        args.json.write_text(json.dumps([asdict(r) for r in rows], indent=2, ensure_ascii=False), encoding="utf-8")
+    return 0 if all(r.error is None for r in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
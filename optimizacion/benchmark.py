@@ -0,0 +1,275 @@
+"""Tiempos por fase de cada problema y backend, con líneas base en JSON para detectar regresiones.
+
+Fases medidas (en milisegundos):
+
+- ``build``: construcción del modelo (ejecutar el script con
+  ``optimizacion.loader`` o llamar a ``build_model`` con ``--builders``);
+- ``write_mps`` / ``write_lp``: ``prob.writeMPS`` y ``prob.writeLP`` a un
+  archivo temporal (``write_mps`` es la escritura que hace CBC dentro de la
+  resolución; ``write_lp`` se mide aparte, como referencia);
+- ``transfer``: con HiGHS y SciPy, pasar el ``LpProblem`` a matrices
+  (``from_lp``) y cargarlas en HiGHS (``to_highs``);
+- ``solver``: el subproceso de CBC (desde que se lanza hasta que termina) o
+  la llamada a HiGHS/SciPy;
+- ``read``: leer el archivo de solución de CBC y asignar valores, precios
+  sombra y holguras al modelo;
+- ``other``: el resto de ``prob.solve`` (archivos temporales, validaciones).
+
+Las fases se miden interceptando las funciones que llama PuLP
+(``mock.patch.object``), sin reimplementar la resolución. Cada medición se
+repite ``--repeat`` veces y se informa la mediana y el percentil 95.
+
+``--save base.json`` guarda los resultados (con las opciones del solver de
+``optimizacion.config`` efectivas en cada backend); ``--baseline base.json``
+compara con una corrida anterior y termina con código 1 si la mediana de
+alguna fase empeoró más que ``--tolerance`` (y más de ``MIN_DELTA_MS``, para
+no reaccionar al ruido de las fases de microsegundos).
+
+Uso::
+
+    python -m optimizacion.benchmark --repeat 20 --save base.json
+    python -m optimizacion.benchmark --baseline base.json "Problema 5"
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+import numpy as np
+import pulp
+
+from optimizacion import solvers
+from optimizacion.config import SolverOptions, add_arguments
+from optimizacion.batch import REPO_ROOT, discover_scripts
+
+MIN_DELTA_MS = 0.5
+
+
+@dataclass
+class PhaseStats:
+    """Mediana y percentil 95 (en ms) de una fase de un caso con un backend."""
+
+    case: str
+    backend: str
+    phase: str
+    median: float
+    p95: float
+    repeat: int
+
+
+class PhaseTimer:
+    """Acumula por fase el tiempo de las funciones interceptadas con ``intercept``."""
+
+    def __init__(self):
+        self.times: dict[str, float] = defaultdict(float)
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += time.perf_counter() - start
+
+    def intercept(self, owner, attr: str, name: str):
+        """``mock.patch.object`` de ``owner.attr`` por una versión que suma su tiempo a ``name``."""
+        original = getattr(owner, attr)
+
+        def timed(*args, **kwargs):
+            with self.phase(name):
+                return original(*args, **kwargs)
+
+        return mock.patch.object(owner, attr, timed)
+
+    def popen(self, name: str):
+        """Reemplaza ``subprocess.Popen`` por una subclase que mide el lanzamiento y la espera del proceso."""
+        timer = self
+
+        class TimedPopen(subprocess.Popen):
+            def __init__(self, *args, **kwargs):
+                with timer.phase(name):
+                    super().__init__(*args, **kwargs)
+
+            def wait(self, timeout=None):
+                with timer.phase(name):
+                    return super().wait(timeout)
+
+        return mock.patch.object(subprocess, "Popen", TimedPopen)
+
+
+def _interceptors(timer: PhaseTimer, backend: str) -> list:
+    from pulp.apis import coin_api
+
+    if backend == "cbc":
+        reads = ["assignVarsVals", "assignVarsDj", "assignConsPi", "assignConsSlack", "assignStatus"]
+        return [timer.intercept(pulp.LpProblem, "writeMPS", "write_mps"), timer.popen("solver"),
+                timer.intercept(coin_api.COIN_CMD, "readsol_MPS", "read"),
+                *(timer.intercept(pulp.LpProblem, attr, "read") for attr in reads)]
+    patches = [timer.intercept(solvers, "from_lp", "transfer"), timer.intercept(solvers, "_assign", "read")]
+    if backend == "highs":
+        import highspy
+
+        patches += [timer.intercept(solvers, "to_highs", "transfer"), timer.intercept(highspy.Highs, "run", "solver")]
+    else:
+        patches.append(timer.intercept(solvers, "scipy_solve", "solver"))
+    return patches
+
+
+def measure_solve(prob: pulp.LpProblem, backend: str, options: dict | None = None) -> dict[str, float]:
+    """Resuelve ``prob`` una vez con ``backend`` (y ``options`` del backend) y devuelve el tiempo de cada fase, en segundos."""
+    timer = PhaseTimer()
+    with contextlib.ExitStack() as stack:
+        for patch in _interceptors(timer, backend):
+            stack.enter_context(patch)
+        start = time.perf_counter()
+        prob.solve(solvers.get_solver(backend, **(options or {})))
+        total = time.perf_counter() - start
+    times = dict(timer.times)
+    times["other"] = max(total - sum(times.values()), 0.0)
+    return times
+
+
+def _write_lp(prob: pulp.LpProblem, directory: str) -> float:
+    start = time.perf_counter()
+    prob.writeLP(os.path.join(directory, "modelo.lp"))
+    return time.perf_counter() - start
+
+
+def cases(builders: bool = False, filters: list[str] | None = None) -> dict[str, Callable[[], list[pulp.LpProblem]]]:
+    """Casos a medir: nombre -> función que construye sus modelos."""
+    if builders:
+        from optimizacion.problems import PROBLEMS
+
+        return {f"problems.problem{n}": (lambda module=module: [module.build_model()])
+                for n, module in PROBLEMS.items() if not filters or any(f in str(n) for f in filters)}
+    from optimizacion.batch import describe_script
+    from optimizacion.loader import load_script
+
+    found = {}
+    for path in discover_scripts(REPO_ROOT, filters):
+        loaded = load_script(path)
+        if not loaded.models:
+            print(f"se omite {path.name}: {loaded.error or 'sin modelos'}", file=sys.stderr)
+            continue
+        found[" ".join(describe_script(path))] = lambda path=path: [prob for _, prob in load_script(path).models]
+    return found
+
+
+def run(case_builders: dict[str, Callable[[], list[pulp.LpProblem]]], backends: list[str],
+        repeat: int, options: SolverOptions | None = None) -> list[PhaseStats]:
+    """Mide cada caso ``repeat`` veces (tras una corrida de calentamiento) y resume cada fase."""
+    options = options or SolverOptions()
+    stats = []
+    with tempfile.TemporaryDirectory() as directory:
+        for case, build in case_builders.items():
+            samples: dict[tuple[str, str], list[float]] = defaultdict(list)
+            for i in range(repeat + 1):
+                start = time.perf_counter()
+                models = build()
+                elapsed = {("", "build"): time.perf_counter() - start,
+                           ("cbc", "write_lp"): sum(_write_lp(prob, directory) for prob in models)}
+                for backend in backends:
+                    for prob in models:
+                        for phase, seconds in measure_solve(prob, backend, options.for_backend(backend)).items():
+                            elapsed[backend, phase] = elapsed.get((backend, phase), 0.0) + seconds
+                if i:  # la primera vuelta calienta importaciones y cachés
+                    for key, seconds in elapsed.items():
+                        if key[0] in ("", *backends):
+                            samples[key].append(seconds * 1000)
+            for (backend, phase), values in samples.items():
+                stats.append(PhaseStats(case=case, backend=backend, phase=phase, median=float(np.median(values)),
+                                        p95=float(np.percentile(values, 95)), repeat=len(values)))
+    return stats
+
+
+def save(stats: list[PhaseStats], path: Path, options: dict | None = None) -> None:
+    """Guarda ``stats`` con la máquina, las versiones y ``options`` (opciones efectivas por backend)."""
+    meta = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pulp": pulp.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "options": options or {},
+    }
+    path.write_text(json.dumps({"meta": meta, "results": [asdict(s) for s in stats]}, indent=2), encoding="utf-8")
+
+
+def load(path: Path) -> dict[tuple[str, str, str], PhaseStats]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {(r["case"], r["backend"], r["phase"]): PhaseStats(**r) for r in data["results"]}
+
+
+def regressions(stats: list[PhaseStats], baseline: dict[tuple[str, str, str], PhaseStats],
+                tolerance: float) -> list[tuple[PhaseStats, PhaseStats]]:
+    """Pares (actual, base) cuya mediana empeoró más que ``tolerance`` y más que ``MIN_DELTA_MS``."""
+    worse = []
+    for s in stats:
+        base = baseline.get((s.case, s.backend, s.phase))
+        if base and s.median > base.median * (1 + tolerance) and s.median - base.median > MIN_DELTA_MS:
+            worse.append((s, base))
+    return worse
+
+
+def format_table(stats: list[PhaseStats], baseline: dict | None = None) -> str:
+    header = ("Caso", "Backend", "Fase", "Mediana (ms)", "p95 (ms)") + (("Base (ms)", "Cambio") if baseline else ())
+    lines = [header]
+    for s in stats:
+        line = (s.case, s.backend or "-", s.phase, f"{s.median:.3f}", f"{s.p95:.3f}")
+        if baseline:
+            base = baseline.get((s.case, s.backend, s.phase))
+            line += ("", "") if base is None else (f"{base.median:.3f}", f"{s.median / base.median - 1:+.0%}"
+                                                   if base.median else "")
+        lines.append(line)
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return "\n".join("  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip() for line in lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Tiempo por fase (construcción, escritura, solver, lectura)")
+    parser.add_argument("filters", nargs="*", help="subcadenas de la ruta del script (o números con --builders)")
+    parser.add_argument("--builders", action="store_true", help="medir build_model de optimizacion.problems")
+    parser.add_argument("--backend", choices=solvers.BACKENDS, action="append")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--save", type=Path, help="guarda los resultados como línea base JSON")
+    parser.add_argument("--baseline", type=Path, help="línea base JSON con la que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="empeoramiento relativo admitido")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    backends = args.backend or list(solvers.BACKENDS)
+    options = SolverOptions.from_args(args)
+    effective = {backend: options.effective(backend) for backend in backends}
+    stats = run(cases(args.builders, args.filters), backends, args.repeat, options)
+    baseline = load(args.baseline) if args.baseline else None
+    print(format_table(stats, baseline))
+    if not options.is_default():
+        print(f"opciones del solver: {effective}")
+    if args.save:
+        save(stats, args.save, effective)
+    if baseline:
+        worse = regressions(stats, baseline, args.tolerance)
+        for s, base in worse:
+            print(f"regresión: {s.case} {s.backend} {s.phase}: {base.median:.3f} -> {s.median:.3f} ms",
+                  file=sys.stderr)
+        return 1 if worse else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""Caché de modelos construidos, indexada por el hash de los parámetros.
+
+Construir las expresiones de PuLP es buena parte del tiempo en los barridos
+sobre estos modelos chicos; ``ModelCache`` devuelve el mismo ``LpProblem``
+para parámetros iguales y, si se le da un directorio, guarda el MPS de cada
+modelo para reutilizarlo entre ejecuciones sin volver a armar expresiones.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+import pulp
+
+from optimizacion.params import merge_params, params_hash
+from optimizacion.problems import PROBLEMS
+
+
+class ModelCache:
+    """Caché LRU de ``builder(params)`` con respaldo opcional en archivos MPS.
+
+    El ``LpProblem`` devuelto se comparte entre llamadas: resolverlo de nuevo
+    es válido, pero las modificaciones quedan en la caché.
+    """
+
+    def __init__(self, builder: Callable[[dict], pulp.LpProblem], defaults: dict | None = None,
+                 maxsize: int = 128, directory: str | Path | None = None):
+        self.builder = builder
+        self.defaults = defaults or {}
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        self._models: OrderedDict[str, pulp.LpProblem] = OrderedDict()
+        self.hits = self.misses = 0
+
+    def key(self, params: dict | None = None) -> str:
+        """Hash de los parámetros completos (``defaults`` + ``params``)."""
+        return params_hash(merge_params(self.defaults, params))
+
+    def mps_path(self, params: dict | None = None) -> Path | None:
+        """Ruta del MPS asociado a ``params`` (``None`` si no hay directorio)."""
+        if self.directory is None:
+            return None
+        return self.directory / f"{self.key(params)}.mps"
+
+    def get(self, params: dict | None = None) -> pulp.LpProblem:
+        """Devuelve el modelo para ``params``, construyéndolo sólo si no está en caché."""
+        key = self.key(params)
+        if key in self._models:
+            self.hits += 1
+            self._models.move_to_end(key)
+            return self._models[key]
+        self.misses += 1
+
+        path = self.mps_path(params)
+        if path is not None and path.exists():
+            _, prob = pulp.LpProblem.fromMPS(str(path), sense=self._sense(path))
+        else:
+            prob = self.builder(params)
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                prob.writeMPS(str(path))
+
+        self._models[key] = prob
+        if len(self._models) > self.maxsize:
+            self._models.popitem(last=False)
+        return prob
+
+    def clear(self) -> None:
+        self._models.clear()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def _sense(path: Path) -> int:
+        # writeMPS deja el sentido en un comentario "*SENSE:Maximize" del encabezado
+        with open(path) as fh:
+            for line in fh:
+                if not line.startswith("*"):
+                    break
+                if line.startswith("*SENSE:"):
+                    return pulp.LpMaximize if "Max" in line else pulp.LpMinimize
+        return pulp.LpMinimize
+
+
+_CACHES: dict[int, ModelCache] = {}
+
+
+def get_model(problem: int, params: dict | None = None) -> pulp.LpProblem:
+    """Modelo del Problema ``problem`` para ``params``, desde la caché del proceso."""
+    if problem not in _CACHES:
+        module = PROBLEMS[problem]
+        _CACHES[problem] = ModelCache(module.build_model, module.DEFAULT_PARAMS)
+    return _CACHES[problem].get(params)
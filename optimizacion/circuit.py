@@ -0,0 +1,283 @@
+"""Potencia disipada ``P = V**2 / R`` en una red de resistencias, como programa cuadrático convexo.
+
+``Problema 6.py`` deja las resistencias libres y fija la corriente de cada
+una, así que ``P = I**2 * R = I * V`` es lineal en la tensión (el script de
+Deepseek minimiza directamente ``4*V1 + 6*V2 + ...``). Acá las resistencias
+son datos y las variables son las tensiones de los nodos: cada resistencia
+``e`` entre los nodos ``a`` y ``b`` (o tierra) disipa ``(v_a - v_b)**2 / R_e``
+y la potencia total es ``v @ G @ v``, con ``G`` la matriz de conductancias
+nodales (definida positiva si todo nodo llega a tierra). Las restricciones
+son cotas de tensión por nodo (una fuente es ``lower == upper``) y,
+opcionalmente, corrientes inyectadas fijas (``(G @ v)_n == I_n``, ley de
+Kirchhoff).
+
+``solve_qp`` es un método de conjunto activo primal-dual: en cada iteración
+fija las tensiones que están en una cota y resuelve el sistema KKT de las
+demás (gradiente conjugado precondicionado si no hay corrientes fijas, LU
+dispersa si las hay). ``G`` es una M-matriz, así que el método termina en
+pocas iteraciones incluso con miles de nodos.
+``solve_highs`` resuelve el mismo problema con el solver QP de HiGHS, como
+referencia; es mucho más lento (unos segundos con mil nodos, y con cinco mil
+no termina en minutos), así que tiene un límite de tiempo y devuelve
+``"Time Limit"`` si lo alcanza.
+
+``from_problem6`` arma la red del Problema 6 con las resistencias que elige
+el LP; el QP tiene que dar las mismas tensiones, corrientes y potencia.
+
+Uso::
+
+    python -m optimizacion.circuit
+    python -m optimizacion.circuit --nodes 50000 --resistors 150000
+    python -m optimizacion.circuit --nodes 1000 --resistors 3000 --highs
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import cg, splu
+
+TOL = 1e-9
+GROUND = -1
+
+
+@dataclass
+class Circuit:
+    """Red de resistencias: ``tail[e]``/``head[e]`` son índices de nodo (``GROUND`` = tierra)."""
+
+    nodes: list[str]
+    tail: np.ndarray
+    head: np.ndarray
+    resistance: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    injection: dict[str, float] = field(default_factory=dict)
+    names: list[str] | None = None
+
+    def incidence(self) -> sparse.csr_matrix:
+        """Matriz ``(E, N)`` con ``+1`` en ``tail`` y ``-1`` en ``head``; la tierra no tiene columna."""
+        E, N = len(self.resistance), len(self.nodes)
+        rows = np.r_[np.arange(E), np.arange(E)]
+        cols = np.r_[self.tail, self.head]
+        vals = np.r_[np.ones(E), -np.ones(E)]
+        keep = cols != GROUND
+        return sparse.csr_matrix((vals[keep], (rows[keep], cols[keep])), shape=(E, N))
+
+    def conductance(self) -> sparse.csc_matrix:
+        """Matriz de conductancias nodales ``G``: la potencia es ``v @ G @ v``."""
+        B = self.incidence()
+        return (B.T @ sparse.diags(1.0 / self.resistance) @ B).tocsc()
+
+
+@dataclass
+class CircuitResult:
+    """Tensiones, corrientes por resistencia y potencia total."""
+
+    status: str
+    power: float | None
+    voltages: np.ndarray | None = field(default=None, repr=False)
+    currents: np.ndarray | None = field(default=None, repr=False)
+    iterations: int = 0
+    elapsed: float = 0.0
+
+
+def _kcl(circuit: Circuit, G: sparse.csc_matrix) -> tuple[sparse.csr_matrix, np.ndarray]:
+    index = {name: k for k, name in enumerate(circuit.nodes)}
+    rows = [index[n] for n in circuit.injection]
+    return G.tocsr()[rows], np.array(list(circuit.injection.values()), dtype=float)
+
+
+def solve_qp(H, q, lower, upper, A_eq=None, b_eq=None, max_iter: int = 200,
+             x0=None) -> tuple[np.ndarray, np.ndarray, int]:
+    """Mínimo de ``x @ H @ x / 2 + q @ x`` con ``lower <= x <= upper`` y ``A_eq @ x == b_eq``.
+
+    Conjunto activo primal-dual: con el multiplicador ``mu`` de las cotas
+    (negativo en la inferior, positivo en la superior), una variable va a su
+    cota inferior si ``mu + x - lower < 0`` y a la superior si
+    ``mu + x - upper > 0``; el resto se obtiene del sistema KKT reducido. Se
+    detiene cuando los conjuntos no cambian. Devuelve ``(x, lam, iteraciones)``
+    con ``lam`` los multiplicadores de ``A_eq``.
+    """
+    H = sparse.csc_matrix(H)
+    n = H.shape[0]
+    q, lower, upper = (np.asarray(a, dtype=float) for a in (q, lower, upper))
+    A = sparse.csr_matrix((0, n)) if A_eq is None else sparse.csr_matrix(A_eq)
+    b = np.zeros(0) if b_eq is None else np.asarray(b_eq, dtype=float)
+    m = A.shape[0]
+    fixed = upper - lower <= TOL
+    x = np.clip(np.zeros(n) if x0 is None else np.asarray(x0, dtype=float), lower, upper)
+    mu, lam = np.zeros(n), np.zeros(m)
+    active = None
+    for iteration in range(1, max_iter + 1):
+        at_lower = fixed | (mu + x - lower < -TOL)
+        at_upper = ~at_lower & (mu + x - upper > TOL)
+        current = (at_lower, at_upper)
+        if active is not None and all(np.array_equal(a, b) for a, b in zip(current, active)):
+            return x, lam, iteration - 1
+        active = current
+        free = ~(at_lower | at_upper)
+        x = np.where(at_lower, lower, np.where(at_upper, upper, x))
+        F, X = np.flatnonzero(free), np.flatnonzero(~free)
+        rhs = np.r_[-q[F] - H[F][:, X] @ x[X], b - A[:, X] @ x[X]]
+        H_FF = H[F][:, F]
+        if m:
+            K = sparse.bmat([[H_FF, A[:, F].T], [A[:, F], None]], format="csc")
+            solution = splu(K, permc_spec="MMD_AT_PLUS_A").solve(rhs)
+            x[F], lam = solution[:len(F)], solution[len(F):]
+        elif len(F):
+            # H_FF es simétrica definida positiva: gradiente conjugado con precondicionador diagonal,
+            # que en redes malladas evita el relleno de la factorización
+            x[F], info = cg(H_FF, rhs, x0=x[F], rtol=1e-12, maxiter=10 * len(F),
+                            M=sparse.diags(1.0 / H_FF.diagonal()))
+            if info:
+                x[F] = splu(H_FF, permc_spec="MMD_AT_PLUS_A").solve(rhs)
+        mu = -(H @ x + q + A.T @ lam)
+        mu[F] = 0.0
+    raise RuntimeError(f"solve_qp: sin convergencia en {max_iter} iteraciones")
+
+
+def _result(circuit: Circuit, G, v, iterations: int, t0: float) -> CircuitResult:
+    B = circuit.incidence()
+    return CircuitResult(status="Optimal", power=float(v @ (G @ v)), voltages=v, currents=(B @ v) / circuit.resistance,
+                         iterations=iterations, elapsed=time.perf_counter() - t0)
+
+
+def solve_circuit(circuit: Circuit, max_iter: int = 200) -> CircuitResult:
+    """Tensiones de mínima potencia con ``solve_qp`` (``H = 2 G``, sin término lineal)."""
+    t0 = time.perf_counter()
+    G = circuit.conductance()
+    A, b = _kcl(circuit, G)
+    try:
+        v, _, iterations = solve_qp(2 * G, np.zeros(len(circuit.nodes)), circuit.lower, circuit.upper,
+                                    A if len(b) else None, b if len(b) else None, max_iter)
+    except (RuntimeError, ValueError):  # sin convergencia o KKT singular (restricciones incompatibles)
+        return CircuitResult(status="Not Solved", power=None, elapsed=time.perf_counter() - t0)
+    return _result(circuit, G, v, iterations, t0)
+
+
+def solve_highs(circuit: Circuit, time_limit: float = 60.0) -> CircuitResult:
+    """El mismo QP con el solver cuadrático de HiGHS (paquete opcional ``highspy``), con ``time_limit`` segundos."""
+    import highspy
+
+    from optimizacion.matrix import run_highs
+
+    t0 = time.perf_counter()
+    G = circuit.conductance()
+    A, b = _kcl(circuit, G)
+    n = len(circuit.nodes)
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    h.setOptionValue("time_limit", float(time_limit))
+    h.addVars(n, circuit.lower, circuit.upper)
+    if len(b):
+        A = A.tocsr()
+        h.addRows(len(b), b, b, A.nnz, A.indptr[:-1].astype(np.int32), A.indices.astype(np.int32), A.data)
+    lower = sparse.tril(2 * G, format="csc")
+    h.passHessian(n, lower.nnz, highspy.HessianFormat.kTriangular, lower.indptr.astype(np.int32),
+                  lower.indices.astype(np.int32), lower.data)
+    status = run_highs(h)
+    if h.getModelStatus() == highspy.HighsModelStatus.kTimeLimit:
+        status = "Time Limit"
+    if status != "Optimal":
+        return CircuitResult(status=status, power=None, elapsed=time.perf_counter() - t0)
+    return _result(circuit, G, np.asarray(h.getSolution().col_value), 0, t0)
+
+
+def from_problem6(params: dict | None = None) -> tuple[Circuit, float]:
+    """Red del Problema 6 con las resistencias óptimas del LP, y el objetivo del LP.
+
+    Cada grupo es un nodo con sus resistencias a tierra; con
+    ``R_i = V_g / I_i`` la potencia ``V_g**2 / R_i`` coincide con ``I_i**2 * R_i``
+    del LP en la solución del LP.
+    """
+    from optimizacion.matrix import solve_matrix
+    from optimizacion.params import merge_params
+    from optimizacion.problems import problem6
+
+    p = merge_params(problem6.DEFAULT_PARAMS, params)
+    lp = solve_matrix(problem6.build_matrices(p))
+    if lp.status != "Optimal":
+        raise ValueError(f"el LP del Problema 6 no es óptimo: {lp.status}")
+    groups = list(p["groups"])
+    resistors = [(g, r) for g in groups for r in p["groups"][g]]
+    low, high = (np.array([p["voltage_bounds"][g][k] for g in groups], dtype=float) for k in (0, 1))
+    circuit = Circuit(
+        nodes=groups,
+        tail=np.array([groups.index(g) for g, _ in resistors]), head=np.full(len(resistors), GROUND),
+        resistance=np.array([lp.variables[r] for _, r in resistors]), lower=low, upper=high,
+        names=[r for _, r in resistors],
+    )
+    return circuit, lp.objective
+
+
+def random_circuit(n_nodes: int, n_resistors: int, seed: int = 0) -> Circuit:
+    """Red conexa aleatoria: un árbol más cuerdas, algunos nodos a tierra, fuentes de 10 V y cargas con mínimo.
+
+    Resistencias entre 1 y 100 ohm; el 1 % de los nodos son fuentes fijas en
+    10 V, el 10 % son cargas con tensión mínima entre 4 y 8 V y el resto
+    tiene cotas 0..10 V.
+    """
+    rng = np.random.default_rng(seed)
+    k = np.arange(1, n_nodes)
+    tree_tail, tree_head = k, rng.integers(0, k)
+    n_ground = max(1, n_nodes // 20)
+    n_extra = max(n_resistors - (n_nodes - 1) - n_ground, 0)
+    extra_tail = rng.integers(0, n_nodes, n_extra)
+    extra_head = (extra_tail + rng.integers(1, n_nodes, n_extra)) % n_nodes
+    ground = rng.choice(n_nodes, n_ground, replace=False)
+    tail = np.r_[tree_tail, extra_tail, ground]
+    head = np.r_[tree_head, extra_head, np.full(n_ground, GROUND)]
+    lower, upper = np.zeros(n_nodes), np.full(n_nodes, 10.0)
+    order = rng.permutation(n_nodes)
+    sources, loads = order[:max(1, n_nodes // 100)], order[max(1, n_nodes // 100):n_nodes // 10 + 1]
+    lower[sources] = 10.0
+    lower[loads] = rng.uniform(4, 8, len(loads)).round(1)
+    return Circuit(nodes=[f"N{i}" for i in range(n_nodes)], tail=tail, head=head,
+                   resistance=rng.uniform(1, 100, len(tail)).round(1), lower=lower, upper=upper)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Potencia mínima V^2/R en una red de resistencias (QP)")
+    parser.add_argument("--nodes", type=int, help="red aleatoria en lugar de la del Problema 6")
+    parser.add_argument("--resistors", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--highs", action="store_true", help="comparar con el solver QP de HiGHS")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="segundos para el QP de HiGHS")
+    args = parser.parse_args(argv)
+
+    if args.nodes:
+        circuit, reference = random_circuit(args.nodes, args.resistors or 3 * args.nodes, args.seed), None
+        print(f"red aleatoria: {len(circuit.nodes)} nodos, {len(circuit.resistance)} resistencias")
+    else:
+        circuit, reference = from_problem6()
+        print(f"Problema 6: LP con corrientes fijas, potencia {reference:.6g} W")
+
+    result = solve_circuit(circuit)
+    power = "-" if result.power is None else f"{result.power:.6g}"
+    print(f"QP (conjunto activo): {result.status}, potencia {power} W, {result.iterations} iteraciones "
+          f"en {result.elapsed * 1000:.1f} ms")
+    if reference is not None and result.power is not None:
+        for node, v in zip(circuit.nodes, result.voltages):
+            print(f"  {node} = {v:.6g} V")
+        for name, i in zip(circuit.names, result.currents):
+            print(f"  I({name}) = {i:.6g} A")
+        print(f"diferencia con el LP: {abs(result.power - reference):.2e} W")
+    if args.highs:
+        highs = solve_highs(circuit, args.time_limit)
+        if highs.status == "Time Limit":
+            print(f"QP (HiGHS): sin solución tras el límite de {args.time_limit:g} s; "
+                  "comparar con una red más chica (--nodes 1000) o subir --time-limit")
+            return 0
+        power = "-" if highs.power is None else f"{highs.power:.6g}"
+        print(f"QP (HiGHS): {highs.status}, potencia {power} W en {highs.elapsed * 1000:.1f} ms")
+        if highs.power is not None and result.power is not None:
+            print(f"diferencia relativa: {abs(highs.power - result.power) / max(1.0, abs(highs.power)):.1e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+"""Opciones comunes del solver: límite de tiempo, gap relativo, hilos, presolve y semilla.
+
+``SolverOptions`` se arma desde variables de entorno y se pisa con
+argumentos de línea de comandos; ``for_backend`` lo traduce a los nombres
+de cada backend de ``optimizacion.solvers``:
+
+===============  =====================  =====================  ==================
+opción           CBC (``PULP_CBC_CMD``)  HiGHS (``highspy``)    SciPy (``milp``)
+===============  =====================  =====================  ==================
+``time_limit``   ``timeLimit``           ``time_limit``         ``time_limit``
+``mip_gap``      ``gapRel``              ``mip_rel_gap``        ``mip_rel_gap``
+``threads``      ``threads``             ``threads``            (no aplica)
+``presolve``     ``presolve``            ``presolve``           ``presolve``
+``seed``         ``randomSeed``          ``random_seed``        (no aplica)
+===============  =====================  =====================  ==================
+
+``effective`` devuelve las opciones que el backend realmente aplica, para
+guardarlas junto a cada resultado. Las variables de entorno son
+``OPTIMIZACION_TIME_LIMIT``, ``OPTIMIZACION_MIP_GAP``,
+``OPTIMIZACION_THREADS``, ``OPTIMIZACION_PRESOLVE`` (``on``/``off``) y
+``OPTIMIZACION_SEED``; ``optimizacion.batch`` las pasa también a los scripts
+que ejecuta en subprocesos, donde reemplazan al solver por defecto de
+``prob.solve()``.
+
+Uso::
+
+    OPTIMIZACION_TIME_LIMIT=30 OPTIMIZACION_THREADS=8 python -m optimizacion.batch "Problema 2"
+    python -m optimizacion.batch --backend highs --mip-gap 0.01 --solver-seed 1
+    python -m optimizacion.config --backend cbc --time-limit 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from dataclasses import asdict, dataclass, fields, replace
+
+ENV_PREFIX = "OPTIMIZACION_"
+# Opciones que cada backend ignora
+UNSUPPORTED = {"cbc": (), "highs": (), "scipy": ("threads", "seed")}
+
+
+def _flag(text: str) -> bool:
+    value = text.strip().lower()
+    if value in ("1", "on", "true", "yes", "si", "sí"):
+        return True
+    if value in ("0", "off", "false", "no"):
+        return False
+    raise ValueError(f"valor booleano inválido: {text!r} (usar on/off)")
+
+
+@dataclass(frozen=True)
+class SolverOptions:
+    """Opciones del solver; ``None`` deja el valor por defecto del backend."""
+
+    time_limit: float | None = None
+    mip_gap: float | None = None
+    threads: int | None = None
+    presolve: bool | None = None
+    seed: int | None = None
+
+    @classmethod
+    def from_env(cls, environ=None) -> SolverOptions:
+        """Lee ``OPTIMIZACION_<OPCION>`` de ``environ`` (por defecto ``os.environ``)."""
+        environ = os.environ if environ is None else environ
+        parse = {"time_limit": float, "mip_gap": float, "threads": int, "presolve": _flag, "seed": int}
+        values = {}
+        for name, convert in parse.items():
+            text = environ.get(ENV_PREFIX + name.upper())
+            if text not in (None, ""):
+                values[name] = convert(text)
+        return cls(**values)
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace, environ=None) -> SolverOptions:
+        """Las variables de entorno pisadas por los argumentos de ``add_arguments`` que se hayan dado."""
+        given = {f.name: getattr(args, f.name if f.name != "seed" else "solver_seed", None) for f in fields(cls)}
+        return replace(cls.from_env(environ), **{k: v for k, v in given.items() if v is not None})
+
+    def is_default(self) -> bool:
+        return all(v is None for v in asdict(self).values())
+
+    def effective(self, backend: str) -> dict:
+        """Opciones dadas que ``backend`` aplica, con los nombres genéricos."""
+        return {k: v for k, v in asdict(self).items() if v is not None and k not in UNSUPPORTED.get(backend, ())}
+
+    def for_backend(self, backend: str) -> dict:
+        """Argumentos con nombre para ``solvers.solve``/``solvers.get_solver`` con ``backend``."""
+        o = self.effective(backend)
+        if backend == "cbc":
+            names = {"time_limit": "timeLimit", "mip_gap": "gapRel", "threads": "threads", "presolve": "presolve"}
+            options = {names[k]: v for k, v in o.items() if k in names}
+            if "seed" in o:
+                options["options"] = [f"randomSeed {o['seed']}", f"randomCbcSeed {o['seed']}"]
+            return options
+        if backend == "highs":
+            names = {"time_limit": "time_limit", "mip_gap": "mip_rel_gap", "threads": "threads",
+                     "presolve": "presolve", "seed": "random_seed"}
+            options = {names[k]: v for k, v in o.items()}
+            if "presolve" in options:
+                options["presolve"] = "on" if options["presolve"] else "off"
+            return options
+        if backend == "scipy":
+            names = {"time_limit": "time_limit", "mip_gap": "mip_rel_gap", "presolve": "presolve"}
+            return {names[k]: v for k, v in o.items()}
+        raise ValueError(f"backend desconocido: {backend!r}")
+
+    def to_env(self) -> dict[str, str]:
+        """Variables de entorno equivalentes (para pasarlas a un subproceso)."""
+        env = {}
+        for name, value in asdict(self).items():
+            if value is not None:
+                env[ENV_PREFIX + name.upper()] = ("on" if value else "off") if isinstance(value, bool) else str(value)
+        return env
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Agrega ``--time-limit``, ``--mip-gap``, ``--threads``, ``--presolve`` y ``--solver-seed``."""
+    group = parser.add_argument_group("opciones del solver (también OPTIMIZACION_<OPCION> en el entorno)")
+    group.add_argument("--time-limit", type=float, help="segundos por resolución")
+    group.add_argument("--mip-gap", type=float, help="gap relativo aceptado en modelos enteros")
+    group.add_argument("--threads", type=int, help="hilos del solver (CBC y HiGHS)")
+    group.add_argument("--presolve", type=_flag, metavar="{on,off}")
+    group.add_argument("--solver-seed", type=int, help="semilla del solver (CBC y HiGHS)")
+
+
+def install_default(options: SolverOptions) -> None:
+    """Hace que ``prob.solve()`` sin solver use CBC con ``options`` (para scripts que no se modifican)."""
+    import pulp
+    import pulp.pulp
+
+    from optimizacion.solvers import get_solver
+
+    if not options.is_default():
+        solver = get_solver("cbc", **options.for_backend("cbc"))
+        pulp.pulp.LpSolverDefault = solver
+        pulp.LpSolverDefault = solver
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Muestra las opciones efectivas del solver para cada backend")
+    parser.add_argument("--backend", choices=("cbc", "highs", "scipy"), action="append")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    options = SolverOptions.from_args(args)
+    print(f"opciones: {options.effective('') or 'las del solver'}")
+    for backend in args.backend or ("cbc", "highs", "scipy"):
+        print(f"  {backend}: {options.for_backend(backend)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,402 @@
+"""Diferencias estructurales entre dos modelos: variables y restricciones faltantes, sobrantes y alteradas.
+
+Los dos modelos se pasan a la forma canónica de ``optimizacion.fingerprint``
+(filas de una variable como cotas, funcional de minimización, filas
+divididas por su mayor coeficiente) y se alinean sin mirar los nombres:
+
+1. Columnas: distancia entre costo, cotas, tipo y los colores de las
+   primeras ``COLOR_ROUNDS`` rondas de refinamiento (costo y cotas de la
+   columna más los sentidos, lados derechos y coeficientes de sus filas, y
+   así sucesivamente); una diferencia lejana sólo cambia los colores de las
+   últimas rondas. Las palabras en común entre los
+   nombres (``B1`` y ``Power_B_1``) sólo desempatan.
+2. Filas: con las columnas alineadas, la distancia entre dos filas es
+   ``|a - b|² / (|a|² + |b|²)``, calculada para todos los pares con un
+   producto de matrices dispersas (``A @ Bᵀ``), más una penalización si
+   difieren el sentido o el lado derecho.
+3. Columnas otra vez, comparando ahora sus coeficientes en las filas
+   alineadas; 2 y 3 se repiten hasta que la asignación no cambia.
+
+Cada paso es un problema de asignación (``linear_sum_assignment``) con
+elementos ficticios: dejar uno sin pareja cuesta ``UNMATCHED``, así que dos
+elementos demasiado distintos quedan como un faltante y un sobrante en lugar
+de uno alterado.
+
+Los valores alterados se informan en las unidades del primer modelo: su
+funcional con su sentido y cada fila con su escala y su sentido originales;
+la fila emparejada del segundo modelo se expresa con ese mismo factor (una
+desigualdad de sentido opuesto, tal como se escribió). Las filas de una sola
+variable aparecen como cambios de cota de la variable.
+
+Uso::
+
+    python -m optimizacion.diff [filtro ...] [--detail]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pulp
+from scipy import sparse
+from scipy.optimize import linear_sum_assignment
+
+from optimizacion.fingerprint import CanonicalModel, _quantize, _refine, canonical_model
+from optimizacion.matrix import MatrixForm
+
+UNMATCHED = 0.5
+MAX_ROUNDS = 10
+COLOR_ROUNDS = 3
+_BIG = 1e6
+
+# Pesos de cada diferencia en la distancia entre columnas y entre filas
+W_COST, W_BOUND, W_TYPE, W_COLOR, W_NAME = 0.3, 0.1, 0.2, 0.3, 0.05
+W_STRUCT = 0.4
+W_ROW, W_SENSE, W_RHS = 1.0, 0.2, 0.2
+
+
+@dataclass
+class VariableChange:
+    """Atributo de una variable que difiere entre los dos modelos (``field``: costo, cotas o tipo)."""
+
+    variable: str
+    other: str
+    field: str
+    value: float | str
+    other_value: float | str
+
+
+@dataclass
+class ConstraintChange:
+    """Restricción emparejada con diferencias de sentido, lado derecho o coeficientes ``(variable, a, b)``."""
+
+    constraint: str
+    other: str
+    sense: tuple[str, str] | None = None
+    rhs: tuple[float, float] | None = None
+    coefficients: list[tuple[str, float, float]] = field(default_factory=list)
+
+
+@dataclass
+class ModelDiff:
+    """Resultado de ``diff_models``: pares emparejados, faltantes (sólo en ``a``), sobrantes (sólo en ``b``) y cambios."""
+
+    name: str
+    other: str
+    variables: list[tuple[str, str]] = field(default_factory=list)
+    missing_variables: list[str] = field(default_factory=list)
+    extra_variables: list[str] = field(default_factory=list)
+    variable_changes: list[VariableChange] = field(default_factory=list)
+    constraints: list[tuple[str, str]] = field(default_factory=list)
+    missing_constraints: list[str] = field(default_factory=list)
+    extra_constraints: list[str] = field(default_factory=list)
+    constraint_changes: list[ConstraintChange] = field(default_factory=list)
+    offset: tuple[float, float] | None = None
+
+    @property
+    def identical(self) -> bool:
+        return not (self.missing_variables or self.extra_variables or self.variable_changes
+                    or self.missing_constraints or self.extra_constraints or self.constraint_changes
+                    or self.offset)
+
+    def counts(self) -> dict[str, int]:
+        """Cantidades para la tabla resumen."""
+        return {
+            "variables": len(self.variables),
+            "variables alteradas": len({c.variable for c in self.variable_changes}),
+            "variables faltantes": len(self.missing_variables),
+            "variables sobrantes": len(self.extra_variables),
+            "restricciones": len(self.constraints),
+            "restricciones alteradas": len(self.constraint_changes),
+            "restricciones faltantes": len(self.missing_constraints),
+            "restricciones sobrantes": len(self.extra_constraints),
+        }
+
+    def format(self) -> str:
+        """Texto con el emparejamiento y cada diferencia."""
+        lines = [f"{self.name} frente a {self.other}"]
+        if self.identical:
+            return lines[0] + ": sin diferencias"
+        renamed = [f"{a} ~ {b}" for a, b in self.variables if a != b]
+        lines.append(f"Variables: {len(self.variables)} emparejadas" + (f" ({', '.join(renamed)})" if renamed else ""))
+        if self.missing_variables:
+            lines.append(f"  faltantes: {', '.join(self.missing_variables)}")
+        if self.extra_variables:
+            lines.append(f"  sobrantes: {', '.join(self.extra_variables)}")
+        for change in self.variable_changes:
+            lines.append(f"  {_pair(change.variable, change.other)}: {change.field} "
+                         f"{_num(change.value)} -> {_num(change.other_value)}")
+        if self.offset:
+            lines.append(f"  constante del funcional: {_num(self.offset[0])} -> {_num(self.offset[1])}")
+        lines.append(f"Restricciones: {len(self.constraints)} emparejadas")
+        if self.missing_constraints:
+            lines.append(f"  faltantes: {', '.join(self.missing_constraints)}")
+        if self.extra_constraints:
+            lines.append(f"  sobrantes: {', '.join(self.extra_constraints)}")
+        for change in self.constraint_changes:
+            parts = []
+            if change.sense:
+                parts.append(f"sentido {change.sense[0]} -> {change.sense[1]}")
+            if change.rhs:
+                parts.append(f"lado derecho {_num(change.rhs[0])} -> {_num(change.rhs[1])}")
+            parts.extend(f"{name} {_num(a)} -> {_num(b)}" for name, a, b in change.coefficients)
+            lines.append(f"  {_pair(change.constraint, change.other)}: " + "; ".join(parts))
+        return "\n".join(lines)
+
+
+def _pair(a: str, b: str) -> str:
+    return a if a == b else f"{a} ~ {b}"
+
+
+def _num(x) -> str:
+    return x if isinstance(x, str) else f"{x + 0.0:.6g}"  # + 0.0 quita el signo de -0
+
+
+def _match(cost: np.ndarray) -> np.ndarray:
+    """Asignación de mínimo costo con la opción de dejar elementos sin pareja; ``-1`` = sin pareja."""
+    n, m = cost.shape
+    padded = np.full((n + m, m + n), _BIG)
+    padded[:n, :m] = cost
+    padded[np.arange(n), m + np.arange(n)] = UNMATCHED
+    padded[n + np.arange(m), np.arange(m)] = UNMATCHED
+    padded[n:, m:] = 0.0
+    rows, cols = linear_sum_assignment(padded)
+    match = np.full(n, -1)
+    real = (rows < n) & (cols < m)
+    match[rows[real]] = cols[real]
+    return match
+
+
+def _positions(match: np.ndarray, n_other: int) -> np.ndarray:
+    """Posición en el espacio alineado de cada elemento del segundo modelo (los sin pareja van al final)."""
+    position = np.full(n_other, -1)
+    matched = match >= 0
+    position[match[matched]] = np.flatnonzero(matched)
+    free = position < 0
+    position[free] = len(match) + np.arange(free.sum())
+    return position
+
+
+def _relative(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Diferencia relativa entre todos los pares, acotada a ``[0, 1]`` (infinitos incluidos)."""
+    a, b = a[:, None], b[None, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        d = np.abs(a - b) / np.maximum(np.abs(a), np.abs(b))
+    return np.where(a == b, 0.0, np.where(np.isfinite(d), np.minimum(d, 1.0), 1.0))
+
+
+def _distance(X: sparse.csr_matrix, Y: sparse.csr_matrix, flip: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """``|x - y|² / (|x|² + |y|²)`` entre filas de ``X`` e ``Y`` (y ``-y`` donde ``flip``); devuelve la distancia y si se invirtió."""
+    xx = np.asarray(X.multiply(X).sum(axis=1)).ravel()[:, None]
+    yy = np.asarray(Y.multiply(Y).sum(axis=1)).ravel()[None, :]
+    xy = (X @ Y.T).toarray()
+    total = xx + yy
+    safe = np.where(total > 0, total, 1.0)
+    direct = np.clip((total - 2 * xy) / safe, 0.0, 1.0)
+    if flip is None:
+        return direct, np.zeros(direct.shape, dtype=bool)
+    inverse = np.clip((total + 2 * xy) / safe, 0.0, 1.0)
+    flipped = flip & (inverse < direct)
+    return np.where(flipped, inverse, direct), flipped
+
+
+def _permute(M: sparse.csr_matrix, position: np.ndarray, size: int, axis: int) -> sparse.csr_matrix:
+    """Reubica las filas (``axis=0``) o columnas (``axis=1``) de ``M`` según ``position`` en un espacio de ``size``."""
+    P = sparse.csr_matrix((np.ones(len(position)), (position, np.arange(len(position)))), shape=(size, len(position)))
+    return (P @ M).tocsr() if axis == 0 else (M @ P.T).tocsr()
+
+
+def _pad(M: sparse.csr_matrix, shape: tuple[int, int]) -> sparse.csr_matrix:
+    M = M.tocsr().copy()
+    M.resize(shape)
+    return M
+
+
+def _tokens(names: list[str], vocabulary: dict[str, int]) -> sparse.csr_matrix:
+    """Incidencia nombre-palabra: ``Power_B_1`` -> {power, b, 1}."""
+    rows, cols = [], []
+    for i, name in enumerate(names):
+        for token in set(re.findall(r"[a-z]+|\d+", name.lower())):
+            rows.append(i)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+    return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(names), len(vocabulary)))
+
+
+def _name_distance(a: list[str], b: list[str]) -> np.ndarray:
+    """``1 -`` índice de Jaccard entre las palabras de cada par de nombres."""
+    vocabulary: dict[str, int] = {}
+    Ta = _tokens(a, vocabulary)
+    Tb = _tokens(b, vocabulary)
+    Ta.resize((len(a), len(vocabulary)))
+    shared = (Ta @ Tb.T).toarray()
+    union = np.asarray(Ta.sum(axis=1)) + np.asarray(Tb.sum(axis=1)).T - shared
+    return 1.0 - shared / np.maximum(union, 1.0)
+
+
+def _column_cost(a: CanonicalModel, b: CanonicalModel, sense_a: int) -> np.ndarray:
+    return (W_COST * _relative(sense_a * a.c, sense_a * b.c)
+            + W_BOUND * (_relative(a.lb, b.lb) + _relative(a.ub, b.ub))
+            + W_TYPE * (a.integer[:, None] != b.integer[None, :])
+            + W_NAME * _name_distance(a.variables, b.variables))
+
+
+def _values(M: sparse.csr_matrix, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    # Con índices vacíos SciPy devuelve una matriz dispersa en lugar de un arreglo
+    return np.asarray(M[rows, cols]).ravel() if len(rows) else np.zeros(0)
+
+
+def _opposite(a: CanonicalModel, b: CanonicalModel) -> np.ndarray:
+    """Pares de desigualdades escritas con sentidos opuestos (``<=`` frente a ``>=``)."""
+    ge_a, ge_b = a.senses == ">=", b.senses == ">="
+    return ~a.is_eq[:, None] & ~b.is_eq[None, :] & (ge_a[:, None] != ge_b[None, :])
+
+
+def diff_models(a: pulp.LpProblem | MatrixForm, b: pulp.LpProblem | MatrixForm) -> ModelDiff:
+    """Compara ``a`` (referencia) con ``b`` y devuelve las diferencias alineando por estructura."""
+    ca, cb = canonical_model(a), canonical_model(b)
+    (ma, na), (mb, nb) = ca.A.shape, cb.A.shape
+    base = _column_cost(ca, cb, a.sense)
+    colors = np.zeros(base.shape)
+    for rounds in range(1, COLOR_ROUNDS + 1):
+        color_a, _ = _refine(ca, _quantize(ca.A.data), rounds=rounds)
+        color_b, _ = _refine(cb, _quantize(cb.A.data), rounds=rounds)
+        colors += color_a[:, None] != color_b[None, :]
+    col_match = _match(base + W_COLOR * colors / COLOR_ROUNDS)
+
+    # Una igualdad no tiene orientación: se compara con la otra fila y con su opuesta. Lo mismo
+    # una <= frente a una >= escrita (x + y <= 3 contra x + y >= 3 es la misma fila con otro sentido)
+    opposite = _opposite(ca, cb)
+    flip = ca.is_eq[:, None] | cb.is_eq[None, :] | opposite
+    row_base = W_SENSE * (ca.is_eq[:, None] != cb.is_eq[None, :])
+    rhs_direct, rhs_inverse = _relative(ca.b, cb.b), _relative(ca.b, -cb.b)
+    for _ in range(MAX_ROUNDS):
+        col_pos = _positions(col_match, nb)
+        width = max(na + nb, 1)
+        Aa = _pad(ca.A, (ma, width))
+        Ab = _permute(cb.A, col_pos, width, axis=1)
+        distance, flipped = _distance(Aa, Ab, flip)
+        reversed_ = opposite & flipped
+        row_match = _match(W_ROW * distance + row_base + W_SENSE * reversed_
+                           + W_RHS * np.where(reversed_, rhs_inverse, rhs_direct))
+
+        row_pos = _positions(row_match, mb)
+        height = max(ma + mb, 1)
+        sign = np.ones(mb)
+        matched = row_match >= 0
+        sign[row_match[matched]] = np.where(flipped[np.flatnonzero(matched), row_match[matched]], -1.0, 1.0)
+        Ca = _pad(ca.A.T.tocsr(), (na, height))
+        Cb = _permute((sparse.diags(sign) @ cb.A).tocsr(), row_pos, height, axis=0).T.tocsr()
+        new = _match(base + W_STRUCT * _distance(Ca, Cb)[0])
+        if np.array_equal(new, col_match):
+            break
+        col_match = new
+
+    return _report(a, b, ca, cb, col_match, row_match, sign)
+
+
+def _report(a, b, ca: CanonicalModel, cb: CanonicalModel, col_match, row_match, sign) -> ModelDiff:
+    names_a, names_b = ca.variables, cb.variables
+    result = ModelDiff(name=a.name, other=b.name)
+    col_pos = _positions(col_match, len(names_b))
+    result.missing_variables = [names_a[j] for j in np.flatnonzero(col_match < 0)]
+    result.extra_variables = [names_b[k] for k in np.flatnonzero(col_pos >= len(names_a))]
+    names = list(names_a) + result.extra_variables
+
+    for j in np.flatnonzero(col_match >= 0):
+        k = col_match[j]
+        result.variables.append((names_a[j], names_b[k]))
+        for label, x, y in (("costo", a.sense * ca.c[j], a.sense * cb.c[k]),
+                            ("cota inferior", ca.lb[j], cb.lb[k]), ("cota superior", ca.ub[j], cb.ub[k])):
+            if _quantize(x) != _quantize(y):
+                result.variable_changes.append(VariableChange(names_a[j], names_b[k], label, float(x), float(y)))
+        if ca.integer[j] != cb.integer[k]:
+            kinds = ("entera" if ca.integer[j] else "continua", "entera" if cb.integer[k] else "continua")
+            result.variable_changes.append(VariableChange(names_a[j], names_b[k], "tipo", *kinds))
+    if _quantize(ca.offset) != _quantize(cb.offset):
+        result.offset = (a.sense * ca.offset, a.sense * cb.offset)
+
+    # Filas emparejadas una frente a otra, en la escala original de la fila de a
+    row_pos = _positions(row_match, cb.A.shape[0])
+    result.missing_constraints = [ca.rows[r] for r in np.flatnonzero(row_match < 0)]
+    result.extra_constraints = [cb.rows[s] for s in np.flatnonzero(row_pos >= len(ca.rows))]
+    pairs = np.flatnonzero(row_match >= 0)
+    others = row_match[pairs]
+    # Las >= están negadas en la forma canónica: la fila de a vuelve a su orientación escrita
+    unit = np.where(ca.senses[pairs] == ">=", -1.0, 1.0) / ca.factor[pairs]
+    # Una desigualdad de sentido opuesto que no hubo que invertir dice lo mismo que la de a
+    same_sense = _opposite(ca, cb)[pairs, others] & (sign[others] > 0)
+    senses_b = np.where(same_sense, ca.senses[pairs], cb.senses[others])
+    X = (sparse.diags(unit) @ _pad(ca.A, (ca.A.shape[0], len(names)))[pairs]).tocsr()
+    Y = (sparse.diags(unit * sign[others]) @ _permute(cb.A, col_pos, len(names), axis=1)[others]).tocsr()
+    rows, cols = (X != Y).nonzero()
+    x, y = _values(X, rows, cols), _values(Y, rows, cols)
+    differ = _quantize(x) != _quantize(y)
+    coefficients: dict[int, list[tuple[str, float, float]]] = {}
+    for i, j, u, v in zip(rows[differ], cols[differ], x[differ], y[differ]):
+        coefficients.setdefault(int(i), []).append((names[j], float(u), float(v)))
+    rhs_a, rhs_b = ca.b[pairs] * unit, sign[others] * cb.b[others] * unit
+    for i, (r, s) in enumerate(zip(pairs, others)):
+        result.constraints.append((ca.rows[r], cb.rows[s]))
+        change = ConstraintChange(ca.rows[r], cb.rows[s], coefficients=sorted(coefficients.get(i, [])))
+        if _quantize(rhs_a[i]) != _quantize(rhs_b[i]):
+            change.rhs = (float(rhs_a[i]), float(rhs_b[i]))
+        if ca.senses[r] != senses_b[i]:
+            change.sense = (str(ca.senses[r]), str(senses_b[i]))
+        if change.coefficients or change.rhs or change.sense:
+            result.constraint_changes.append(change)
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    from optimizacion.batch import describe_script, discover_scripts
+    from optimizacion.loader import load_models
+
+    parser = argparse.ArgumentParser(description="Diferencias de cada variante con el script de referencia")
+    parser.add_argument("filters", nargs="*", help="subcadenas de la ruta del script")
+    parser.add_argument("--root", default=".", help="raíz del repositorio")
+    parser.add_argument("--detail", action="store_true", help="mostrar cada diferencia además del resumen")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    scripts: dict[str, dict[str, pulp.LpProblem]] = {}
+    for path in discover_scripts(Path(args.root), args.filters):
+        problem, variant = describe_script(path)
+        # Filtrando por variante, la referencia del mismo problema se carga igual
+        for p, v in ((path.parent / f"{problem}.py", "Referencia"), (path, variant)):
+            if v not in scripts.get(problem, {}) and p.exists():
+                models = load_models(p)
+                if models:
+                    scripts.setdefault(problem, {})[v] = models[0][1]
+    loaded = time.perf_counter() - t0
+
+    header = ("Problema", "Variante", "Var.", "Alt.", "Faltan", "Sobran", "Restr.", "Alt.", "Faltan", "Sobran")
+    lines, details = [header], []
+    t0 = time.perf_counter()
+    for problem, variants in scripts.items():
+        reference = variants.get("Referencia")
+        if reference is None:
+            continue
+        for variant, model in variants.items():
+            if variant == "Referencia":
+                continue
+            result = diff_models(reference, model)
+            result.name, result.other = f"{problem} Referencia", f"{problem} {variant}"
+            lines.append((problem, variant, *(str(v) for v in result.counts().values())))
+            details.append(result.format())
+    compared = time.perf_counter() - t0
+
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    print("\n".join("  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip() for line in lines))
+    if args.detail:
+        print("\n\n".join(["", *details]))
+    print(f"\ncarga {loaded:.2f} s, comparación {compared:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,375 @@
+"""Huella canónica de un modelo y caché de soluciones indexada por ella.
+
+La huella no depende de los nombres de variables y restricciones, de su
+orden ni de la escala de cada fila:
+
+1. Las filas de una sola variable se pasan a cotas (``x <= 18000`` como
+   restricción o como ``upBound`` dan lo mismo) y el funcional se lleva a
+   minimización (``max c`` es ``min -c``).
+2. Cada fila se divide por su coeficiente de mayor valor absoluto; las
+   igualdades se orientan con el lado derecho positivo (o, si es cero, con la
+   suma de coeficientes positiva). Los números se redondean a 9 cifras
+   significativas, así ``0.00004*x`` y ``(1/25000)*XA`` coinciden.
+3. Refinamiento de colores (Weisfeiler-Lehman) sobre el grafo bipartito
+   filas-columnas: el color de cada columna arranca de su costo, cotas y tipo,
+   el de cada fila de su sentido y lado derecho, y en cada ronda se mezcla
+   con el multiconjunto de (color vecino, coeficiente). El resumen SHA-256 de
+   los colores finales ordenados es la huella.
+
+Modelos iguales salvo renombrar y permutar tienen la misma huella, pero no
+a la inversa: el refinamiento de colores no distingue algunos grafos
+regulares (dos triángulos y un hexágono, por ejemplo), así que una huella
+igual sólo indica que los modelos *pueden* ser equivalentes. Por eso
+``SolutionCache`` exige además que coincida ``exact_digest``, que compara
+el modelo normalizado fila por fila en el orden canónico de columnas; ese
+orden permite guardar la solución una vez y devolverla con los nombres de
+cualquier modelo idéntico salvo nombres y orden.
+
+Uso::
+
+    python -m optimizacion.fingerprint [filtro ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pulp
+from scipy import sparse
+
+from optimizacion.matrix import MatrixForm, from_lp
+from optimizacion.results import Result
+
+DIGITS = 9
+TOL = 1e-6
+_INF = np.uint64(0x7FF0_0000_0000_0001)
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """Mezcla splitmix64 sobre ``uint64`` (desborda a propósito)."""
+    x = np.asarray(x, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _combine(*parts) -> np.ndarray:
+    out = np.uint64(0x9E3779B97F4A7C15)
+    for part in parts:
+        out = _mix(out ^ _mix(part))
+    return out
+
+
+def _quantize(x) -> np.ndarray:
+    """Clave ``uint64`` de cada número redondeado a ``DIGITS`` cifras significativas."""
+    x = np.asarray(x, dtype=float)
+    finite = np.isfinite(x) & (x != 0)
+    exponent = np.zeros(x.shape, dtype=np.int64)
+    exponent[finite] = np.floor(np.log10(np.abs(x[finite]))).astype(np.int64)
+    mantissa = np.zeros(x.shape, dtype=np.int64)
+    mantissa[finite] = np.rint(x[finite] * 10.0 ** (DIGITS - 1 - exponent[finite])).astype(np.int64)
+    # 9.9999999996 redondea a 10**DIGITS: se normaliza al exponente siguiente
+    carry = np.abs(mantissa) >= 10 ** DIGITS
+    mantissa[carry] //= 10
+    exponent[carry] += 1
+    key = _combine(mantissa.view(np.uint64), exponent.view(np.uint64))
+    key = np.where(x == 0, np.uint64(0), key)
+    key = np.where(np.isposinf(x), _INF, key)
+    return np.where(np.isneginf(x), ~_INF, key)
+
+
+def _segment_sum(values: np.ndarray, starts: np.ndarray, n: int) -> np.ndarray:
+    """Suma (módulo 2**64) de ``values`` por segmentos CSR; los segmentos vacíos dan 0."""
+    out = np.zeros(n, dtype=np.uint64)
+    counts = np.diff(starts)
+    nonempty = counts > 0
+    if values.size:
+        with np.errstate(over="ignore"):
+            out[nonempty] = np.add.reduceat(values, starts[:-1][nonempty])
+    return out
+
+
+@dataclass
+class CanonicalModel:
+    """Modelo normalizado para comparar: todo minimización, filas escaladas, sin filas de una variable.
+
+    ``ambiguous`` marca las igualdades con lado derecho y suma nulos, cuyo
+    signo no se puede fijar sin mirar la estructura; ``factor`` es el
+    multiplicador aplicado a cada fila de ``A_ub``/``A_eq`` (signo y escala)
+    y ``senses`` el sentido con que se escribió la fila (``"<="``, ``">="``
+    o ``"=="``; las ``>=`` de un ``LpProblem`` llegan negadas a ``A_ub``).
+    """
+
+    c: np.ndarray
+    A: sparse.csr_matrix
+    b: np.ndarray
+    is_eq: np.ndarray
+    lb: np.ndarray
+    ub: np.ndarray
+    integer: np.ndarray
+    offset: float
+    variables: list[str]
+    rows: list[str]
+    ambiguous: np.ndarray
+    factor: np.ndarray
+    senses: np.ndarray
+
+
+def canonical_model(model: pulp.LpProblem | MatrixForm) -> CanonicalModel:
+    """Normaliza ``model`` (pasos 1 y 2 de la descripción del módulo)."""
+    form = from_lp(model) if isinstance(model, pulp.LpProblem) else model
+    A = sparse.vstack([form.A_ub, form.A_eq]).tocsr()
+    A.eliminate_zeros()
+    b = np.r_[form.b_ub, form.b_eq].astype(float)
+    is_eq = np.r_[np.zeros(form.A_ub.shape[0], dtype=bool), np.ones(form.A_eq.shape[0], dtype=bool)]
+    names = list(form.ub_names) + list(form.eq_names)
+    senses = np.where(is_eq, "==", "<=")
+    if isinstance(model, pulp.LpProblem):
+        ge = {name for name, con in model.constraints.items() if con.sense == pulp.LpConstraintGE}
+        senses[[i for i, name in enumerate(names) if name in ge]] = ">="
+    lb, ub = form.lb.astype(float).copy(), form.ub.astype(float).copy()
+    integer = np.zeros(len(form.c), dtype=bool) if form.integrality is None else form.integrality.astype(bool)
+
+    counts = np.diff(A.indptr)
+    for r in np.flatnonzero(counts == 1):
+        j, a = A.indices[A.indptr[r]], A.data[A.indptr[r]]
+        bound = b[r] / a
+        if is_eq[r] or a > 0:
+            ub[j] = min(ub[j], bound)
+        if is_eq[r] or a < 0:
+            lb[j] = max(lb[j], bound)
+    keep = np.flatnonzero(counts != 1)
+    A, b, is_eq, senses = A[keep], b[keep], is_eq[keep], senses[keep]
+    names = [names[r] for r in keep]
+
+    scale = np.ones(len(b))
+    nonempty = np.diff(A.indptr) > 0
+    if A.nnz:
+        scale[nonempty] = np.maximum.reduceat(np.abs(A.data), A.indptr[:-1][nonempty])
+    # Sumas y lados derechos nulos salvo redondeo (rendimientos que suman 1) cuentan como cero
+    row_sum = _zero(np.asarray(A.sum(axis=1)).ravel() / scale)
+    b = _zero(b / scale)
+    flip = is_eq & ((b < 0) | ((b == 0) & (row_sum < 0)))
+    sign = np.where(flip, -1.0, 1.0)
+    A = (sparse.diags(sign / scale) @ A).tocsr()
+    return CanonicalModel(
+        c=form.sense * form.c.astype(float), A=A, b=sign * b, is_eq=is_eq, lb=lb, ub=ub, integer=integer,
+        offset=form.sense * float(form.offset), variables=list(form.variables), rows=names,
+        ambiguous=is_eq & (b == 0) & (row_sum == 0), factor=sign / scale, senses=senses,
+    )
+
+
+def _zero(x: np.ndarray) -> np.ndarray:
+    return np.where(np.abs(x) <= 10.0 ** -DIGITS, 0.0, x)
+
+
+def _refine(m: CanonicalModel, coef_keys: np.ndarray, rounds: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Colores de columnas y filas; sin ``rounds``, hasta que la cantidad de colores distintos se estabiliza."""
+    n_rows, n_cols = m.A.shape
+    col = _combine(_quantize(m.c), _quantize(m.lb), _quantize(m.ub), m.integer.astype(np.uint64))
+    row = _combine(m.is_eq.astype(np.uint64), _quantize(m.b))
+    A = m.A.tocsr()
+    rows_of_nnz = np.repeat(np.arange(n_rows), np.diff(A.indptr))
+    csc_order = np.lexsort((rows_of_nnz, A.indices))
+    col_starts = np.r_[0, np.cumsum(np.bincount(A.indices, minlength=n_cols))]
+    distinct = (-1, -1)
+    for _ in range(n_rows + n_cols + 1 if rounds is None else rounds):
+        edge_row = _combine(row[rows_of_nnz], coef_keys)
+        col = _combine(col, _segment_sum(edge_row[csc_order], col_starts, n_cols))
+        edge_col = _combine(col[A.indices], coef_keys)
+        row = _combine(row, _segment_sum(edge_col, A.indptr, n_rows))
+        now = (len(np.unique(col)), len(np.unique(row)))
+        if rounds is None and now == distinct:
+            break
+        distinct = now
+    return col, row
+
+
+@dataclass
+class Fingerprint:
+    """Huella de un modelo y orden canónico de sus columnas (``order[k]`` = columna en el modelo)."""
+
+    digest: str
+    order: np.ndarray
+    model: CanonicalModel
+
+
+def fingerprint(model: pulp.LpProblem | MatrixForm) -> Fingerprint:
+    """Huella canónica de ``model``: igual para modelos iguales salvo nombres, orden y escala de filas."""
+    m = canonical_model(model)
+    keys = _quantize(m.A.data)
+    # Igualdades con lado derecho y suma nulos (x - y == 0): el signo se decide con los colores
+    A, ambiguous = m.A, m.ambiguous
+    if ambiguous.any():
+        rows_of_nnz = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+        col, _ = _refine(m, np.where(ambiguous[rows_of_nnz], _quantize(np.abs(A.data)), keys))
+        for r in np.flatnonzero(ambiguous):
+            lo, hi = A.indptr[r], A.indptr[r + 1]
+            first = lo + np.argmin(col[A.indices[lo:hi]])
+            if A.data[first] < 0:
+                A.data[lo:hi] *= -1
+                m.factor[r] *= -1
+        keys = _quantize(A.data)
+    col, row = _refine(m, keys)
+
+    digest = hashlib.sha256()
+    digest.update(np.sort(col).tobytes())
+    digest.update(np.sort(row).tobytes())
+    digest.update(_quantize([m.offset]).tobytes())
+    return Fingerprint(digest=digest.hexdigest(), order=np.argsort(col, kind="stable"), model=m)
+
+
+def equivalent(a: pulp.LpProblem | MatrixForm, b: pulp.LpProblem | MatrixForm) -> bool:
+    """``True`` si los dos modelos tienen la misma huella."""
+    return fingerprint(a).digest == fingerprint(b).digest
+
+
+def _feasible(m: CanonicalModel, x: np.ndarray) -> bool:
+    # Tolerancia relativa al tamaño de los términos: CBC escribe la solución con pocas cifras
+    activity = m.A @ x
+    tol = TOL * (1 + abs(m.A) @ np.abs(x) + np.abs(m.b))
+    rows_ok = np.all(np.where(m.is_eq, np.abs(activity - m.b) <= tol, activity <= m.b + tol))
+    bounds_ok = np.all(x >= m.lb - TOL * (1 + np.abs(x))) and np.all(x <= m.ub + TOL * (1 + np.abs(x)))
+    integral = np.all(np.abs(x[m.integer] - np.round(x[m.integer])) <= TOL)
+    return bool(rows_ok and bounds_ok and integral)
+
+
+def exact_digest(fp: Fingerprint) -> str:
+    """Resumen del modelo normalizado con las columnas en el orden canónico y las filas ordenadas.
+
+    A diferencia de la huella, dos modelos con el mismo resumen son
+    idénticos salvo nombres y orden de filas: no depende del refinamiento de
+    colores.
+    """
+    m = fp.model
+    A = m.A[:, fp.order].tocsr()
+    A.sort_indices()
+    data = A.data.copy()
+    for r in np.flatnonzero(m.ambiguous):  # signo de x - y == 0: primer coeficiente positivo
+        lo, hi = A.indptr[r], A.indptr[r + 1]
+        if hi > lo and data[lo] < 0:
+            data[lo:hi] *= -1
+    keys, b = _quantize(data), _quantize(m.b)
+    rows = sorted(
+        hashlib.sha256(bytes([bool(m.is_eq[r])]) + b[r:r + 1].tobytes() + A.indices[A.indptr[r]:A.indptr[r + 1]]
+                       .astype(np.int64).tobytes() + keys[A.indptr[r]:A.indptr[r + 1]].tobytes()).digest()
+        for r in range(A.shape[0])
+    )
+    digest = hashlib.sha256(b"".join(rows))
+    for column in (m.c, m.lb, m.ub):
+        digest.update(_quantize(column[fp.order]).tobytes())
+    digest.update(m.integer[fp.order].astype(np.uint8).tobytes())
+    return digest.hexdigest()
+
+
+class SolutionCache:
+    """Soluciones guardadas en ``directory/<huella>.json``, con los valores en el orden canónico.
+
+    Un resultado guardado sólo se devuelve si el modelo guardado es idéntico
+    al consultado (``exact_digest``): que la solución sea factible y dé el
+    mismo funcional no prueba que sea óptima para otro modelo con la misma
+    huella. Además los valores se asignan a las variables del modelo
+    consultado y se verifica que sean factibles y den el funcional guardado;
+    si algo no coincide se trata como un fallo de caché. Si las columnas
+    empatan en color el orden canónico depende del orden original, y un
+    modelo equivalente pero permutado puede no encontrar su entrada.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.hits = self.misses = 0
+
+    def path(self, fp: Fingerprint) -> Path:
+        return self.directory / f"{fp.digest}.json"
+
+    def get(self, model: pulp.LpProblem | MatrixForm, fp: Fingerprint | None = None) -> Result | None:
+        """Resultado guardado para un modelo equivalente a ``model``, o ``None``."""
+        fp = fp or fingerprint(model)
+        path = self.path(fp)
+        if not path.exists():
+            self.misses += 1
+            return None
+        data = json.loads(path.read_text())
+        names = fp.model.variables
+        if data.get("exact") != exact_digest(fp):
+            self.misses += 1
+            return None
+        if data["values"] is None:
+            self.hits += 1
+            return Result(status=data["status"], objective=None, variables={n: None for n in names})
+        x = np.empty(len(names))
+        x[fp.order] = data["values"]
+        objective = float(fp.model.c @ x + fp.model.offset)
+        scale = 1 + np.abs(fp.model.c) @ np.abs(x)
+        if not _feasible(fp.model, x) or abs(objective - data["objective"]) > TOL * scale:
+            self.misses += 1
+            return None
+        self.hits += 1
+        sense = model.sense
+        return Result(status=data["status"], objective=sense * objective, variables=dict(zip(names, x.tolist())))
+
+    def put(self, model: pulp.LpProblem | MatrixForm, result: Result, fp: Fingerprint | None = None) -> None:
+        fp = fp or fingerprint(model)
+        values = None
+        if result.objective is not None and all(v is not None for v in result.variables.values()):
+            x = np.array([result.variables[n] for n in fp.model.variables], dtype=float)
+            values = x[fp.order].tolist()
+        data = {"status": result.status, "objective": None if values is None else model.sense * result.objective,
+                "values": values, "exact": exact_digest(fp)}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.path(fp).with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, self.path(fp))
+
+    def solve(self, model: pulp.LpProblem | MatrixForm, backend: str = "cbc", **options) -> Result:
+        """Devuelve la solución guardada o resuelve con ``solvers.solve`` y la guarda."""
+        from optimizacion.solvers import solve
+
+        fp = fingerprint(model)
+        cached = self.get(model, fp)
+        if cached is not None:
+            if isinstance(model, pulp.LpProblem) and cached.objective is not None:
+                model.assignVarsVals(cached.variables)
+                model.assignStatus(pulp.LpStatusOptimal if cached.status == "Optimal" else pulp.LpStatusNotSolved)
+            return cached
+        result = solve(model, backend, **options)
+        self.put(model, result, fp)
+        return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    from optimizacion.batch import describe_script, discover_scripts
+    from optimizacion.loader import load_models
+
+    parser = argparse.ArgumentParser(description="Huellas de los modelos de cada script, sin resolverlos")
+    parser.add_argument("filters", nargs="*", help="subcadenas de la ruta del script")
+    parser.add_argument("--root", default=".", help="raíz del repositorio")
+    args = parser.parse_args(argv)
+
+    groups: dict[str, list[str]] = {}
+    lines = [("Problema", "Variante", "Modelo", "Huella")]
+    for path in discover_scripts(Path(args.root), args.filters):
+        problem, variant = describe_script(path)
+        for _, prob in load_models(path):
+            digest = fingerprint(prob).digest
+            groups.setdefault(digest, []).append(f"{problem} {variant}")
+            lines.append((problem, variant, prob.name, digest[:16]))
+    widths = [max(len(line[i]) for line in lines) for i in range(len(lines[0]))]
+    print("\n".join("  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip() for line in lines))
+    same = [members for members in groups.values() if len(members) > 1]
+    if same:
+        print("\nEquivalentes:")
+        for members in same:
+            print("  " + " = ".join(members))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+"""Carga de los modelos de un script sin resolverlos ni imprimir.
+
+Los scripts ``Problema N*.py`` construyen el modelo, llaman a ``prob.solve()``
+e imprimen el resultado al importarse. ``load_script`` los ejecuta en un
+espacio de nombres propio, en el directorio del script y con la salida
+descartada, con ``LpProblem.solve`` interceptado: en lugar de llamar al
+solver anota el modelo y deja sus variables en cero para que el resto del
+script (los ``print`` con ``varValue`` o ``value(prob.objective)``) siga
+corriendo. Al terminar, los modelos vuelven al estado ``Not Solved`` con las
+variables sin valor, así que quien los carga elige solver y mide su tiempo.
+
+Se devuelven los ``LpProblem`` del espacio de nombres del script y también
+los que se resolvieron dentro de funciones. Un error del script se anota en
+``LoadedScript.error`` sin descartar los modelos construidos antes.
+
+Uso::
+
+    python -m optimizacion.loader [filtro ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from unittest import mock
+
+import pulp
+
+from optimizacion.batch import REPO_ROOT, collect_problems, describe_script, discover_scripts
+
+
+@dataclass
+class LoadedScript:
+    """Modelos sin resolver de un script, con el tiempo de carga y el error que haya dado."""
+
+    path: Path
+    problem: str
+    variant: str
+    models: list[tuple[str, pulp.LpProblem]] = field(default_factory=list)
+    error: str | None = None
+    elapsed: float = 0.0
+
+
+def load_script(path: str | Path) -> LoadedScript:
+    """Ejecuta ``path`` con ``LpProblem.solve`` interceptado y devuelve sus modelos sin resolver."""
+    path = Path(path).resolve()
+    problem, variant = describe_script(path)
+    loaded = LoadedScript(path=path, problem=problem, variant=variant)
+    start = time.perf_counter()
+    try:
+        code = compile(path.read_text(encoding="utf-8"), str(path), "exec")
+    except SyntaxError as exc:
+        loaded.error = f"{type(exc).__name__}: {exc}"
+        loaded.elapsed = time.perf_counter() - start
+        return loaded
+
+    solved: dict[int, pulp.LpProblem] = {}
+
+    def fake_solve(prob: pulp.LpProblem, *args, **kwargs) -> int:
+        solved[id(prob)] = prob
+        for var in prob.variables():
+            var.varValue = 0.0
+        return prob.status
+
+    namespace = {"__name__": "__main__", "__file__": str(path)}
+    with mock.patch.object(pulp.LpProblem, "solve", fake_solve), mock.patch.object(sys, "argv", [str(path)]), \
+            contextlib.chdir(path.parent), contextlib.redirect_stdout(io.StringIO()), \
+            contextlib.redirect_stderr(io.StringIO()):
+        try:
+            exec(code, namespace)
+        except (Exception, SystemExit) as exc:  # el script puede fallar o llamar a exit()
+            loaded.error = f"{type(exc).__name__}: {exc}"
+
+    models = collect_problems(namespace)
+    known = {id(prob) for _, prob in models}
+    models += [(prob.name, prob) for key, prob in solved.items() if key not in known]
+    for _, prob in models:
+        prob.status = pulp.LpStatusNotSolved
+        for var in prob.variables():
+            var.varValue = None
+    loaded.models = models
+    loaded.elapsed = time.perf_counter() - start
+    return loaded
+
+
+def load_models(path: str | Path) -> list[tuple[str, pulp.LpProblem]]:
+    """Sólo los modelos de ``load_script(path)``; una lista vacía si el script no construye ninguno."""
+    return load_script(path).models
+
+
+def load_all(root: Path = REPO_ROOT, filters: list[str] | None = None) -> list[LoadedScript]:
+    """``load_script`` de cada script de ``discover_scripts``."""
+    return [load_script(path) for path in discover_scripts(root, filters)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Modelos de cada script, cargados sin resolver")
+    parser.add_argument("filters", nargs="*", help="subcadenas de la ruta del script")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT, help="raíz del repositorio")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    scripts = load_all(args.root, args.filters)
+    total = time.perf_counter() - start
+    lines = [("Problema", "Variante", "Modelo", "Vars", "Restr.", "Tiempo (ms)", "Error")]
+    for s in scripts:
+        for _, prob in s.models or [("", None)]:
+            size = ("", "") if prob is None else (str(prob.numVariables()), str(prob.numConstraints()))
+            lines.append((s.problem, s.variant, prob.name if prob else "", *size,
+                          f"{s.elapsed * 1000:.1f}", s.error or ""))
+    widths = [max(len(line[i]) for line in lines) for i in range(len(lines[0]))]
+    print("\n".join("  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip() for line in lines))
+    print(f"\n{sum(len(s.models) for s in scripts)} modelos de {len(scripts)} scripts en {total * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
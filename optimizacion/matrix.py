@@ -0,0 +1,337 @@
+"""Forma matricial de los modelos y resolución directa con HiGHS (SciPy).
+
+Un modelo en forma matricial es::
+
+    opt  c @ x
+    s.a. A_ub @ x <= b_ub
+         A_eq @ x == b_eq
+         lb <= x <= ub,  x[j] entero si integrality[j]
+
+con ``A_ub`` y ``A_eq`` en CSR. Las restricciones ``>=`` se guardan negadas
+en ``A_ub``. ``c`` conserva el sentido original (``sense`` = 1 minimiza,
+-1 maximiza) para que el funcional coincida con el de PuLP.
+
+``MatrixBuilder`` arma estas matrices por bloques de filas con arreglos de
+NumPy, sin pasar por ``LpAffineExpression``; ``from_lp`` convierte un
+``LpProblem`` ya construido, y ``solve_matrix`` resuelve con
+``scipy.optimize.linprog``/``milp``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+import pulp
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+
+from optimizacion.results import Result
+
+# Códigos de estado de linprog/milp -> nombres de pulp.LpStatus
+_STATUS = {0: "Optimal", 1: "Not Solved", 2: "Infeasible", 3: "Unbounded", 4: "Undefined"}
+
+
+class LazyNames(Sequence):
+    """Secuencia de nombres generados bajo demanda a partir de plantillas sobre grillas.
+
+    ``LazyNames(("{}{}", ["A", "B"], [1, 2]), ("I{}", ["A", "B"]))`` equivale a
+    ``["A1", "A2", "B1", "B2", "IA", "IB"]`` sin construir los strings hasta que
+    se piden; en modelos con millones de columnas formatear todos los nombres
+    cuesta más que armar la matriz.
+    """
+
+    def __init__(self, *blocks):
+        self.blocks = [(template, [list(axis) for axis in axes]) for template, *axes in blocks]
+        self._shapes = [tuple(len(axis) for axis in axes) for _, axes in self.blocks]
+        self._starts = list(itertools.accumulate((math.prod(s) for s in self._shapes), initial=0))
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        b = bisect.bisect_right(self._starts, k) - 1
+        template, axes = self.blocks[b]
+        idx = np.unravel_index(k - self._starts[b], self._shapes[b])
+        return template.format(*(axis[i] for axis, i in zip(axes, idx)))
+
+    def __iter__(self):
+        for template, axes in self.blocks:
+            for labels in itertools.product(*axes):
+                yield template.format(*labels)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or len(self) != len(other):
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+
+@dataclass
+class MatrixForm:
+    """Modelo lineal (entero mixto) en forma matricial con nombres de filas y columnas."""
+
+    c: np.ndarray
+    A_ub: sparse.csr_matrix
+    b_ub: np.ndarray
+    A_eq: sparse.csr_matrix
+    b_eq: np.ndarray
+    lb: np.ndarray
+    ub: np.ndarray
+    variables: Sequence[str]
+    ub_names: Sequence[str] = field(default_factory=list)
+    eq_names: Sequence[str] = field(default_factory=list)
+    integrality: np.ndarray | None = None
+    sense: int = pulp.LpMinimize
+    offset: float = 0.0
+    name: str = "NoName"
+
+    @property
+    def bounds(self) -> np.ndarray:
+        """Cotas como arreglo ``(n, 2)``, en el formato que acepta ``linprog``."""
+        return np.column_stack([self.lb, self.ub])
+
+    @property
+    def is_mip(self) -> bool:
+        return self.integrality is not None and bool(np.any(self.integrality))
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        """(filas ``<=``, filas ``==``, columnas)."""
+        return self.A_ub.shape[0], self.A_eq.shape[0], len(self.variables)
+
+
+class MatrixBuilder:
+    """Arma un ``MatrixForm`` a partir de bloques de filas dados como arreglos.
+
+    Cada bloque es un conjunto de ``k`` filas del mismo sentido, descrito en
+    formato COO con índices de fila locales ``0..k-1``.
+    """
+
+    def __init__(self, variables: list[str]):
+        self.variables = list(variables)
+        self.index = {name: j for j, name in enumerate(self.variables)}
+        self._blocks = {"<=": [], "==": []}
+
+    def cols(self, names) -> np.ndarray:
+        """Índices de columna de una lista de nombres de variables."""
+        return np.fromiter((self.index[n] for n in names), dtype=np.int64)
+
+    def add_rows(self, sense: str, names: list[str], rows, cols, vals, rhs) -> None:
+        """Agrega ``len(names)`` filas ``A[rows, cols] = vals`` con lado derecho ``rhs``."""
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        rows = np.broadcast_to(np.asarray(rows, dtype=np.int64).ravel(), cols.shape)
+        vals = np.broadcast_to(np.asarray(vals, dtype=float).ravel(), cols.shape)
+        rhs = np.broadcast_to(np.asarray(rhs, dtype=float), (len(names),))
+        keep = vals != 0
+        rows, cols, vals = rows[keep], cols[keep], vals[keep]
+        if sense == ">=":
+            sense, vals, rhs = "<=", -vals, -rhs
+        self._blocks[sense].append((list(names), rows, cols, vals, rhs))
+
+    def _stack(self, sense: str):
+        names, rows, cols, vals, rhs, start = [], [], [], [], [], 0
+        for b_names, b_rows, b_cols, b_vals, b_rhs in self._blocks[sense]:
+            names += b_names
+            rows.append(b_rows + start)
+            cols.append(b_cols)
+            vals.append(b_vals)
+            rhs.append(b_rhs)
+            start += len(b_names)
+        n = len(self.variables)
+        if not names:
+            return sparse.csr_matrix((0, n)), np.zeros(0), []
+        A = sparse.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(start, n))
+        return A, np.concatenate(rhs), names
+
+    def build(self, c, sense: int = pulp.LpMinimize, lb=0.0, ub=np.inf, integrality=None,
+              offset: float = 0.0, name: str = "NoName") -> MatrixForm:
+        n = len(self.variables)
+        A_ub, b_ub, ub_names = self._stack("<=")
+        A_eq, b_eq, eq_names = self._stack("==")
+        return MatrixForm(
+            c=np.asarray(c, dtype=float),
+            A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
+            lb=np.broadcast_to(np.asarray(lb, dtype=float), (n,)).copy(),
+            ub=np.broadcast_to(np.asarray(ub, dtype=float), (n,)).copy(),
+            variables=self.variables, ub_names=ub_names, eq_names=eq_names,
+            integrality=None if integrality is None else np.asarray(integrality, dtype=np.int8),
+            sense=sense, offset=offset, name=name,
+        )
+
+
+def from_lp(prob: pulp.LpProblem) -> MatrixForm:
+    """Convierte un ``LpProblem`` de PuLP a ``MatrixForm`` (columnas en el orden de ``prob.variables()``)."""
+    variables = prob.variables()
+    builder = MatrixBuilder([v.name for v in variables])
+    c = np.zeros(len(variables))
+    offset = 0.0
+    if prob.objective is not None:
+        for v, a in prob.objective.items():
+            c[builder.index[v.name]] = a
+        offset = prob.objective.constant
+
+    senses = {pulp.LpConstraintLE: "<=", pulp.LpConstraintGE: ">=", pulp.LpConstraintEQ: "=="}
+    for name, con in prob.constraints.items():
+        items = list(con.items())
+        builder.add_rows(
+            senses[con.sense], [name],
+            np.zeros(len(items), dtype=np.int64),
+            builder.cols(v.name for v, _ in items),
+            [a for _, a in items],
+            -con.constant,
+        )
+
+    lb = np.array([-np.inf if v.lowBound is None else v.lowBound for v in variables], dtype=float)
+    ub = np.array([np.inf if v.upBound is None else v.upBound for v in variables], dtype=float)
+    integrality = np.array([v.cat == pulp.LpInteger for v in variables], dtype=np.int8)
+    return builder.build(c, sense=prob.sense, lb=lb, ub=ub, integrality=integrality, offset=offset, name=prob.name)
+
+
+def scipy_solve(form: MatrixForm, **options):
+    """Llama a ``milp`` (si hay enteras) o ``linprog`` y devuelve el ``OptimizeResult`` crudo.
+
+    El funcional se pasa como ``form.sense * form.c`` (siempre minimización).
+    """
+    c = form.sense * form.c
+    if not form.is_mip:
+        options = {k: v for k, v in options.items() if k != "mip_rel_gap"}  # linprog no la reconoce
+    if form.is_mip:
+        constraints = [LinearConstraint(A, -np.inf, b) for A, b in ((form.A_ub, form.b_ub),) if A.shape[0]]
+        constraints += [LinearConstraint(A, b, b) for A, b in ((form.A_eq, form.b_eq),) if A.shape[0]]
+        return milp(c, constraints=constraints, integrality=form.integrality,
+                    bounds=Bounds(form.lb, form.ub), options=options)
+    return linprog(
+        c,
+        A_ub=form.A_ub if form.A_ub.shape[0] else None, b_ub=form.b_ub if form.A_ub.shape[0] else None,
+        A_eq=form.A_eq if form.A_eq.shape[0] else None, b_eq=form.b_eq if form.A_eq.shape[0] else None,
+        bounds=form.bounds, method="highs", options=options,
+    )
+
+
+def solve_matrix(form: MatrixForm, **options) -> Result:
+    """Resuelve ``form`` con HiGHS vía SciPy y devuelve un ``Result``.
+
+    Usa ``milp`` si hay variables enteras y ``linprog`` si no; ``options``
+    se pasa tal cual al solver (``time_limit``, ``mip_rel_gap``, ...).
+    """
+    res = scipy_solve(form, **options)
+    status = _STATUS.get(res.status, "Undefined")
+    if res.x is None:
+        return Result(status=status, objective=None, variables={n: None for n in form.variables})
+    return Result(
+        status=status,
+        objective=float(form.c @ res.x + form.offset),
+        variables=dict(zip(form.variables, res.x.tolist())),
+    )
+
+
+def to_lp(form: MatrixForm) -> pulp.LpProblem:
+    """Reconstruye un ``LpProblem`` equivalente (las filas ``>=`` quedan como ``<=`` negadas)."""
+    prob = pulp.LpProblem(form.name, form.sense)
+    integrality = form.integrality if form.integrality is not None else np.zeros(len(form.variables))
+    x = [
+        pulp.LpVariable(n, lowBound=None if np.isinf(lo) else lo, upBound=None if np.isinf(hi) else hi,
+                        cat=pulp.LpInteger if k else pulp.LpContinuous)
+        for n, lo, hi, k in zip(form.variables, form.lb.tolist(), form.ub.tolist(), integrality.tolist())
+    ]
+    nz = np.flatnonzero(form.c)
+    prob += pulp.LpAffineExpression([(x[j], form.c[j]) for j in nz], constant=form.offset)
+    for A, b, names, sense in ((form.A_ub, form.b_ub, form.ub_names, pulp.LpConstraintLE),
+                               (form.A_eq, form.b_eq, form.eq_names, pulp.LpConstraintEQ)):
+        A = A.tocsr()
+        for i, name in enumerate(names):
+            row = slice(A.indptr[i], A.indptr[i + 1])
+            expr = pulp.LpAffineExpression([(x[j], a) for j, a in zip(A.indices[row], A.data[row])])
+            prob.addConstraint(pulp.LpConstraint(expr, sense, name, b[i]))
+    return prob
+
+
+def to_highs(form: MatrixForm):
+    """Crea un modelo ``highspy.Highs`` en memoria con las filas ``<=`` seguidas de las ``==``.
+
+    Requiere el paquete opcional ``highspy``.
+    """
+    try:
+        import highspy
+    except ImportError as exc:  # pragma: no cover - depende del entorno
+        raise ImportError("to_highs requiere el paquete highspy (pip install highspy)") from exc
+
+    A = sparse.vstack([form.A_ub, form.A_eq]).tocsc()
+    lp = highspy.HighsLp()
+    lp.num_row_, lp.num_col_ = A.shape
+    lp.sense_ = highspy.ObjSense.kMaximize if form.sense == pulp.LpMaximize else highspy.ObjSense.kMinimize
+    lp.offset_ = form.offset
+    lp.col_cost_ = form.c
+    lp.col_lower_ = form.lb
+    lp.col_upper_ = form.ub
+    lp.row_lower_ = np.r_[np.full(form.A_ub.shape[0], -np.inf), form.b_eq]
+    lp.row_upper_ = np.r_[form.b_ub, form.b_eq]
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_ = A.indptr
+    lp.a_matrix_.index_ = A.indices
+    lp.a_matrix_.value_ = A.data
+    if form.is_mip:
+        lp.integrality_ = [highspy.HighsVarType.kInteger if k else highspy.HighsVarType.kContinuous
+                           for k in form.integrality.tolist()]
+
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    h.passModel(lp)
+    return h
+
+
+def run_highs(h) -> str:
+    """Resuelve ``h`` y devuelve su estado (``highs_status``).
+
+    Si el presolve de HiGHS sólo sabe que el modelo es no acotado o
+    infactible, se resuelve de nuevo sin presolve (``run_without_presolve``)
+    para distinguirlos. Conviene usarla en lugar de ``h.run()`` siempre que
+    se vaya a leer el estado.
+    """
+    import highspy
+
+    h.run()
+    if h.getModelStatus() == highspy.HighsModelStatus.kUnboundedOrInfeasible:
+        run_without_presolve(h)
+    return highs_status(h)
+
+
+def run_without_presolve(h) -> None:
+    """Resuelve ``h`` de nuevo sin presolve y restaura el valor anterior de la opción."""
+    presolve = h.getOptionValue("presolve")
+    if isinstance(presolve, tuple):  # (HighsStatus, valor) en algunas versiones de highspy
+        presolve = presolve[-1]
+    h.setOptionValue("presolve", "off")
+    h.run()
+    h.setOptionValue("presolve", presolve)
+
+
+def highs_status(h) -> str:
+    """Estado de un ``highspy.Highs`` resuelto, con los nombres de ``pulp.LpStatus``.
+
+    Sólo lee el estado. Si HiGHS no distingue entre no acotado e
+    infactible, el estado es ``"Undefined"``; ``run_highs`` resuelve de nuevo
+    sin presolve en ese caso antes de leerlo.
+    """
+    import highspy
+
+    status = h.getModelStatus()
+    if status == highspy.HighsModelStatus.kOptimal:
+        return "Optimal"
+    if status == highspy.HighsModelStatus.kInfeasible:
+        return "Infeasible"
+    if status == highspy.HighsModelStatus.kUnbounded:
+        return "Unbounded"
+    if status == highspy.HighsModelStatus.kUnboundedOrInfeasible:
+        return "Undefined"
+    return "Not Solved"
@@ -0,0 +1,24 @@
+"""Utilidades para los diccionarios de parámetros de los modelos."""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+
+
+def merge_params(defaults: dict, overrides: dict | None = None) -> dict:
+    """Copia profunda de ``defaults`` con ``overrides`` aplicado recursivamente."""
+    merged = copy.deepcopy(defaults)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_params(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def params_hash(params: dict) -> str:
+    """Hash estable de un diccionario de parámetros (independiente del orden de claves)."""
+    text = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
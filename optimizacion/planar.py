@@ -0,0 +1,210 @@
+"""Resolución exacta de LP de dos variables por enumeración de vértices, vectorizada por lotes.
+
+Con dos variables continuas (Problema 4: ``XA``, ``XB``) cada restricción es
+un semiplano ``a @ x <= b`` (las ``==`` son dos semiplanos y las cotas de las
+variables también entran como filas). Los candidatos a óptimo son las
+intersecciones de cada par de rectas (regla de Cramer); se descartan las no
+factibles y se elige la de mejor funcional. El problema es no acotado si hay
+un vértice factible y una dirección de recesión (perpendicular a alguna
+normal, con ``A @ d <= 0``) que mejora el funcional.
+
+Todo se calcula sobre un eje de lote: ``solve_batch`` recibe ``c`` de forma
+``(B, 2)``, ``A`` de forma ``(B, m, 2)`` y ``b`` de forma ``(B, m)`` (o sin el
+eje ``B`` para compartirlos) y resuelve millones de escenarios en una llamada,
+por bloques de ``chunk`` escenarios para acotar la memoria.
+
+Si el conjunto factible no tiene vértices (todas las normales paralelas) el
+estado es ``Not Solved`` y ``optimizacion.solvers.solve`` recurre al solver
+general. Los arreglos de vértices × filas crecen con el cubo de la cantidad
+de filas: los bloques se dimensionan por pares × filas (``BUDGET``
+elementos) y los modelos de más de ``MAX_ROWS`` semiplanos no pasan por
+aquí, porque HiGHS los resuelve al instante.
+
+Uso::
+
+    python -m optimizacion.planar --scenarios 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pulp
+
+from optimizacion.matrix import MatrixForm
+from optimizacion.results import Result
+
+TOL = 1e-9
+MAX_ROWS = 64  # semiplanos; más allá la enumeración es más lenta que HiGHS
+BUDGET = 1 << 21  # elementos de cada arreglo (escenarios, pares, filas) por bloque
+
+
+@dataclass
+class PlanarBatch:
+    """Resultados de un lote: códigos de ``pulp.LpStatus``, vértice óptimo y funcional (sin ``offset``)."""
+
+    status: np.ndarray
+    x: np.ndarray
+    objective: np.ndarray
+
+
+def n_halfplanes(form: MatrixForm) -> int:
+    """Cantidad de filas de ``halfplanes(form)``."""
+    bounds = np.isfinite(form.lb).sum() + np.isfinite(form.ub).sum()
+    return form.A_ub.shape[0] + 2 * form.A_eq.shape[0] + int(bounds)
+
+
+def is_planar(form: MatrixForm, max_rows: int = MAX_ROWS) -> bool:
+    """``True`` si el modelo tiene exactamente dos variables, ninguna entera, y a lo sumo ``max_rows`` semiplanos."""
+    return len(form.c) == 2 and not form.is_mip and n_halfplanes(form) <= max_rows
+
+
+def halfplanes(form: MatrixForm) -> tuple[np.ndarray, np.ndarray]:
+    """Filas ``A @ x <= b`` equivalentes a ``form`` (restricciones, igualdades y cotas)."""
+    eq = form.A_eq.toarray()
+    rows = [form.A_ub.toarray(), eq, -eq]
+    rhs = [form.b_ub, form.b_eq, -form.b_eq]
+    for j in range(2):
+        unit = np.zeros((1, 2))
+        unit[0, j] = 1.0
+        if np.isfinite(form.lb[j]):
+            rows.append(-unit)
+            rhs.append([-form.lb[j]])
+        if np.isfinite(form.ub[j]):
+            rows.append(unit)
+            rhs.append([form.ub[j]])
+    return np.vstack(rows), np.concatenate([np.asarray(r, dtype=float) for r in rhs])
+
+
+def _solve_chunk(c, A, b, sense):
+    B, m = b.shape
+    I, J = np.triu_indices(m, 1)
+    if not len(I):  # con menos de dos filas no hay vértices
+        return np.full(B, pulp.LpStatusNotSolved), np.full((B, 2), np.nan), np.full(B, np.nan)
+    # Filas normalizadas: las tolerancias quedan en unidades de distancia
+    norm = np.hypot(A[..., 0], A[..., 1])
+    nonzero = norm > 0
+    scale = np.where(nonzero, norm, 1.0)
+    ax, ay, b = A[..., 0] / scale, A[..., 1] / scale, b / scale
+    # Las filas nulas (0 <= b) sólo cuentan para la factibilidad
+    b_tol = b + TOL * (1.0 + np.abs(b))
+
+    a1x, a1y, a2x, a2y, b1, b2 = ax[:, I], ay[:, I], ax[:, J], ay[:, J], b[:, I], b[:, J]
+    det = a1x * a2y - a1y * a2x
+    valid = np.abs(det) > TOL
+    safe = np.where(valid, det, 1.0)
+    px = (b1 * a2y - b2 * a1y) / safe
+    py = (a1x * b2 - a2x * b1) / safe
+
+    # Factibilidad de cada vértice (B, P) contra todas las filas (m)
+    excess = px[..., None] * ax[:, None, :] + py[..., None] * ay[:, None, :] - b_tol[:, None, :]
+    excess -= (TOL * (np.abs(px) + np.abs(py)))[..., None]
+    feasible = valid & (excess.max(axis=-1) <= 0)
+
+    gain = -sense * (px * c[:, 0, None] + py * c[:, 1, None])  # siempre se maximiza la ganancia
+    best = np.argmax(np.where(feasible, gain, -np.inf), axis=1)
+    rows = np.arange(B)
+    x = np.stack([px[rows, best], py[rows, best]], axis=-1)
+    any_feasible = feasible.any(axis=1)
+    has_vertex = valid.any(axis=1)
+
+    # Direcciones de recesión candidatas: ± perpendiculares a cada normal (unitarias)
+    dx = np.concatenate([-ay, ay], axis=1)
+    dy = np.concatenate([ax, -ax], axis=1)
+    along = dx[..., None] * ax[:, None, :] + dy[..., None] * ay[:, None, :]
+    recession = np.concatenate([nonzero, nonzero], axis=1) & (along.max(axis=-1) <= TOL)
+    improving = -sense * (dx * c[:, 0, None] + dy * c[:, 1, None]) > TOL * np.hypot(c[:, 0], c[:, 1])[:, None]
+    unbounded = any_feasible & np.any(recession & improving, axis=1)
+
+    status = np.full(B, pulp.LpStatusNotSolved)
+    status[any_feasible] = pulp.LpStatusOptimal
+    status[unbounded] = pulp.LpStatusUnbounded
+    status[~any_feasible & has_vertex] = pulp.LpStatusInfeasible
+    solved = status == pulp.LpStatusOptimal
+    x = np.where(solved[:, None], x, np.nan)
+    return status, x, np.where(solved, x[:, 0] * c[:, 0] + x[:, 1] * c[:, 1], np.nan)
+
+
+def solve_batch(c, A, b, sense: int = pulp.LpMinimize, chunk: int = 8192) -> PlanarBatch:
+    """Resuelve ``opt c @ x`` s.a. ``A @ x <= b`` para cada escenario del lote.
+
+    ``chunk`` es el máximo de escenarios por bloque; se reduce para que cada
+    arreglo (escenarios, pares de filas, filas) tenga a lo sumo ``BUDGET``
+    elementos.
+    """
+    c, A, b = (np.asarray(v, dtype=float) for v in (c, A, b))
+    B = max(c.shape[0] if c.ndim == 2 else 1, A.shape[0] if A.ndim == 3 else 1, b.shape[0] if b.ndim == 2 else 1)
+    m = A.shape[-2]
+    if m > MAX_ROWS:
+        raise ValueError(f"{m} semiplanos: la enumeración de vértices admite a lo sumo {MAX_ROWS}")
+    chunk = max(1, min(chunk, BUDGET // max(1, m * (m - 1) // 2 * m)))
+    c = np.broadcast_to(c, (B, 2))
+    A = np.broadcast_to(A, (B, m, 2))
+    b = np.broadcast_to(b, (B, m))
+    status = np.empty(B, dtype=int)
+    x = np.empty((B, 2))
+    objective = np.empty(B)
+    for start in range(0, B, chunk):
+        part = slice(start, start + chunk)
+        status[part], x[part], objective[part] = _solve_chunk(c[part], A[part], b[part], sense)
+    return PlanarBatch(status=status, x=x, objective=objective)
+
+
+def solve_planar(form: MatrixForm) -> Result:
+    """Resuelve un modelo de dos variables continuas y devuelve un ``Result`` como ``solve_matrix``."""
+    if not is_planar(form):
+        raise ValueError(f"{form.name}: se esperaban dos variables continuas y a lo sumo {MAX_ROWS} semiplanos")
+    A, b = halfplanes(form)
+    batch = solve_batch(form.c, A, b, sense=form.sense)
+    status = pulp.LpStatus[int(batch.status[0])]
+    if status != "Optimal":
+        return Result(status=status, objective=None, variables={n: None for n in form.variables})
+    return Result(
+        status=status,
+        objective=float(batch.objective[0] + form.offset),
+        variables=dict(zip(form.variables, batch.x[0].tolist())),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    from optimizacion.problems import problem4
+    from optimizacion.solvers import solve
+
+    parser = argparse.ArgumentParser(description="Escenarios de capacidad del Problema 4 resueltos en lote")
+    parser.add_argument("--scenarios", type=int, default=1_000_000)
+    parser.add_argument("--spread", type=float, default=0.2, help="variación relativa de las capacidades")
+    parser.add_argument("--check", type=int, default=200, help="escenarios a contrastar con HiGHS")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    form = problem4.build_matrices()
+    A, b = halfplanes(form)
+    depts = problem4.DEFAULT_PARAMS["departments"]
+    caps = np.array([[d[n] for n in form.variables] for d in depts.values()], dtype=float)  # (departamento, variable)
+    rng = np.random.default_rng(args.seed)
+    sampled = caps * rng.uniform(1 - args.spread, 1 + args.spread, size=(args.scenarios, *caps.shape))
+    A_batch = np.repeat(A[None], args.scenarios, axis=0)
+    A_batch[:, :len(depts)] = 1 / sampled  # las primeras filas son los departamentos
+
+    t0 = time.perf_counter()
+    batch = solve_batch(form.c, A_batch, b, sense=form.sense)
+    elapsed = time.perf_counter() - t0
+    counts = {pulp.LpStatus[int(s)]: int(n) for s, n in zip(*np.unique(batch.status, return_counts=True))}
+    print(f"{args.scenarios} escenarios en {elapsed:.2f} s ({args.scenarios / elapsed:,.0f}/s): {counts}")
+
+    worst = 0.0
+    for k in range(min(args.check, args.scenarios)):
+        params = {"departments": {name: dict(zip(form.variables, sampled[k, i].tolist()))
+                                  for i, name in enumerate(depts)}}
+        ref = solve(problem4.build_matrices(params), "highs", planar=False)
+        if ref.objective is not None:
+            worst = max(worst, abs(ref.objective - batch.objective[k]) / abs(ref.objective))
+    print(f"máxima diferencia relativa con HiGHS en {min(args.check, args.scenarios)} escenarios: {worst:.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
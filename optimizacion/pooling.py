@@ -0,0 +1,399 @@
+"""Mezcla con tanques de pool para la refinería (Problema 5): calidades variables y SLP.
+
+En ``Problema 5.py`` las especificaciones (``59*NFVNF + 98*NCCNF >= 80*NFC``,
+``60*NFVFO + 42*DOVFO + ... >= 21*FOC``) son lineales porque cada
+componente tiene calidad fija. Si varias corrientes se juntan en un tanque
+(pool) antes de ir a los productos, la calidad del pool depende de la mezcla
+y el modelo es bilineal (formulación ``p``)::
+
+    q[l, a] * F[l] == sum_s v[s, a] * f[s, l]                      (calidad del pool)
+    sum_s v[s, a] * x[s, p] + sum_l q[l, a] * y[l, p] >= min * p   (o <= max)
+
+con ``F[l]`` el total que entra al pool ``l``, ``f[s, l]`` lo que entra de
+cada corriente e ``y[l, p]`` lo que sale hacia cada producto. Los pools van
+en ``data["pools"]`` (``inputs``, ``capacity``, ``cost`` opcional) y los
+productos los nombran en ``components`` como a cualquier corriente; la parte
+lineal (balances, capacidades) la arma ``refinery.build_refinery`` tratando
+cada pool como una unidad de rendimiento 1.
+
+``solve_slp`` resuelve por programación lineal sucesiva. Parte de la
+relajación de McCormick (un LP que acota el óptimo global y da la brecha de
+la solución local; ``mccormick_bound`` la resuelve sola); cada LP siguiente
+linealiza los productos ``q * z`` alrededor del punto actual, con holguras
+penalizadas en las filas no lineales y una región de confianza sobre las
+calidades, en un único ``highspy.Highs`` al que sólo se le cambian
+coeficientes y cotas. Tras cada LP las calidades se recalculan con los
+flujos (como la recursión de los sistemas de planificación de refinerías).
+En general converge en pocas iteraciones, con tiempos del orden del LP sin
+pools.
+
+Uso::
+
+    python -m optimizacion.pooling
+    python -m optimizacion.pooling --crudes 2000 --units 20 --products 40 --pools 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pulp
+from scipy import sparse
+
+from optimizacion.matrix import MatrixForm, run_highs, to_highs
+from optimizacion.refinery import _flows, build_refinery, reference_data, synthetic_refinery
+
+TOL = 1e-6
+
+# Pools de la variante de referencia: naftas (NFV, NCC) y destilados (DOV, DCC)
+REFERENCE_POOLS = {
+    "GAS": {"inputs": ["NFV", "NCC"], "capacity": 300},
+    "DIE": {"inputs": ["DOV", "DCC"], "capacity": 400},
+}
+REFERENCE_POOLED_COMPONENTS = {"NFC": ["GAS"], "DOC": ["DIE", "NCC"], "FOC": ["GAS", "DIE", "CRR"]}
+
+
+@dataclass
+class PoolingResult:
+    """Solución local de ``solve_slp``: funcional, cota de McCormick, violación de las filas bilineales y calidades."""
+
+    status: str
+    objective: float | None
+    bound: float | None = None
+    violation: float = 0.0
+    iterations: int = 0
+    qualities: dict[str, float] = field(default_factory=dict)
+    variables: dict[str, float] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+def pooled_reference(params: dict | None = None) -> dict:
+    """Problema 5 con los pools ``GAS`` y ``DIE`` de ``REFERENCE_POOLS``."""
+    data = reference_data(params)
+    data["pools"] = {name: dict(pool) for name, pool in REFERENCE_POOLS.items()}
+    for product, components in REFERENCE_POOLED_COMPONENTS.items():
+        data["products"][product]["components"] = list(components)
+    return data
+
+
+def add_pools(data: dict, n_pools: int, seed: int = 0) -> dict:
+    """Copia de ``data`` con hasta ``n_pools`` pools de dos o tres corrientes cada uno.
+
+    Cada producto que usaba alguna entrada de un pool pasa a recibir el pool
+    en lugar de esas corrientes; la capacidad de cada pool es la de la torre.
+    """
+    rng = np.random.default_rng(seed)
+    free = [str(s) for s in rng.permutation(list(dict.fromkeys(
+        s for product in data["products"].values() for s in product["components"])))]
+    pools = {}
+    for k in range(1, n_pools + 1):
+        size = min(len(free), int(rng.integers(2, 4)))
+        if size < 2:
+            break
+        pools[f"POOL{k}"] = {"inputs": free[:size], "capacity": data["distillation"]["capacity"]}
+        free = free[size:]
+    products = {}
+    for name, product in data["products"].items():
+        components = list(product["components"])
+        for pool, spec in pools.items():
+            if any(s in components for s in spec["inputs"]):
+                components = [s for s in components if s not in spec["inputs"]] + [pool]
+        products[name] = {**product, "components": components}
+    return {**data, "products": products, "pools": pools}
+
+
+def _pad(A: sparse.csr_matrix, n: int) -> sparse.csr_matrix:
+    return sparse.hstack([A, sparse.csr_matrix((A.shape[0], n - A.shape[1]))], format="csr")
+
+
+class PoolingModel:
+    """Modelo bilineal de ``data``: parte lineal en matrices y términos ``sign * q * z`` aparte.
+
+    Columnas: las de ``build_refinery`` (con los pools como unidades) y una
+    calidad ``Q<pool>_<atributo>`` por pool y atributo que piden los
+    productos que lo reciben, acotada por las calidades de sus entradas. Las
+    filas de calidad van al final de ``A_eq`` y las de especificación al
+    final de ``A_ub``; cada término bilineal es (fila, columna de ``q``,
+    columna de ``z``, signo) con ``z`` acotada por la capacidad del pool.
+    """
+
+    def __init__(self, data: dict, penalty: float | None = None):
+        pools, products = data.get("pools", {}), data["products"]
+        units = {**data["units"], **{
+            l: {"capacity": pool["capacity"], "cost": pool.get("cost", 0.0),
+                "yields": {s: {l: 1.0} for s in pool["inputs"]}} for l, pool in pools.items()}}
+        linear = {**data, "units": units, "products": {p: {**products[p], "specs": []} for p in products}}
+        core = build_refinery(linear, name="Pooling")
+        index = {name: j for j, name in enumerate(core.variables)}
+        _, flow = _flows(linear)
+
+        # Valores de cada atributo por corriente (los de la primera especificación con ese nombre)
+        values: dict[str, dict[str, float]] = {}
+        for product in products.values():
+            for spec in product.get("specs", []):
+                values.setdefault(spec["name"], spec["values"])
+        self.quality = [(l, a) for l in pools for a in dict.fromkeys(
+            spec["name"] for p in products.values() if l in p["components"] for spec in p.get("specs", []))]
+        n0 = len(core.c)
+        n = n0 + len(self.quality)
+        q_col = {key: n0 + k for k, key in enumerate(self.quality)}
+        inputs = [np.array([values[a].get(s, 0.0) for s in pools[l]["inputs"]]) for l, a in self.quality]
+
+        eq, ub, terms = ([], [], []), ([], [], []), []  # (filas, columnas, valores); (es_eq, fila, q, z, signo, cota de z)
+        m_eq0, m_ub0 = core.A_eq.shape[0], core.A_ub.shape[0]
+        for k, (l, a) in enumerate(self.quality):
+            cols = [index[flow[s, l]] for s in pools[l]["inputs"]]
+            eq[0].extend([k] * len(cols)), eq[1].extend(cols), eq[2].extend(-inputs[k])
+            terms.append((True, m_eq0 + k, q_col[l, a], index["A" + l], 1.0, pools[l]["capacity"]))
+        m_ub = 0
+        for p, product in products.items():
+            direct = [s for s in product["components"] if s not in pools]
+            pooled = [l for l in product["components"] if l in pools]
+            for spec in product.get("specs", []):
+                for bound, sign in (("min", -1.0), ("max", 1.0)):
+                    if bound in spec:
+                        cols = [index[flow[s, p]] for s in direct] + [index[p]]
+                        vals = [spec["values"].get(s, 0.0) for s in direct] + [-spec[bound]]
+                        ub[0].extend([m_ub] * len(cols)), ub[1].extend(cols), ub[2].extend(sign * np.array(vals))
+                        terms += [(False, m_ub0 + m_ub, q_col[l, spec["name"]], index[flow[l, p]], sign,
+                                   pools[l]["capacity"]) for l in pooled]
+                        m_ub += 1
+
+        self.core, self.n0, self.n = core, n0, n
+        self.variables = list(core.variables) + [f"Q{l}_{a}" for l, a in self.quality]
+        self.c = np.r_[core.c, np.zeros(len(self.quality))]
+        self.lb = np.r_[core.lb, [v.min() for v in inputs]]
+        self.ub = np.r_[core.ub, [v.max() for v in inputs]]
+        self.A_eq = sparse.vstack([_pad(core.A_eq, n), sparse.csr_matrix(
+            (eq[2], (eq[0], eq[1])), shape=(len(self.quality), n))], format="csr")
+        self.A_ub = sparse.vstack([_pad(core.A_ub, n), sparse.csr_matrix(
+            (ub[2], (ub[0], ub[1])), shape=(m_ub, n))], format="csr")
+        self.b_eq = np.r_[core.b_eq, np.zeros(len(self.quality))]
+        self.b_ub = np.r_[core.b_ub, np.zeros(m_ub)]
+        self.nonlinear_eq = m_eq0 + np.arange(len(self.quality))
+        self.nonlinear_ub = m_ub0 + np.arange(m_ub)
+        columns = list(zip(*terms)) or [[]] * 6
+        self.t_eq = np.array(columns[0], dtype=bool)
+        self.t_row, self.t_q, self.t_z = (np.array(v, dtype=np.int64) for v in columns[1:4])
+        self.t_sign, self.t_zmax = np.array(columns[4], dtype=float), np.array(columns[5], dtype=float)
+        self.penalty = 1000.0 * (1.0 + np.abs(core.c).max()) if penalty is None else penalty
+
+    def residuals(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Lado izquierdo menos derecho de las filas de calidad (``==``) y de especificación (``<=``)."""
+        bilinear = self.t_sign * x[self.t_q] * x[self.t_z]
+        eq = self.A_eq @ x - self.b_eq + np.bincount(self.t_row[self.t_eq], bilinear[self.t_eq],
+                                                     minlength=len(self.b_eq))
+        ub = self.A_ub @ x - self.b_ub + np.bincount(self.t_row[~self.t_eq], bilinear[~self.t_eq],
+                                                     minlength=len(self.b_ub))
+        return eq[self.nonlinear_eq], ub[self.nonlinear_ub]
+
+    def violation(self, x: np.ndarray) -> float:
+        eq, ub = self.residuals(x)
+        return float(np.abs(eq).sum() + np.maximum(ub, 0.0).sum())
+
+    def merit(self, x: np.ndarray) -> float:
+        """Funcional menos la violación penalizada: el criterio con que ``solve_slp`` acepta un paso."""
+        return float(self.c @ x) - self.penalty * self.violation(x)
+
+    def implied_qualities(self, x: np.ndarray) -> np.ndarray:
+        """Copia de ``x`` con cada calidad igual a la de lo que entra a su pool (si entra algo)."""
+        x = x.copy()
+        inflow = x[self.t_z[self.t_eq]]
+        blended = -(self.A_eq[self.t_row[self.t_eq]] @ x)  # la parte lineal de la fila es -sum_s v * f
+        used = inflow > TOL
+        q = self.t_q[self.t_eq][used]
+        x[q] = np.clip(blended[used] / inflow[used], self.lb[q], self.ub[q])
+        return x
+
+    def _linearization(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Coeficientes de ``z`` y de ``q`` en ``q * z ≈ q0 * z + z0 * q - q0 * z0`` y los lados derechos."""
+        q0, z0 = x[self.t_q], x[self.t_z]
+        shift = self.t_sign * q0 * z0
+        b_eq = self.b_eq + np.bincount(self.t_row[self.t_eq], shift[self.t_eq], minlength=len(self.b_eq))
+        b_ub = self.b_ub + np.bincount(self.t_row[~self.t_eq], shift[~self.t_eq], minlength=len(self.b_ub))
+        return self.t_sign * q0, self.t_sign * z0, b_eq, b_ub
+
+    def linearized(self, x: np.ndarray) -> MatrixForm:
+        """LP linealizado en ``x`` con holguras penalizadas en las filas no lineales (al final de las columnas)."""
+        z_coef, q_coef, b_eq, b_ub = self._linearization(x)
+        n, m_eq, m_ub = self.n, len(self.nonlinear_eq), len(self.nonlinear_ub)
+        k = 2 * m_eq + m_ub
+        eq, ub = self.t_eq, ~self.t_eq
+
+        def terms(mask, shape):
+            return sparse.csr_matrix((np.r_[z_coef[mask], q_coef[mask]],
+                                      (np.tile(self.t_row[mask], 2), np.r_[self.t_z[mask], self.t_q[mask]])),
+                                     shape=shape)
+
+        elastic_eq = sparse.csr_matrix((np.r_[np.ones(m_eq), -np.ones(m_eq)],
+                                        (np.tile(self.nonlinear_eq, 2), np.arange(2 * m_eq))),
+                                       shape=(len(self.b_eq), k))
+        elastic_ub = sparse.csr_matrix((-np.ones(m_ub), (self.nonlinear_ub, 2 * m_eq + np.arange(m_ub))),
+                                       shape=(len(self.b_ub), k))
+        return MatrixForm(
+            c=np.r_[self.c, -self.penalty * np.ones(k)],
+            A_ub=sparse.hstack([self.A_ub + terms(ub, self.A_ub.shape), elastic_ub], format="csr"), b_ub=b_ub,
+            A_eq=sparse.hstack([self.A_eq + terms(eq, self.A_eq.shape), elastic_eq], format="csr"), b_eq=b_eq,
+            lb=np.r_[self.lb, np.zeros(k)], ub=np.r_[self.ub, np.full(k, np.inf)],
+            variables=self.variables + [f"Holgura_{j}" for j in range(k)], sense=pulp.LpMaximize, name="Pooling_SLP",
+        )
+
+    def relaxation(self) -> MatrixForm:
+        """Relajación de McCormick: cada ``q * z`` es una columna ``w`` con sus cuatro desigualdades."""
+        T, n = len(self.t_q), self.n
+        w = n + np.arange(T)
+        qL, qU, zU = self.lb[self.t_q], self.ub[self.t_q], self.t_zmax
+        eq, ub = self.t_eq, ~self.t_eq
+        A_eq = _pad(self.A_eq, n + T) + sparse.csr_matrix((self.t_sign[eq], (self.t_row[eq], w[eq])),
+                                                          shape=(len(self.b_eq), n + T))
+        A_ub = _pad(self.A_ub, n + T) + sparse.csr_matrix((self.t_sign[ub], (self.t_row[ub], w[ub])),
+                                                          shape=(len(self.b_ub), n + T))
+        # w >= qL z, w >= qU z + zU q - qU zU, w <= qU z, w <= qL z + zU q - qL zU
+        rows = np.arange(4 * T).reshape(4, T)
+        envelope = sparse.csr_matrix((
+            np.r_[qL, -np.ones(T), qU, zU, -np.ones(T), np.ones(T), -qU, np.ones(T), -qL, -zU],
+            (np.r_[rows[0], rows[0], rows[1], rows[1], rows[1], rows[2], rows[2], rows[3], rows[3], rows[3]],
+             np.r_[self.t_z, w, self.t_z, self.t_q, w, w, self.t_z, w, self.t_z, self.t_q]),
+        ), shape=(4 * T, n + T))
+        return MatrixForm(
+            c=np.r_[self.c, np.zeros(T)],
+            A_ub=sparse.vstack([A_ub, envelope], format="csr"),
+            b_ub=np.r_[self.b_ub, np.zeros(T), qU * zU, np.zeros(T), -qL * zU],
+            A_eq=A_eq, b_eq=self.b_eq,
+            lb=np.r_[self.lb, np.minimum(0.0, qL * zU)], ub=np.r_[self.ub, np.maximum(0.0, qU * zU)],
+            variables=self.variables + [f"W_{j}" for j in range(T)], sense=pulp.LpMaximize, name="Pooling_McCormick",
+        )
+
+
+def solve_slp(model: PoolingModel | dict, tol: float = 1e-6, max_iter: int = 200, radius: float = 0.25,
+              x0: np.ndarray | None = None) -> PoolingResult:
+    """Óptimo local por LP sucesivos con región de confianza sobre las calidades.
+
+    Parte de la solución de la relajación de McCormick con las calidades
+    recalculadas (o de ``x0``); su valor queda en ``PoolingResult.bound``.
+    Cada iteración resuelve el LP linealizado en el punto actual con las
+    calidades a lo sumo ``radius`` veces su rango del valor actual, recalcula
+    las calidades con los flujos obtenidos y acepta el paso si el funcional
+    penalizado (``PoolingModel.merit``) mejora al menos un décimo de lo que
+    preveía el LP; la región se agranda tras un paso bueno y se achica tras
+    uno malo. Termina cuando el LP ya no prevé una mejora relativa mayor que
+    ``tol``.
+
+    El estado es ``"Locally Optimal"`` si convergió con una violación de las
+    filas bilineales de a lo sumo ``tol``, ``"Feasible"`` si la violación es
+    a lo sumo ``tol`` pero se agotaron las iteraciones o la región de
+    confianza, e ``"Infeasible"`` si la violación supera ``tol``. Nunca es
+    ``"Optimal"``: el SLP no garantiza el óptimo global (la brecha con
+    ``bound`` lo acota).
+    """
+    start = time.perf_counter()
+    model = model if isinstance(model, PoolingModel) else PoolingModel(model)
+    relaxed = to_highs(model.relaxation())
+    status = run_highs(relaxed)
+    if status != "Optimal":
+        return PoolingResult(status=status, objective=None, elapsed=time.perf_counter() - start)
+    bound = relaxed.getInfo().objective_function_value
+    x = model.implied_qualities(np.asarray(relaxed.getSolution().col_value)[:model.n]) if x0 is None else x0
+
+    h = to_highs(model.linearized(x))
+    m_ub = model.A_ub.shape[0]
+    q_cols = np.arange(model.n0, model.n, dtype=np.int32)
+    width = model.ub[model.n0:] - model.lb[model.n0:]
+    rows = np.where(model.t_eq, m_ub + model.t_row, model.t_row).astype(np.int32)
+    eq_rows = (m_ub + model.nonlinear_eq).astype(np.int32)
+    ub_rows = model.nonlinear_ub.astype(np.int32)
+    current = model.merit(x)
+    converged = False
+    for iteration in range(1, max_iter + 1):
+        z_coef, q_coef, b_eq, b_ub = model._linearization(x)
+        for r, q, z, a, b in zip(rows.tolist(), model.t_q.tolist(), model.t_z.tolist(), z_coef.tolist(),
+                                 q_coef.tolist()):
+            h.changeCoeff(r, z, a)
+            h.changeCoeff(r, q, b)
+        h.changeRowsBounds(len(eq_rows), eq_rows, b_eq[model.nonlinear_eq], b_eq[model.nonlinear_eq])
+        h.changeRowsBounds(len(ub_rows), ub_rows, np.full(len(ub_rows), -np.inf), b_ub[model.nonlinear_ub])
+        q0 = x[model.n0:]
+        h.changeColsBounds(len(q_cols), q_cols, np.maximum(model.lb[model.n0:], q0 - radius * width),
+                           np.minimum(model.ub[model.n0:], q0 + radius * width))
+        status = run_highs(h)
+        if status != "Optimal":
+            raise RuntimeError(f"LP linealizado de la iteración {iteration}: {status}")
+        predicted = h.getInfo().objective_function_value
+        if predicted - current <= tol * (1.0 + abs(current)):
+            converged = True
+            break
+        candidate = model.implied_qualities(np.asarray(h.getSolution().col_value)[:model.n])
+        value = model.merit(candidate)
+        ratio = (value - current) / (predicted - current)
+        if ratio >= 0.1:
+            x, current = candidate, value
+        if ratio > 0.75:
+            radius = min(1.0, 2 * radius)
+        elif ratio < 0.25:
+            radius /= 2
+            if radius < TOL:
+                break
+
+    violation = model.violation(x)
+    if violation > tol:
+        status = "Infeasible"
+    else:
+        status = "Locally Optimal" if converged else "Feasible"
+    return PoolingResult(
+        status=status,
+        objective=float(model.c @ x), bound=bound, violation=violation, iterations=iteration,
+        qualities={name: float(v) + 0.0 for name, v in zip(model.variables[model.n0:], x[model.n0:])},
+        variables=dict(zip(model.variables, x.tolist())), elapsed=time.perf_counter() - start,
+    )
+
+
+def mccormick_bound(model: PoolingModel | dict) -> float | None:
+    """Cota superior del óptimo global: el valor de la relajación de McCormick."""
+    from optimizacion.solvers import solve
+
+    model = model if isinstance(model, PoolingModel) else PoolingModel(model)
+    return solve(model.relaxation(), "highs").objective
+
+
+def main(argv: list[str] | None = None) -> int:
+    from optimizacion.solvers import solve
+
+    parser = argparse.ArgumentParser(description="Refinería con pools de mezcla (calidades variables)")
+    parser.add_argument("--crudes", type=int, help="refinería sintética en lugar de la del Problema 5")
+    parser.add_argument("--units", type=int, default=5)
+    parser.add_argument("--products", type=int, default=10)
+    parser.add_argument("--pools", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tol", type=float, default=1e-6)
+    args = parser.parse_args(argv)
+
+    if args.crudes:
+        linear = synthetic_refinery(args.crudes, args.units, args.products, seed=args.seed)
+        data = add_pools(linear, args.pools, seed=args.seed)
+    else:
+        linear, data = reference_data(), pooled_reference()
+
+    t0 = time.perf_counter()
+    result = solve(build_refinery(linear), "highs")
+    print(f"LP sin pools: {result.status}, objetivo {result.objective:.6g} en {time.perf_counter() - t0:.3f} s")
+    t0 = time.perf_counter()
+    model = PoolingModel(data)
+    built = time.perf_counter() - t0
+    slp = solve_slp(model, tol=args.tol)
+    if slp.objective is None:
+        print(f"SLP con {len(data['pools'])} pools: {slp.status}")
+        return 1
+    print(f"SLP con {len(data['pools'])} pools: {slp.status}, objetivo {slp.objective:.6g}, violación "
+          f"{slp.violation:.1e}, {slp.iterations} iteraciones en {slp.elapsed:.3f} s (armado {built:.3f} s)")
+    gap = (slp.bound - slp.objective) / max(1.0, abs(slp.bound))
+    print(f"McCormick: cota {slp.bound:.6g}, brecha {gap:.2%}")
+    if not args.crudes:
+        print("calidades:", ", ".join(f"{k} = {v:.4g}" for k, v in slp.qualities.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
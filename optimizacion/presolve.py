@@ -0,0 +1,293 @@
+"""Presolve de una ``MatrixForm``: quita variables fijas y agregados definidos por igualdades.
+
+Reducciones, repetidas hasta que no hay cambios:
+
+- filas vacías (se verifica ``0 <= b``/``0 == b``) y filas ``<=`` redundantes
+  (su actividad máxima con las cotas actuales ya cumple ``b``);
+- filas de una sola variable: las ``==`` fijan la variable (``A1 == 150``)
+  y las ``<=`` se convierten en cotas (``XA <= 22500``);
+- variables fijas (``lb == ub``): se reemplaza su valor en las filas y en el
+  funcional;
+- agregados: en una fila ``==`` se despeja una variable continua cuyas cotas
+  quedan implicadas por el resto de la fila (``A = YA + VA + WA`` con todas
+  no negativas) y se sustituye en las demás filas y en el funcional. Entre
+  los candidatos se elige el de menos apariciones (menos relleno).
+
+``Presolved.postsolve`` reconstruye los valores de todas las variables
+originales deshaciendo los pasos en orden inverso. Sólo se recupera la
+solución primal; los precios sombra de las filas eliminadas no.
+
+Uso::
+
+    python -m optimizacion.presolve
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy import sparse
+
+from optimizacion.matrix import MatrixForm
+from optimizacion.results import Result
+
+TOL = 1e-9
+
+
+class PresolveInfeasible(Exception):
+    """El presolve encontró una fila o cota imposible de cumplir."""
+
+
+@dataclass
+class Presolved:
+    """Modelo reducido y lo necesario para volver a las variables originales.
+
+    ``columns[k]`` es el índice original de la columna ``k`` del modelo
+    reducido; ``steps`` son las fijaciones ``("fix", j, valor)`` y
+    sustituciones ``("sub", k, {i: a_i}, b, a_k)`` en el orden aplicado.
+    """
+
+    form: MatrixForm
+    original: MatrixForm
+    columns: np.ndarray
+    steps: list[tuple] = field(default_factory=list, repr=False)
+    removed_rows: list[str] = field(default_factory=list)
+
+    def postsolve(self, x) -> np.ndarray:
+        """Valores de las variables originales a partir de los del modelo reducido."""
+        full = np.zeros(len(self.original.c))
+        full[self.columns] = np.asarray(x, dtype=float)
+        for step in reversed(self.steps):
+            if step[0] == "fix":
+                _, j, value = step
+                full[j] = value
+            else:
+                _, k, coefs, rhs, pivot = step
+                full[k] = (rhs - sum(a * full[i] for i, a in coefs.items())) / pivot
+        return full
+
+    def summary(self) -> str:
+        """Una línea con el tamaño antes y después."""
+        m0, m1 = sum(self.original.shape[:2]), sum(self.form.shape[:2])
+        fixed = sum(1 for s in self.steps if s[0] == "fix")
+        return (f"{self.original.name}: {len(self.original.c)} -> {len(self.form.c)} variables, "
+                f"{m0} -> {m1} restricciones ({fixed} fijadas, {len(self.steps) - fixed} sustituidas)")
+
+
+class _Reducer:
+    """Modelo en filas ``{columna: coeficiente}`` sobre el que se aplican las reducciones."""
+
+    def __init__(self, form: MatrixForm):
+        self.form = form
+        self.c = form.c.astype(float).copy()
+        self.lb = form.lb.astype(float).copy()
+        self.ub = form.ub.astype(float).copy()
+        self.integer = np.zeros(len(self.c), dtype=bool) if form.integrality is None else form.integrality.astype(bool)
+        self.offset = float(form.offset)
+        self.names = list(form.ub_names) + list(form.eq_names)
+        self.rows: dict[int, dict[int, float]] = {}
+        self.rhs: dict[int, float] = {}
+        self.is_eq: dict[int, bool] = {}
+        self.cols: dict[int, set[int]] = {j: set() for j in range(len(self.c))}
+        for start, A, b, eq in ((0, form.A_ub, form.b_ub, False), (form.A_ub.shape[0], form.A_eq, form.b_eq, True)):
+            A = A.tocsr()
+            for i in range(A.shape[0]):
+                r = start + i
+                lo, hi = A.indptr[i], A.indptr[i + 1]
+                self.rows[r] = {int(j): float(a) for j, a in zip(A.indices[lo:hi], A.data[lo:hi]) if a != 0}
+                self.rhs[r] = float(b[i])
+                self.is_eq[r] = eq
+                for j in self.rows[r]:
+                    self.cols[j].add(r)
+        self.steps: list[tuple] = []
+        self.removed: list[str] = []
+
+    @staticmethod
+    def _tol(value: float) -> float:
+        return TOL * (1.0 + abs(value))
+
+    def _range(self, row: dict[int, float], skip: int | None = None) -> tuple[float, float]:
+        """Actividad mínima y máxima de ``row`` (sin la columna ``skip``) con las cotas actuales."""
+        low = high = 0.0
+        for j, a in row.items():
+            if j != skip:
+                lo, hi = (a * self.lb[j], a * self.ub[j]) if a > 0 else (a * self.ub[j], a * self.lb[j])
+                low += lo
+                high += hi
+        return low, high
+
+    def _drop_row(self, r: int) -> None:
+        for j in self.rows.pop(r):
+            self.cols[j].discard(r)
+        del self.rhs[r], self.is_eq[r]
+        self.removed.append(self.names[r])
+
+    def _fix(self, j: int, value: float) -> None:
+        if value < self.lb[j] - self._tol(value) or value > self.ub[j] + self._tol(value):
+            raise PresolveInfeasible(f"{self.form.variables[j]} = {value:g} fuera de sus cotas")
+        for r in self.cols.pop(j):
+            self.rhs[r] -= self.rows[r].pop(j) * value
+        self.offset += self.c[j] * value
+        self.steps.append(("fix", j, value))
+
+    def rows_pass(self) -> bool:
+        changed = False
+        for r in list(self.rows):
+            if r not in self.rows:
+                continue
+            row, b, eq = self.rows[r], self.rhs[r], self.is_eq[r]
+            if not row:
+                if (eq and abs(b) > self._tol(b)) or (not eq and b < -self._tol(b)):
+                    raise PresolveInfeasible(f"{self.names[r]}: 0 frente a {b:g}")
+                self._drop_row(r)
+            elif len(row) == 1:
+                (j, a), = row.items()
+                bound = b / a
+                self._drop_row(r)
+                if eq:
+                    if self.integer[j]:
+                        if abs(bound - round(bound)) > self._tol(bound):
+                            raise PresolveInfeasible(f"{self.names[r]}: {self.form.variables[j]} = {bound:g} no es entero")
+                        bound = round(bound)
+                    self._fix(j, bound)
+                elif a > 0:
+                    self.ub[j] = min(self.ub[j], math.floor(bound + TOL) if self.integer[j] else bound)
+                else:
+                    self.lb[j] = max(self.lb[j], math.ceil(bound - TOL) if self.integer[j] else bound)
+                if self.lb[j] > self.ub[j] + self._tol(self.ub[j]):
+                    raise PresolveInfeasible(f"{self.form.variables[j]}: cotas incompatibles")
+            elif not eq and self._range(row)[1] <= b + self._tol(b):
+                self._drop_row(r)
+            else:
+                continue
+            changed = True
+        return changed
+
+    def fixed_pass(self) -> bool:
+        fixed = [j for j in self.cols if self.lb[j] == self.ub[j]]
+        for j in fixed:
+            self._fix(j, self.lb[j])
+        return bool(fixed)
+
+    def substitute_pass(self) -> bool:
+        changed = False
+        for r in list(self.rows):
+            if r not in self.rows or not self.is_eq[r] or len(self.rows[r]) < 2:
+                continue
+            row, b = self.rows[r], self.rhs[r]
+            best = None
+            for k, a in row.items():
+                if self.integer[k]:
+                    continue
+                # x_k = (b - resto) / a_k: sus cotas tienen que quedar implicadas
+                low, high = self._range(row, skip=k)
+                lo, hi = sorted(((b - high) / a, (b - low) / a))
+                if lo >= self.lb[k] - self._tol(self.lb[k]) and hi <= self.ub[k] + self._tol(self.ub[k]):
+                    if best is None or len(self.cols[k]) < len(self.cols[best]):
+                        best = k
+            if best is None:
+                continue
+            k = best
+            pivot = row[k]
+            coefs = {i: a for i, a in row.items() if i != k}
+            self._drop_row(r)
+            for s in list(self.cols[k]):
+                target = self.rows[s]
+                factor = target.pop(k) / pivot
+                self.rhs[s] -= factor * b
+                for i, a in coefs.items():
+                    value = target.get(i, 0.0) - factor * a
+                    if abs(value) > TOL:
+                        target[i] = value
+                        self.cols[i].add(s)
+                    elif i in target:
+                        del target[i]
+                        self.cols[i].discard(s)
+            if self.c[k]:
+                self.offset += self.c[k] * b / pivot
+                for i, a in coefs.items():
+                    self.c[i] -= self.c[k] * a / pivot
+            del self.cols[k]
+            self.steps.append(("sub", k, coefs, b, pivot))
+            changed = True
+        return changed
+
+    def build(self) -> tuple[MatrixForm, np.ndarray]:
+        columns = np.array(sorted(self.cols), dtype=int)
+        position = {j: k for k, j in enumerate(columns.tolist())}
+        blocks = {}
+        for eq in (False, True):
+            ids = [r for r in self.rows if self.is_eq[r] == eq]
+            indptr = np.cumsum([0] + [len(self.rows[r]) for r in ids])
+            indices = [position[j] for r in ids for j in self.rows[r]]
+            data = [a for r in ids for a in self.rows[r].values()]
+            A = sparse.csr_matrix((data, indices, indptr), shape=(len(ids), len(columns)))
+            blocks[eq] = (A, np.array([self.rhs[r] for r in ids]), [self.names[r] for r in ids])
+        names = list(self.form.variables)
+        form = MatrixForm(
+            c=self.c[columns], A_ub=blocks[False][0], b_ub=blocks[False][1], A_eq=blocks[True][0], b_eq=blocks[True][1],
+            lb=self.lb[columns], ub=self.ub[columns], variables=[names[j] for j in columns],
+            ub_names=blocks[False][2], eq_names=blocks[True][2],
+            integrality=None if self.form.integrality is None else self.form.integrality[columns],
+            sense=self.form.sense, offset=self.offset, name=self.form.name,
+        )
+        return form, columns
+
+
+def presolve(form: MatrixForm, substitute: bool = True, max_passes: int = 20) -> Presolved:
+    """Reduce ``form``; lanza ``PresolveInfeasible`` si detecta que no hay solución."""
+    reducer = _Reducer(form)
+    for _ in range(max_passes):
+        changed = reducer.rows_pass()
+        changed |= reducer.fixed_pass()
+        if substitute:
+            changed |= reducer.substitute_pass()
+        if not changed:
+            break
+    reduced, columns = reducer.build()
+    return Presolved(form=reduced, original=form, columns=columns, steps=reducer.steps, removed_rows=reducer.removed)
+
+
+def solve_presolved(form: MatrixForm, backend: str = "highs", **options) -> Result:
+    """Presolve, resolución del modelo reducido con ``solvers.solve`` y vuelta a las variables originales."""
+    from optimizacion.solvers import solve
+
+    try:
+        reduced = presolve(form)
+    except PresolveInfeasible:
+        return Result(status="Infeasible", objective=None, variables={n: None for n in form.variables})
+    if len(reduced.form.c):
+        result = solve(reduced.form, backend, **options)
+        if result.objective is None:
+            return Result(status=result.status, objective=None, variables={n: None for n in form.variables})
+        x = [result.variables[n] for n in reduced.form.variables]
+    else:
+        result, x = Result(status="Optimal", objective=None), []
+    full = reduced.postsolve(x)
+    return Result(status=result.status, objective=float(form.c @ full + form.offset),
+                  variables=dict(zip(form.variables, full.tolist())))
+
+
+def main(argv: list[str] | None = None) -> int:
+    from optimizacion.problems import PROBLEMS
+    from optimizacion.solvers import solve
+
+    parser = argparse.ArgumentParser(description="Tamaño de cada problema antes y después del presolve")
+    parser.add_argument("problems", nargs="*", type=int, default=sorted(PROBLEMS))
+    args = parser.parse_args(argv)
+    for n in args.problems:
+        form = PROBLEMS[n].build_matrices()
+        t0 = time.perf_counter()
+        reduced = presolve(form)
+        elapsed = time.perf_counter() - t0
+        print(f"{reduced.summary()}  [{elapsed * 1000:.1f} ms]")
+        print(f"  objetivo: original {solve(form).objective:.6g}, con presolve {solve_presolved(form).objective:.6g}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,18 @@
+"""Constructores parametrizados de los seis modelos de referencia.
+
+Cada módulo ``problemN`` expone ``DEFAULT_PARAMS`` (los datos del script
+``Problema N/Problema N.py``) y ``build_model(params=None)``, que devuelve el
+``LpProblem`` sin resolver con los mismos nombres de variables y
+restricciones que el script original.
+"""
+
+from optimizacion.problems import problem1, problem2, problem3, problem4, problem5, problem6
+
+PROBLEMS = {
+    1: problem1,
+    2: problem2,
+    3: problem3,
+    4: problem4,
+    5: problem5,
+    6: problem6,
+}
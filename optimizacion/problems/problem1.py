@@ -0,0 +1,160 @@
+"""Problema 1: producción de los alimentos A y B a partir de los compuestos Y, V y W.
+
+Reproduce ``Problema 1/Problema 1.py`` (mismos nombres de variables y
+restricciones) a partir de un diccionario de parámetros.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pulp
+
+from optimizacion.matrix import MatrixBuilder, MatrixForm
+from optimizacion.params import merge_params
+
+FOODS = ("A", "B")
+INGREDIENTS = ("Y", "V", "W")
+
+DEFAULT_PARAMS = {
+    # Precio de venta: A1/B1 demanda fija, A2/B2 excedente
+    "prices": {"A1": 35, "B1": 30, "A2": 28, "B2": 24},
+    "fixed_sales": {"A1": 150, "B1": 200},
+    # Ingreso por hora de máquina no usada (SM) y costo por hora usada (HMU)
+    "idle_machine_price": 150,
+    "machine_cost": 100,
+    "machine_hours": {"A": 0.0667, "B": 0.05},
+    "machine_hours_available": 24,
+    "ingredient_costs": {"Y": 7, "V": 9, "W": 5},
+    # Mano de obra: horas por kg y costo/límite de horas normales (HN) y extras (HE)
+    "labor_hours": {"A": 0.5, "B": 0.4},
+    "labor_costs": {"HN": 5, "HE": 7},
+    "labor_limits": {"HN": 150, "HE": 30},
+    # Especificaciones nutricionales: aporte por kg de compuesto y cota por kg de alimento
+    "specs": {
+        "energia": {"sense": "<=", "coefs": {"Y": 3500, "V": 300, "W": 500}, "bounds": {"A": 3900, "B": 4500}},
+        "fibra": {"sense": ">=", "coefs": {"Y": 45, "V": 60, "W": 30}, "bounds": {"A": 50, "B": 40}},
+        "grasas": {"sense": "<=", "coefs": {"Y": 30, "V": 25, "W": 35}, "bounds": {"A": 30, "B": 33}},
+        "saturadas": {"sense": "<=", "coefs": {"Y": 0, "V": 0, "W": 4}, "bounds": {"A": 3, "B": 3}},
+        "carbohidratos_min": {"sense": ">=", "coefs": {"Y": 150, "V": 130, "W": 50}, "bounds": {"A": 70, "B": 80}},
+        "carbohidratos_max": {"sense": "<=", "coefs": {"Y": 150, "V": 130, "W": 50}, "bounds": {"A": 130, "B": 140}},
+        "hierro": {"sense": ">=", "coefs": {"Y": 40, "V": 70, "W": 50}, "bounds": {"A": 45, "B": 45}},
+        "calcio": {"sense": ">=", "coefs": {"Y": 5.7, "V": 3.3, "W": 4.1}, "bounds": {"A": 3.7, "B": 3.5}},
+        "vitaminas": {"sense": ">=", "coefs": {"Y": 20, "V": 30, "W": 20}, "bounds": {"A": 22, "B": 22}},
+        "colesterol": {"sense": "<=", "coefs": {"Y": 0, "V": 0, "W": 12}, "bounds": {"A": 5, "B": 10}},
+        "proteina": {"sense": ">=", "coefs": {"Y": 130, "V": 180, "W": 100}, "bounds": {"A": 140, "B": 120}},
+    },
+}
+
+# Nombres de las restricciones nutricionales tal como figuran en el script de referencia
+SPEC_NAMES = {
+    "energia": "restriccion_capacidad_{food}",
+    "fibra": "restriccion_demanda_{food}",
+    "grasas": "restriccion_recurso_{food}",
+    "saturadas": "restriccion_W{food}_{food}",
+    "carbohidratos_min": "restriccion_minima_{food}",
+    "carbohidratos_max": "restriccion_maxima_{food}",
+    "hierro": "restriccion_minima2_{food}",
+    "calcio": "restriccion_minima3_{food}",
+    "vitaminas": "restriccion_minima4_{food}",
+    "colesterol": "restriccion_W{food}_{food}_2",
+    "proteina": "restriccion_minima5_{food}",
+}
+
+
+def _variable_names() -> list[str]:
+    # Variables en el orden declarado en el script de referencia
+    names = ["A1", "B1", "A2", "B2", "SM", *INGREDIENTS, "HMU", "HN", "HE"]
+    return names + [i + f for i in INGREDIENTS for f in FOODS] + list(FOODS)
+
+
+def build_model(params: dict | None = None) -> pulp.LpProblem:
+    """Construye el modelo del Problema 1 para ``params`` (sobre ``DEFAULT_PARAMS``)."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    x = {n: pulp.LpVariable(n, lowBound=0, cat="Continuous") for n in _variable_names()}
+
+    prob = pulp.LpProblem("Problema_Maximizacion", pulp.LpMaximize)
+
+    prob += (
+        pulp.lpSum(price * x[n] for n, price in p["prices"].items())
+        + p["idle_machine_price"] * x["SM"]
+        - pulp.lpSum(cost * x[i] for i, cost in p["ingredient_costs"].items())
+        - p["machine_cost"] * x["HMU"]
+        - pulp.lpSum(cost * x[h] for h, cost in p["labor_costs"].items())
+    ), "Z"
+
+    for i in INGREDIENTS:
+        prob += pulp.lpSum(x[i + f] for f in FOODS) == x[i], f"restriccion_{i}"
+    for f in FOODS:
+        prob += pulp.lpSum(x[i + f] for i in INGREDIENTS) == x[f], f"restriccion_{f}"
+
+    for key, spec in p["specs"].items():
+        for f in FOODS:
+            content = pulp.lpSum(c * x[i + f] for i, c in spec["coefs"].items() if c != 0)
+            bound = spec["bounds"][f] * x[f]
+            name = SPEC_NAMES.get(key, "restriccion_" + key + "_{food}").format(food=f)
+            prob += (content <= bound if spec["sense"] == "<=" else content >= bound), name
+
+    prob += pulp.lpSum(p["machine_hours"][f] * x[f] for f in FOODS) == x["HMU"], "restriccion_HMU"
+    prob += x["HMU"] + x["SM"] == p["machine_hours_available"], "restriccion_HMU_SM"
+    prob += pulp.lpSum(p["labor_hours"][f] * x[f] for f in FOODS) == x["HN"] + x["HE"], "restriccion_HN_HE"
+    for h, limit in p["labor_limits"].items():
+        prob += x[h] <= limit, f"restriccion_{h}_max"
+
+    for f in FOODS:
+        prob += x[f + "1"] + x[f + "2"] == x[f], f"restriccion_{f}1_{f}2_{f}"
+    for n, amount in p["fixed_sales"].items():
+        prob += x[n] == amount, f"restriccion_{n}_fijo"
+
+    return prob
+
+
+def build_matrices(params: dict | None = None) -> MatrixForm:
+    """Forma matricial del mismo modelo que ``build_model``, armada con NumPy."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    mb = MatrixBuilder(_variable_names())
+    nf, ni = len(FOODS), len(INGREDIENTS)
+
+    c = np.zeros(len(mb.variables))
+    for names, coefs in (
+        (list(p["prices"]), list(p["prices"].values())),
+        (["SM", "HMU"], [p["idle_machine_price"], -p["machine_cost"]]),
+        (list(p["ingredient_costs"]), [-v for v in p["ingredient_costs"].values()]),
+        (list(p["labor_costs"]), [-v for v in p["labor_costs"].values()]),
+    ):
+        c[mb.cols(names)] = coefs
+
+    # Y = YA + YB, ... y A = YA + VA + WA, ...: -agregado + suma de flujos == 0
+    mix = np.array([[mb.index[i + f] for f in FOODS] for i in INGREDIENTS])  # (ingrediente, alimento)
+    agg_i, agg_f = mb.cols(INGREDIENTS), mb.cols(FOODS)
+    mb.add_rows("==", [f"restriccion_{i}" for i in INGREDIENTS],
+                np.repeat(np.arange(ni), nf + 1), np.column_stack([mix, agg_i]).ravel(),
+                np.tile(np.r_[np.ones(nf), -1.0], ni), 0)
+    mb.add_rows("==", [f"restriccion_{f}" for f in FOODS],
+                np.repeat(np.arange(nf), ni + 1), np.column_stack([mix.T, agg_f]).ravel(),
+                np.tile(np.r_[np.ones(ni), -1.0], nf), 0)
+
+    # Especificaciones: coefs @ flujos - cota * alimento (<= o >=) 0, una fila por (espec, alimento)
+    specs = list(p["specs"].items())
+    coefs = np.array([[spec["coefs"][i] for i in INGREDIENTS] for _, spec in specs], dtype=float)
+    bounds = np.array([[spec["bounds"][f] for f in FOODS] for _, spec in specs], dtype=float)
+    sign = np.array([1.0 if spec["sense"] == "<=" else -1.0 for _, spec in specs])
+    vals = np.concatenate([np.repeat(coefs[:, None, :], nf, axis=1), -bounds[:, :, None]], axis=2) * sign[:, None, None]
+    cols = np.broadcast_to(np.column_stack([mix.T, agg_f])[None], vals.shape)
+    names = [SPEC_NAMES.get(key, "restriccion_" + key + "_{food}").format(food=f) for key, _ in specs for f in FOODS]
+    mb.add_rows("<=", names, np.repeat(np.arange(len(names)), ni + 1), cols.ravel(), vals.ravel(), 0)
+
+    hours = [p["machine_hours"][f] for f in FOODS]
+    labor = [p["labor_hours"][f] for f in FOODS]
+    mb.add_rows("==", ["restriccion_HMU"], np.zeros(nf + 1), np.r_[agg_f, mb.index["HMU"]], np.r_[hours, -1], 0)
+    mb.add_rows("==", ["restriccion_HMU_SM"], [0, 0], mb.cols(["HMU", "SM"]), [1, 1], p["machine_hours_available"])
+    mb.add_rows("==", ["restriccion_HN_HE"], np.zeros(nf + 2), np.r_[agg_f, mb.cols(["HN", "HE"])], np.r_[labor, -1, -1], 0)
+    limits = p["labor_limits"]
+    mb.add_rows("<=", [f"restriccion_{h}_max" for h in limits], np.arange(len(limits)), mb.cols(limits), 1, list(limits.values()))
+
+    sales = np.column_stack([mb.cols(f + "1" for f in FOODS), mb.cols(f + "2" for f in FOODS), agg_f])
+    mb.add_rows("==", [f"restriccion_{f}1_{f}2_{f}" for f in FOODS], np.repeat(np.arange(nf), 3), sales.ravel(),
+                np.tile([1.0, 1.0, -1.0], nf), 0)
+    fixed = p["fixed_sales"]
+    mb.add_rows("==", [f"restriccion_{n}_fijo" for n in fixed], np.arange(len(fixed)), mb.cols(fixed), 1, list(fixed.values()))
+
+    return mb.build(c, sense=pulp.LpMaximize, name="Problema_Maximizacion")
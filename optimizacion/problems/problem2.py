@@ -0,0 +1,57 @@
+"""Problema 2: programación de arranque y despacho de los generadores A, B y C.
+
+Reproduce ``Problema 2/Problema 2.py``: un binario de arranque ``I<g>`` por
+generador (costo fijo único) y la producción ``<g><t>`` por período. Para
+instancias grandes ver ``optimizacion.unit_commitment``.
+"""
+
+from __future__ import annotations
+
+import pulp
+
+from optimizacion.matrix import MatrixForm
+from optimizacion.params import merge_params
+from optimizacion.unit_commitment import from_table
+
+DEFAULT_PARAMS = {
+    "generators": {
+        "A": {"startup_cost": 4000, "unit_cost": 6, "capacity": 2300, "minimum": 400},
+        "B": {"startup_cost": 3000, "unit_cost": 5, "capacity": 2000, "minimum": 300},
+        "C": {"startup_cost": 2000, "unit_cost": 8, "capacity": 3300, "minimum": 500},
+    },
+    "demand": [2500, 1800, 3500],
+}
+
+
+def build_model(params: dict | None = None) -> pulp.LpProblem:
+    """Construye el modelo del Problema 2 para ``params`` (sobre ``DEFAULT_PARAMS``)."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    gens = p["generators"]
+    periods = range(1, len(p["demand"]) + 1)
+
+    x = {(g, t): pulp.LpVariable(f"{g}{t}", lowBound=0, cat="Continuous") for g in gens for t in periods}
+    on = {g: pulp.LpVariable(f"I{g}", cat="Binary") for g in gens}
+
+    prob = pulp.LpProblem("Problema_de_Minimizacion", pulp.LpMinimize)
+
+    prob += (
+        pulp.lpSum(gens[g]["startup_cost"] * on[g] for g in gens)
+        + pulp.lpSum(gens[g]["unit_cost"] * x[g, t] for g in gens for t in periods)
+    )
+
+    for t, demand in zip(periods, p["demand"]):
+        prob += (pulp.lpSum(x[g, t] for g in gens) == demand, f"Demanda_{t}")
+    for g in gens:
+        for t in periods:
+            prob += (x[g, t] <= gens[g]["capacity"] * on[g], f"Cap_{g}{t}")
+    for g in gens:
+        for t in periods:
+            prob += (x[g, t] >= gens[g]["minimum"] * on[g], f"Min_{g}{t}")
+
+    return prob
+
+
+def build_matrices(params: dict | None = None) -> MatrixForm:
+    """Forma matricial del mismo modelo que ``build_model``, armada con NumPy."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    return from_table(p["generators"], p["demand"])
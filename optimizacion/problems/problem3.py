@@ -0,0 +1,59 @@
+"""Problema 3: mezcla de los licores A, B y C en los whiskies E, K y T.
+
+Reproduce ``Problema 3/Problema 3.py``: flujos ``<licor><marca>`` más las
+variables agregadas por licor y por marca.
+"""
+
+from __future__ import annotations
+
+import pulp
+
+from optimizacion.matrix import MatrixForm
+from optimizacion.params import merge_params
+
+DEFAULT_PARAMS = {
+    "availability": {"A": 2000, "B": 2500, "C": 1200},
+    "costs": {"A": 7, "B": 5, "C": 4},
+    "prices": {"E": 6.8, "K": 5.7, "T": 4.5},
+    # Fracción mínima / máxima de cada licor en cada marca: {marca: {licor: fracción}}
+    "min_fraction": {"E": {"A": 0.6}, "K": {"A": 0.15}},
+    "max_fraction": {"E": {"C": 0.2}, "K": {"C": 0.6}, "T": {"C": 0.5}},
+}
+
+
+def build_model(params: dict | None = None) -> pulp.LpProblem:
+    """Construye el modelo del Problema 3 para ``params`` (sobre ``DEFAULT_PARAMS``)."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    liquors = list(p["availability"])
+    brands = list(p["prices"])
+
+    names = liquors + brands + [l + b for l in liquors for b in brands]
+    x = {n: pulp.LpVariable(n, lowBound=0, cat="Continuous") for n in names}
+
+    prob = pulp.LpProblem("Problema", pulp.LpMaximize)
+
+    prob += (
+        pulp.lpSum(p["prices"][b] * x[b] for b in brands)
+        - pulp.lpSum(p["costs"][l] * x[l] for l in liquors)
+    ), "Beneficio_total"
+
+    constraints = []
+    constraints += [x[l] <= p["availability"][l] for l in liquors]
+    constraints += [pulp.lpSum(x[l + b] for b in brands) == x[l] for l in liquors]
+    constraints += [pulp.lpSum(x[l + b] for l in liquors) == x[b] for b in brands]
+    for b in brands:
+        for l, frac in p["min_fraction"].get(b, {}).items():
+            constraints.append(frac * x[b] <= x[l + b])
+        for l, frac in p["max_fraction"].get(b, {}).items():
+            constraints.append(x[l + b] <= frac * x[b])
+    for k, constraint in enumerate(constraints, start=1):
+        prob += constraint, f"Restriccion_{k}"
+
+    return prob
+
+
+def build_matrices(params: dict | None = None) -> MatrixForm:
+    """Forma matricial del mismo modelo que ``build_model``, armada con NumPy (``optimizacion.blending``)."""
+    from optimizacion.blending import BlendingData, build_blending
+
+    return build_blending(BlendingData.from_params(params))
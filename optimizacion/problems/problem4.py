@@ -0,0 +1,65 @@
+"""Problema 4: producción de automóviles (XA) y camiones (XB).
+
+Reproduce ``Problema 4/Problema 4.py``. Cada departamento tiene una
+capacidad expresada en unidades por período si se dedicara por completo a un
+solo producto, de ahí los coeficientes ``1/capacidad``.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pulp
+
+from optimizacion.matrix import MatrixBuilder, MatrixForm
+from optimizacion.params import merge_params
+
+DEFAULT_PARAMS = {
+    "profits": {"XA": 15000, "XB": 12500},
+    "departments": {
+        "estampado": {"XA": 25000, "XB": 40000},
+        "montaje_motores": {"XA": 33333, "XB": 16667},
+    },
+    "line_capacity": {"XA": 22500, "XB": 15000},
+    "min_production": {"XA": 12000, "XB": 8000},
+    "max_demand": {"XA": 18000},
+}
+
+
+def build_model(params: dict | None = None) -> pulp.LpProblem:
+    """Construye el modelo del Problema 4 para ``params`` (sobre ``DEFAULT_PARAMS``)."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    x = {n: pulp.LpVariable(n, lowBound=0, cat="Continuous") for n in p["profits"]}
+
+    prob = pulp.LpProblem("Problema_4", pulp.LpMaximize)
+
+    prob += pulp.lpSum(profit * x[n] for n, profit in p["profits"].items()), "Objetivo"
+
+    constraints = [pulp.lpSum((1 / cap) * x[n] for n, cap in dept.items()) <= 1 for dept in p["departments"].values()]
+    constraints += [x[n] <= cap for n, cap in p["line_capacity"].items()]
+    constraints += [x[n] >= amount for n, amount in p["min_production"].items()]
+    constraints += [x[n] <= amount for n, amount in p["max_demand"].items()]
+    for k, constraint in enumerate(constraints, start=1):
+        prob += constraint, f"Restriccion_{k}"
+
+    return prob
+
+
+def build_matrices(params: dict | None = None) -> MatrixForm:
+    """Forma matricial del mismo modelo que ``build_model``, armada con NumPy."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    mb = MatrixBuilder(list(p["profits"]))
+    c = np.array(list(p["profits"].values()), dtype=float)
+
+    depts = list(p["departments"].values())
+    dept_cols = [mb.cols(d) for d in depts]
+    groups = [("<=", p["line_capacity"]), (">=", p["min_production"]), ("<=", p["max_demand"])]
+    names = [f"Restriccion_{k}" for k in range(1, len(depts) + sum(len(g) for _, g in groups) + 1)]
+
+    mb.add_rows("<=", names[:len(depts)], np.repeat(np.arange(len(depts)), [len(cc) for cc in dept_cols]),
+                np.concatenate(dept_cols), 1 / np.concatenate([np.array(list(d.values()), dtype=float) for d in depts]), 1)
+    start = len(depts)
+    for sense, group in groups:
+        mb.add_rows(sense, names[start:start + len(group)], np.arange(len(group)), mb.cols(group), 1, list(group.values()))
+        start += len(group)
+
+    return mb.build(c, sense=pulp.LpMaximize, name="Problema_4")
@@ -0,0 +1,159 @@
+"""Problema 5: refinería con Pipe Still (PS) y Cracking Catalítico (CC).
+
+Reproduce ``Problema 5/Problema 5.py``. Los crudos se destilan en la PS en
+cuatro cortes (NFV, DOV, GOP, CRR); DOV y GOP pueden ir al CC, que produce
+NCC y DCC; los cortes se mezclan en los productos NFC, DOC y FOC con
+especificaciones de octanaje, flash point y viscosidad.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pulp
+
+from optimizacion.matrix import MatrixBuilder, MatrixForm
+from optimizacion.params import merge_params
+
+DEFAULT_PARAMS = {
+    "crudes": {
+        "SAC": {"cost": 27, "availability": 120, "yields": {"NFV": 0.22, "DOV": 0.28, "GOP": 0.4, "CRR": 0.08}},
+        "TDF": {"cost": 25, "availability": 120, "yields": {"NFV": 0.2, "DOV": 0.26, "GOP": 0.37, "CRR": 0.15}},
+        "CHU": {"cost": 23, "availability": 150, "yields": {"NFV": 0.15, "DOV": 0.3, "GOP": 0.35, "CRR": 0.18}},
+        "SAL": {"cost": 22, "availability": 110, "yields": {"NFV": 0.08, "DOV": 0.26, "GOP": 0.3, "CRR": 0.24}},
+        "NEU": {"cost": 20, "availability": 150, "yields": {"NFV": 0.03, "DOV": 0.28, "GOP": 0.32, "CRR": 0.35}},
+    },
+    "pipe_still": {"capacity": 500, "cost": 0.4},
+    "cracker": {"capacity": 395, "cost": 0.25, "yields": {"DOV": {"NCC": 0.25, "DCC": 0.85}, "GOP": {"NCC": 0.55, "DCC": 0.6}}},
+    "prices": {"NFC": 35, "DOC": 30, "FOC": 24},
+    "product_bounds": {"NFC": [150, 350], "DOC": [150, 350], "FOC": [None, 400]},
+    "octane": {"NFV": 59, "NCC": 98, "min": 80},
+    "viscosity": {"NFV": 60, "DOV": 42, "DCC": 52, "CRR": 14, "min": 21},
+    "max_ncc_in_doc": 0.1,
+}
+
+
+FLOWS = ["NFVNF", "NFVFO", "DOVCC", "DOVDO", "DOVFO", "GOPCC", "CRRFO", "NCCNF", "NCCDO", "DCCDO", "DCCFO"]
+
+
+def _variable_names(crudes) -> list[str]:
+    return ["NFC", "DOC", "FOC"] + [c + "PS" for c in crudes] + ["APS", "ACC"] + FLOWS
+
+
+def build_model(params: dict | None = None) -> pulp.LpProblem:
+    """Construye el modelo del Problema 5 para ``params`` (sobre ``DEFAULT_PARAMS``)."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    crudes = p["crudes"]
+    cc_yields = p["cracker"]["yields"]
+
+    x = {n: pulp.LpVariable(n, lowBound=0, cat="Continuous") for n in _variable_names(crudes)}
+    ps = {c: x[c + "PS"] for c in crudes}
+
+    def cut(stream):
+        return pulp.lpSum(crudes[c]["yields"][stream] * ps[c] for c in crudes)
+
+    def cracked(product):
+        return cc_yields["DOV"][product] * x["DOVCC"] + cc_yields["GOP"][product] * x["GOPCC"]
+
+    prob = pulp.LpProblem("Problema_5", pulp.LpMaximize)
+
+    prob += (
+        pulp.lpSum(price * x[n] for n, price in p["prices"].items())
+        - pulp.lpSum(crudes[c]["cost"] * ps[c] for c in crudes)
+        - p["pipe_still"]["cost"] * x["APS"] - p["cracker"]["cost"] * x["ACC"]
+    ), "Funcional_objetivo"
+
+    def bounds(product):
+        low, high = p["product_bounds"][product]
+        return ([x[product] >= low] if low is not None else []) + ([x[product] <= high] if high is not None else [])
+
+    octane, viscosity = p["octane"], p["viscosity"]
+    constraints = [
+        pulp.lpSum(ps.values()) == x["APS"],
+        x["APS"] <= p["pipe_still"]["capacity"],
+        *(ps[c] <= crudes[c]["availability"] for c in crudes),
+        cut("NFV") == x["NFVNF"] + x["NFVFO"],
+        cut("DOV") == x["DOVCC"] + x["DOVDO"] + x["DOVFO"],
+        cut("GOP") == x["GOPCC"],
+        cut("CRR") == x["CRRFO"],
+        x["DOVCC"] + x["GOPCC"] == x["ACC"],
+        x["ACC"] <= p["cracker"]["capacity"],
+        cracked("NCC") == x["NCCNF"] + x["NCCDO"],
+        cracked("DCC") == x["DCCDO"] + x["DCCFO"],
+        x["NFVNF"] + x["NCCNF"] == x["NFC"],
+        octane["NFV"] * x["NFVNF"] + octane["NCC"] * x["NCCNF"] >= octane["min"] * x["NFC"],
+        *bounds("NFC"),
+        x["DOVDO"] + x["DCCDO"] + x["NCCDO"] == x["DOC"],
+        x["NCCDO"] <= p["max_ncc_in_doc"] * x["DOC"],
+        *bounds("DOC"),
+        x["NFVFO"] + x["DOVFO"] + x["DCCFO"] + x["CRRFO"] == x["FOC"],
+        viscosity["NFV"] * x["NFVFO"] + viscosity["DOV"] * x["DOVFO"]
+        + viscosity["DCC"] * x["DCCFO"] + viscosity["CRR"] * x["CRRFO"] >= viscosity["min"] * x["FOC"],
+        *bounds("FOC"),
+    ]
+    for k, constraint in enumerate(constraints, start=1):
+        prob += constraint, f"Restriccion_{k}"
+
+    return prob
+
+
+def build_matrices(params: dict | None = None) -> MatrixForm:
+    """Forma matricial del mismo modelo que ``build_model``, armada con NumPy."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    crudes = p["crudes"]
+    C = len(crudes)
+    mb = MatrixBuilder(_variable_names(crudes))
+    ps = mb.cols(c + "PS" for c in crudes)
+    cost = np.array([v["cost"] for v in crudes.values()], dtype=float)
+    avail = np.array([v["availability"] for v in crudes.values()], dtype=float)
+    cuts = ("NFV", "DOV", "GOP", "CRR")
+    yields = np.array([[v["yields"][s] for s in cuts] for v in crudes.values()], dtype=float)  # (crudo, corte)
+
+    c = np.zeros(len(mb.variables))
+    c[mb.cols(p["prices"])] = list(p["prices"].values())
+    c[ps] = -cost
+    c[mb.cols(["APS", "ACC"])] = [-p["pipe_still"]["cost"], -p["cracker"]["cost"]]
+
+    rows = []  # (sentido, columnas, coeficientes, lado derecho), en el orden del script de referencia
+
+    def add(sense, names_or_cols, vals, rhs=0.0):
+        cols = names_or_cols if isinstance(names_or_cols, np.ndarray) else mb.cols(names_or_cols)
+        rows.append((sense, cols, np.broadcast_to(np.asarray(vals, dtype=float), cols.shape), rhs))
+
+    def bounds(product):
+        low, high = p["product_bounds"][product]
+        if low is not None:
+            add(">=", [product], 1, low)
+        if high is not None:
+            add("<=", [product], 1, high)
+
+    # Destinos posibles de cada corte: NFV -> NF/FO, DOV -> CC/DO/FO, GOP -> CC, CRR -> FO
+    destinations = {"NFV": ["NFVNF", "NFVFO"], "DOV": ["DOVCC", "DOVDO", "DOVFO"], "GOP": ["GOPCC"], "CRR": ["CRRFO"]}
+    cc = p["cracker"]["yields"]
+    octane, viscosity = p["octane"], p["viscosity"]
+
+    add("==", np.r_[ps, mb.index["APS"]], np.r_[np.ones(C), -1.0])
+    add("<=", ["APS"], 1, p["pipe_still"]["capacity"])
+    for k in range(C):
+        add("<=", ps[k:k + 1], 1, avail[k])
+    for j, cut in enumerate(cuts):
+        dest = destinations[cut]
+        add("==", np.r_[ps, mb.cols(dest)], np.r_[yields[:, j], -np.ones(len(dest))])
+    add("==", ["DOVCC", "GOPCC", "ACC"], [1, 1, -1])
+    add("<=", ["ACC"], 1, p["cracker"]["capacity"])
+    add("==", ["DOVCC", "GOPCC", "NCCNF", "NCCDO"], [cc["DOV"]["NCC"], cc["GOP"]["NCC"], -1, -1])
+    add("==", ["DOVCC", "GOPCC", "DCCDO", "DCCFO"], [cc["DOV"]["DCC"], cc["GOP"]["DCC"], -1, -1])
+    add("==", ["NFVNF", "NCCNF", "NFC"], [1, 1, -1])
+    add(">=", ["NFVNF", "NCCNF", "NFC"], [octane["NFV"], octane["NCC"], -octane["min"]])
+    bounds("NFC")
+    add("==", ["DOVDO", "DCCDO", "NCCDO", "DOC"], [1, 1, 1, -1])
+    add("<=", ["NCCDO", "DOC"], [1, -p["max_ncc_in_doc"]])
+    bounds("DOC")
+    add("==", ["NFVFO", "DOVFO", "DCCFO", "CRRFO", "FOC"], [1, 1, 1, 1, -1])
+    add(">=", ["NFVFO", "DOVFO", "DCCFO", "CRRFO", "FOC"],
+        [viscosity["NFV"], viscosity["DOV"], viscosity["DCC"], viscosity["CRR"], -viscosity["min"]])
+    bounds("FOC")
+
+    for k, (sense, cols, vals, rhs) in enumerate(rows, start=1):
+        mb.add_rows(sense, [f"Restriccion_{k}"], np.zeros(len(cols)), cols, vals, rhs)
+
+    return mb.build(c, sense=pulp.LpMaximize, name="Problema_5")
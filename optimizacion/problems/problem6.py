@@ -0,0 +1,72 @@
+"""Problema 6: minimización de la potencia disipada en una red de resistencias.
+
+Reproduce ``Problema 6/Problema 6.py``: cada grupo de resistencias en
+paralelo comparte una tensión ``V<g>`` y cada resistencia ``R<i>`` lleva una
+corriente fija, de modo que ``V = I*R`` y la potencia es ``I**2 * R``.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pulp
+
+from optimizacion.matrix import MatrixBuilder, MatrixForm
+from optimizacion.params import merge_params
+
+DEFAULT_PARAMS = {
+    # Corriente (A) de cada resistencia, agrupadas por la tensión que comparten
+    "groups": {
+        "VA": {"R1": 4, "R2": 6, "R3": 8},
+        "V4": {"R4": 18},
+        "VB": {"R5": 10, "R6": 8},
+    },
+    "voltage_bounds": {"VA": [2, 10], "V4": [2, 10], "VB": [2, 10]},
+}
+
+
+def build_model(params: dict | None = None) -> pulp.LpProblem:
+    """Construye el modelo del Problema 6 para ``params`` (sobre ``DEFAULT_PARAMS``)."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    currents = {r: i for group in p["groups"].values() for r, i in group.items()}
+
+    r = {n: pulp.LpVariable(n, lowBound=0, cat="Continuous") for n in currents}
+    v = {g: pulp.LpVariable(g, lowBound=0, cat="Continuous") for g in p["groups"]}
+
+    prob = pulp.LpProblem("Problema_6", pulp.LpMinimize)
+
+    prob += pulp.lpSum(i**2 * r[n] for n, i in currents.items()), "Funcional_objetivo"
+
+    constraints = [v[g] == i * r[n] for g, group in p["groups"].items() for n, i in group.items()]
+    for g, (low, high) in p["voltage_bounds"].items():
+        constraints += [v[g] <= high, v[g] >= low]
+    for k, constraint in enumerate(constraints, start=1):
+        prob += constraint, f"Restriccion_{k}"
+
+    return prob
+
+
+def build_matrices(params: dict | None = None) -> MatrixForm:
+    """Forma matricial del mismo modelo que ``build_model``, armada con NumPy."""
+    p = merge_params(DEFAULT_PARAMS, params)
+    groups = p["groups"]
+    resistors = [r for group in groups.values() for r in group]
+    currents = np.array([i for group in groups.values() for i in group.values()], dtype=float)
+    group_of = np.repeat(np.arange(len(groups)), [len(g) for g in groups.values()])
+    R = len(resistors)
+
+    mb = MatrixBuilder(resistors + list(groups))
+    c = np.r_[currents**2, np.zeros(len(groups))]
+
+    # V_g - I * R == 0, una fila por resistencia
+    mb.add_rows("==", [f"Restriccion_{k}" for k in range(1, R + 1)], np.repeat(np.arange(R), 2),
+                np.column_stack([R + group_of, np.arange(R)]).ravel(), np.column_stack([np.ones(R), -currents]).ravel(), 0)
+
+    # V_g <= máx y V_g >= mín, alternadas por grupo como en el script de referencia
+    bounds = p["voltage_bounds"]
+    cols = mb.cols(bounds)
+    low, high = (np.array([b[k] for b in bounds.values()], dtype=float) for k in (0, 1))
+    n = len(bounds)
+    mb.add_rows("<=", [f"Restriccion_{R + 1 + k}" for k in range(2 * n)], np.arange(2 * n), np.repeat(cols, 2),
+                np.tile([1.0, -1.0], n), np.column_stack([high, -low]).ravel())
+
+    return mb.build(c, sense=pulp.LpMinimize, name="Problema_6")
@@ -0,0 +1,287 @@
+"""Generador del modelo de refinería (Problema 5) para C crudos, U unidades y P productos.
+
+Es la estructura de ``Problema 5/Problema 5.py`` descrita por datos:
+
+- cada crudo (costo, disponibilidad) se destila en la torre (``PS``) en
+  cortes con rendimientos ``yields[corte]``;
+- cada unidad de proceso (capacidad, costo por unidad de carga) recibe
+  algunas corrientes y las convierte en otras con rendimientos
+  ``yields[entrada][salida]`` (el Cracking Catalítico recibe DOV y GOP y
+  produce NCC y DCC). Una unidad puede recibir salidas de unidades
+  anteriores;
+- cada corriente se reparte entre las unidades que la aceptan y los
+  productos que la usan como componente, con un flujo por par (corriente,
+  destino) llamado ``<corriente><código del destino>`` (``DOVCC``,
+  ``NCCNF``);
+- cada producto tiene precio, cotas y especificaciones de mezcla lineales:
+  ``sum_s q_s * flujo_s >= min * producto`` (octanaje, viscosidad) o
+  ``<= max * producto`` (fracción máxima de NCC en el DOC).
+
+Columnas: productos, carga de cada crudo (``<crudo>PS``), actividad de la
+torre y de cada unidad (``APS``, ``ACC``) y flujos. Las filas siguen el
+orden del script de referencia: balance y capacidad de la torre,
+disponibilidades, balance de cada corte, por unidad carga, capacidad y
+balance de cada salida, y por producto balance, especificaciones y cotas.
+Con ``reference_data()`` el resultado es idéntico a
+``problem5.build_matrices()``.
+
+Las filas se arman por bloques con ``MatrixBuilder`` (un bloque por tipo de
+fila, no una llamada por crudo), así que decenas de miles de variables se
+construyen en una fracción de segundo.
+
+Uso::
+
+    python -m optimizacion.refinery --crudes 2000 --units 30 --products 60 --solve highs
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pulp
+
+from optimizacion.matrix import MatrixBuilder, MatrixForm
+
+# Destinos y especificaciones del script de referencia, que DEFAULT_PARAMS de problem5 no describe
+REFERENCE_PRODUCTS = {
+    "NFC": {"code": "NF", "components": ["NFV", "NCC"]},
+    "DOC": {"code": "DO", "components": ["DOV", "DCC", "NCC"]},
+    "FOC": {"code": "FO", "components": ["NFV", "DOV", "DCC", "CRR"]},
+}
+
+
+def reference_data(params: dict | None = None) -> dict:
+    """Datos del generador equivalentes a ``problem5.build_model(params)``."""
+    from optimizacion.params import merge_params
+    from optimizacion.problems.problem5 import DEFAULT_PARAMS
+
+    p = merge_params(DEFAULT_PARAMS, params)
+    octane, viscosity = p["octane"], p["viscosity"]
+    specs = {
+        "NFC": [{"name": "octanaje", "min": octane["min"], "values": {s: octane[s] for s in ("NFV", "NCC")}}],
+        "DOC": [{"name": "NCC", "max": p["max_ncc_in_doc"], "values": {"NCC": 1}}],
+        "FOC": [{"name": "viscosidad", "min": viscosity["min"],
+                 "values": {s: viscosity[s] for s in ("NFV", "DOV", "DCC", "CRR")}}],
+    }
+    return {
+        "crudes": p["crudes"],
+        "distillation": {"name": "PS", **p["pipe_still"]},
+        "units": {"CC": p["cracker"]},
+        "products": {
+            name: {**REFERENCE_PRODUCTS[name], "price": p["prices"][name],
+                   "bounds": p["product_bounds"][name], "specs": specs[name]}
+            for name in REFERENCE_PRODUCTS
+        },
+    }
+
+
+def _streams(data: dict) -> tuple[list[str], list[str]]:
+    """Cortes (en el orden de los rendimientos del primer crudo) y salidas de las unidades."""
+    cuts = list(next(iter(data["crudes"].values()))["yields"])
+    outputs = []
+    for unit in data["units"].values():
+        for out in unit["yields"].values():
+            outputs.extend(o for o in out if o not in outputs)
+    return cuts, outputs
+
+
+def _flows(data: dict) -> tuple[dict[str, list[str]], dict[tuple[str, str], str]]:
+    """Destinos de cada corriente (primero las unidades, después los productos) y nombre de cada flujo."""
+    units, products = data["units"], data["products"]
+    streams = [s for group in _streams(data) for s in group]
+    codes = {p: products[p]["code"] for p in products}
+    destinations = {s: [u for u in units if s in units[u]["yields"]]
+                    + [p for p in products if s in products[p]["components"]] for s in streams}
+    sep = "_" if any(s[-1:].isdigit() for s in streams) else ""
+    return destinations, {(s, d): s + sep + codes.get(d, d) for s in streams for d in destinations[s]}
+
+
+def build_refinery(data: dict, name: str = "Problema_5") -> MatrixForm:
+    """Modelo de maximización de la ganancia en forma matricial a partir de ``data``.
+
+    ``data`` tiene el formato de ``reference_data``: ``crudes``
+    (``cost``, ``availability``, ``yields``), ``distillation`` (``name``,
+    ``capacity``, ``cost``), ``units`` (``capacity``, ``cost``,
+    ``yields[entrada][salida]``) y ``products`` (``code``, ``price``,
+    ``bounds``, ``components`` y ``specs`` con ``values`` y ``min`` o
+    ``max``). Un crudo con ``availability`` ``None`` no tiene fila de
+    disponibilidad.
+    """
+    crudes, units, products = data["crudes"], data["units"], data["products"]
+    ps_name = data["distillation"]["name"]
+    cuts, outputs = _streams(data)
+    streams = cuts + outputs
+    C = len(crudes)
+    destinations, flow = _flows(data)
+    variables = (list(products) + [c + ps_name for c in crudes] + ["A" + ps_name] + ["A" + u for u in units]
+                 + list(flow.values()))
+    mb = MatrixBuilder(variables)
+    ps = mb.cols(c + ps_name for c in crudes)
+    activity = {u: mb.index["A" + u] for u in [ps_name, *units]}
+    flows_of = {s: mb.cols(flow[s, d] for d in destinations[s]) for s in streams}
+
+    c = np.zeros(len(variables))
+    c[mb.cols(products)] = [products[p]["price"] for p in products]
+    c[ps] = [-crudes[k]["cost"] for k in crudes]
+    c[activity[ps_name]] = -data["distillation"]["cost"]
+    for u in units:
+        c[activity[u]] = -units[u]["cost"]
+
+    count = 0
+
+    def add(sense, rows, cols, vals, rhs=0.0, n=1):
+        nonlocal count
+        mb.add_rows(sense, [f"Restriccion_{k}" for k in range(count + 1, count + n + 1)], rows, cols, vals, rhs)
+        count += n
+
+    def single(sense, cols, vals, rhs=0.0):
+        cols = np.asarray(cols)
+        add(sense, np.zeros(len(cols)), cols, vals, rhs)
+
+    # Torre: carga total, capacidad y disponibilidad de cada crudo
+    single("==", np.r_[ps, activity[ps_name]], np.r_[np.ones(C), -1.0])
+    single("<=", [activity[ps_name]], 1, data["distillation"]["capacity"])
+    limited = [k for k in crudes if crudes[k].get("availability") is not None]
+    add("<=", np.arange(len(limited)), mb.cols(k + ps_name for k in limited), 1,
+        [crudes[k]["availability"] for k in limited], n=len(limited))
+
+    # Balance de cortes: sum_c y[c, k] * carga_c == flujos del corte k (un bloque de filas)
+    yields = np.array([[crudes[k]["yields"][cut] for cut in cuts] for k in crudes], dtype=float)  # (crudo, corte)
+    K = len(cuts)
+    out_cols = [flows_of[cut] for cut in cuts]
+    add("==", np.r_[np.repeat(np.arange(K), C), np.repeat(np.arange(K), [len(o) for o in out_cols])],
+        np.r_[np.tile(ps, K), np.concatenate(out_cols)],
+        np.r_[yields.T.ravel(), -np.ones(sum(len(o) for o in out_cols))], n=K)
+
+    for u, unit in units.items():
+        feeds = [flow[s, u] for s in unit["yields"]]
+        feed_cols = mb.cols(feeds)
+        single("==", np.r_[feed_cols, activity[u]], np.r_[np.ones(len(feeds)), -1.0])
+        single("<=", [activity[u]], 1, unit["capacity"])
+        for out in dict.fromkeys(o for y in unit["yields"].values() for o in y):
+            rate = [unit["yields"][s].get(out, 0.0) for s in unit["yields"]]
+            single("==", np.r_[feed_cols, flows_of[out]], np.r_[rate, -np.ones(len(flows_of[out]))])
+
+    for p, product in products.items():
+        comps = mb.cols(flow[s, p] for s in product["components"])
+        col = mb.index[p]
+        single("==", np.r_[comps, col], np.r_[np.ones(len(comps)), -1.0])
+        for spec in product.get("specs", []):
+            q = [spec["values"].get(s, 0.0) for s in product["components"]]
+            if "min" in spec:
+                single(">=", np.r_[comps, col], np.r_[q, -spec["min"]])
+            if "max" in spec:
+                single("<=", np.r_[comps, col], np.r_[q, -spec["max"]])
+        low, high = product.get("bounds") or (None, None)
+        if low is not None:
+            single(">=", [col], 1, low)
+        if high is not None:
+            single("<=", [col], 1, high)
+
+    return mb.build(c, sense=pulp.LpMaximize, name=name)
+
+
+def synthetic_refinery(n_crudes: int, n_units: int, n_products: int, n_cuts: int = 4, n_specs: int = 2,
+                       seed: int = 0) -> dict:
+    """Refinería aleatoria en el formato de ``build_refinery``.
+
+    Los rendimientos de cada crudo suman 0,9 (el resto son pérdidas); cada
+    unidad recibe entre una y tres corrientes (cortes o salidas de unidades
+    anteriores, así no hay ciclos) y produce dos. Toda corriente tiene al
+    menos un destino y cada producto ``n_specs`` especificaciones de mínimo
+    alcanzables con sus mejores componentes; los productos no tienen cota
+    inferior, de modo que la instancia siempre es factible.
+    """
+    rng = np.random.default_rng(seed)
+    cuts = [f"K{k}" for k in range(1, n_cuts + 1)]
+    crude_yields = 0.9 * rng.dirichlet(np.ones(n_cuts), n_crudes)
+    availability = rng.uniform(50, 200, n_crudes).round()
+    cost = rng.uniform(15, 28, n_crudes).round(2)
+    crudes = {
+        f"CR{i}": {"cost": float(cost[i - 1]), "availability": float(availability[i - 1]),
+                   "yields": dict(zip(cuts, crude_yields[i - 1].round(4).tolist()))}
+        for i in range(1, n_crudes + 1)
+    }
+
+    streams, units = list(cuts), {}
+    for u in range(1, n_units + 1):
+        feeds = rng.choice(streams, size=min(len(streams), int(rng.integers(1, 4))), replace=False).tolist()
+        outs = [f"U{u}S1", f"U{u}S2"]
+        units[f"U{u}"] = {
+            "capacity": float(rng.uniform(0.05, 0.3) * availability.sum()),
+            "cost": round(float(rng.uniform(0.1, 0.5)), 2),
+            "yields": {f: dict(zip(outs, rng.uniform(0.3, 0.6, 2).round(3).tolist())) for f in feeds},
+        }
+        streams += outs
+
+    names = [f"P{p}" for p in range(1, n_products + 1)]
+    share = min(1.0, 3.0 / n_products)
+    components = {p: [s for s in streams if rng.random() < share] for p in names}
+    fed = {s for unit in units.values() for s in unit["yields"]}
+    for s in streams:  # corriente sin destino: obligaría a no cargar crudo
+        if s not in fed and not any(s in comps for comps in components.values()):
+            components[names[int(rng.integers(n_products))]].append(s)
+    for p in names:
+        if not components[p]:
+            components[p].append(streams[int(rng.integers(len(streams)))])
+        components[p] = [s for s in streams if s in components[p]]
+
+    quality = rng.uniform(10, 100, (n_specs, len(streams)))
+    index = {s: i for i, s in enumerate(streams)}
+    products = {}
+    for p in names:
+        cols = [index[s] for s in components[p]]
+        specs = []
+        for q in range(n_specs):
+            values = quality[q, cols]
+            specs.append({"name": f"Q{q + 1}", "min": float((values.mean() + 0.3 * (values.max() - values.mean())).round(1)),
+                          "values": dict(zip(components[p], values.round(1).tolist()))})
+        products[p] = {"code": p, "price": round(float(rng.uniform(28, 45)), 2),
+                       "bounds": [None, float(rng.uniform(0.05, 0.4) * availability.sum())],
+                       "components": components[p], "specs": specs}
+    return {
+        "crudes": crudes,
+        "distillation": {"name": "PS", "capacity": float(0.7 * availability.sum()), "cost": 0.4},
+        "units": units,
+        "products": products,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    from optimizacion.problems import problem5
+    from optimizacion.solvers import BACKENDS, solve
+
+    parser = argparse.ArgumentParser(description="Refinería sintética con la estructura del Problema 5")
+    parser.add_argument("--crudes", type=int, default=1000)
+    parser.add_argument("--units", type=int, default=20)
+    parser.add_argument("--products", type=int, default=40)
+    parser.add_argument("--cuts", type=int, default=4)
+    parser.add_argument("--specs", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--solve", choices=BACKENDS, action="append", help="backend con el que resolver")
+    args = parser.parse_args(argv)
+
+    reference = build_refinery(reference_data())
+    expected = problem5.build_matrices()
+    same = all((getattr(reference, k) != getattr(expected, k)).nnz == 0 for k in ("A_ub", "A_eq")) and all(
+        np.array_equal(getattr(reference, k), getattr(expected, k)) for k in ("c", "b_ub", "b_eq"))
+    print(f"datos de referencia == problem5.build_matrices(): {same}")
+
+    data = synthetic_refinery(args.crudes, args.units, args.products, args.cuts, args.specs, args.seed)
+    t0 = time.perf_counter()
+    form = build_refinery(data, name="Refineria")
+    built = time.perf_counter() - t0
+    nnz = form.A_ub.nnz + form.A_eq.nnz
+    print(f"{len(form.c)} variables, {sum(form.shape[:2])} restricciones, {nnz} no nulos; armado en {built:.3f} s")
+    for backend in args.solve or []:
+        t0 = time.perf_counter()
+        result = solve(form, backend)
+        print(f"{backend}: {result.status}, objetivo {result.objective:.6g} en {time.perf_counter() - t0:.2f} s"
+              if result.objective is not None else f"{backend}: {result.status}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,189 @@
+"""Informe de sensibilidad de un modelo resuelto: precios sombra, costos reducidos y rangos.
+
+Los precios sombra (``pi``), holguras (``slack``) y costos reducidos
+(``dj``) son los que deja PuLP después de ``prob.solve()`` con CBC. Los
+rangos de costos y de lados derechos salen de la base óptima: el modelo se
+pasa a HiGHS (``from_lp`` + ``to_highs``) con la solución de CBC como punto
+de partida, HiGHS completa la base en ese mismo vértice y se usa
+``getRanging``. Para las restricciones no activas el rango es el clásico
+``[actividad, +inf)`` (``<=``) o ``(-inf, actividad]`` (``>=``). Si el
+vértice es degenerado, los rangos corresponden a la base que elige HiGHS
+entre las que lo describen.
+
+En modelos enteros (Problema 2) las variables enteras se fijan en su valor
+óptimo y el análisis es el del LP resultante; los precios sombra se toman de
+ese LP si CBC no los informa.
+
+Uso::
+
+    python -m optimizacion.sensitivity 1 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+import pulp
+
+from optimizacion.matrix import from_lp, run_highs, to_highs
+from optimizacion.problems import PROBLEMS
+
+SENSES = {pulp.LpConstraintLE: "<=", pulp.LpConstraintGE: ">=", pulp.LpConstraintEQ: "=="}
+
+
+@dataclass
+class VariableSensitivity:
+    """Valor, costo reducido y rango del coeficiente del funcional en el que la base sigue óptima."""
+
+    name: str
+    value: float | None
+    reduced_cost: float | None
+    cost: float
+    cost_lower: float
+    cost_upper: float
+
+
+@dataclass
+class ConstraintSensitivity:
+    """Holgura, precio sombra y rango del lado derecho en el que el precio sombra sigue valiendo."""
+
+    name: str
+    sense: str
+    rhs: float
+    activity: float
+    slack: float | None
+    dual: float | None
+    rhs_lower: float
+    rhs_upper: float
+
+
+@dataclass
+class SensitivityReport:
+    """Informe completo de un modelo; ``fixed_integers`` indica que se fijaron las variables enteras."""
+
+    name: str
+    status: str
+    objective: float | None
+    variables: list[VariableSensitivity] = field(default_factory=list)
+    constraints: list[ConstraintSensitivity] = field(default_factory=list)
+    fixed_integers: bool = False
+
+    def format(self) -> str:
+        """Texto con una tabla de variables y otra de restricciones."""
+        head = f"{self.name}: {self.status}, objetivo = {_num(self.objective)}"
+        if self.fixed_integers:
+            head += " (enteras fijadas en el óptimo)"
+        variables = _table(
+            ("Variable", "Valor", "Costo reducido", "Coeficiente", "Mínimo", "Máximo"),
+            [(v.name, _num(v.value), _num(v.reduced_cost), _num(v.cost), _num(v.cost_lower), _num(v.cost_upper))
+             for v in self.variables],
+        )
+        constraints = _table(
+            ("Restricción", "Sentido", "Lado derecho", "Holgura", "Precio sombra", "Mínimo", "Máximo"),
+            [(c.name, c.sense, _num(c.rhs), _num(c.slack), _num(c.dual), _num(c.rhs_lower), _num(c.rhs_upper))
+             for c in self.constraints],
+        )
+        return "\n\n".join((head, variables, constraints))
+
+
+def _num(x) -> str:
+    if x is None:
+        return ""
+    if math.isinf(x):
+        return "+inf" if x > 0 else "-inf"
+    return f"{x:.6g}"
+
+
+def _table(header: tuple[str, ...], rows: list[tuple[str, ...]]) -> str:
+    lines = [header, *rows]
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return "\n".join("  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip() for line in lines)
+
+
+def sensitivity(prob: pulp.LpProblem, solver: pulp.LpSolver | None = None) -> SensitivityReport:
+    """Resuelve ``prob`` si hace falta y arma su informe de sensibilidad.
+
+    Requiere el paquete opcional ``highspy`` para los rangos.
+    """
+    if prob.status == pulp.LpStatusNotSolved:
+        prob.solve(solver or pulp.PULP_CBC_CMD(msg=False))
+    status = pulp.LpStatus[prob.status]
+    report = SensitivityReport(name=prob.name, status=status, objective=pulp.value(prob.objective))
+    if prob.status != pulp.LpStatusOptimal:
+        return report
+
+    form = from_lp(prob)
+    values = np.array([v.varValue for v in prob.variables()], dtype=float)
+    if form.is_mip:
+        # Con las enteras fijas queda un LP cuyo óptimo es el del MIP
+        fixed = form.integrality.astype(bool)
+        form.lb[fixed] = form.ub[fixed] = np.round(values[fixed])
+        form.integrality = np.zeros_like(form.integrality)
+        report.fixed_integers = True
+
+    # Partiendo de la solución de CBC, HiGHS cierra la base en el mismo vértice
+    h = to_highs(form)
+    import highspy
+
+    h.setSolution(len(values), np.arange(len(values), dtype=np.int32), values)
+    status = run_highs(h)
+    if status != "Optimal":
+        raise RuntimeError(f"HiGHS no reproduce el óptimo de {prob.name}: {status}")
+    ranging = h.getRanging()[1]
+    solution, basis = h.getSolution(), h.getBasis()
+    row_dual = np.asarray(solution.row_dual)
+    col_dual = np.asarray(solution.col_dual)
+    row_value = np.asarray(solution.row_value)
+
+    for j, var in enumerate(prob.variables()):
+        report.variables.append(VariableSensitivity(
+            name=var.name,
+            value=var.varValue,
+            reduced_cost=var.dj if var.dj is not None else float(col_dual[j]),
+            cost=float(form.c[j]),
+            cost_lower=float(ranging.col_cost_dn.value_[j]),
+            cost_upper=float(ranging.col_cost_up.value_[j]),
+        ))
+
+    # Filas de HiGHS: las <= (con las >= negadas) y después las ==
+    rows = {name: i for i, name in enumerate(form.ub_names)}
+    rows.update({name: len(form.ub_names) + i for i, name in enumerate(form.eq_names)})
+    for name, con in prob.constraints.items():
+        i = rows[name]
+        sign = -1.0 if con.sense == pulp.LpConstraintGE else 1.0
+        activity = sign * float(row_value[i])
+        rhs = -con.constant
+        lower = float(ranging.row_bound_dn.value_[i])
+        upper = float(ranging.row_bound_up.value_[i])
+        if sign < 0:
+            lower, upper = -upper, -lower
+        if basis.row_status[i] == highspy.HighsBasisStatus.kBasic and con.sense != pulp.LpConstraintEQ:
+            lower, upper = (activity, math.inf) if con.sense == pulp.LpConstraintLE else (-math.inf, activity)
+        report.constraints.append(ConstraintSensitivity(
+            name=name,
+            sense=SENSES[con.sense],
+            rhs=rhs,
+            activity=activity,
+            slack=con.slack,
+            dual=con.pi if con.pi is not None else sign * float(row_dual[i]),
+            rhs_lower=lower,
+            rhs_upper=upper,
+        ))
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Informe de sensibilidad de los problemas de referencia")
+    parser.add_argument("problems", nargs="*", type=int, default=sorted(PROBLEMS), help="números de problema")
+    args = parser.parse_args(argv)
+    for n in args.problems:
+        print(sensitivity(PROBLEMS[n].build_model()).format())
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,501 @@
+"""Bloques independientes de un modelo y consultas "qué pasa si" en lote sobre cotas y lados derechos.
+
+``find_blocks`` separa una ``MatrixForm`` en las componentes conexas del
+grafo filas-columnas: en el Problema 6 quedan los tres grupos de tensión
+(``VA`` con ``R1..R3``, ``V4`` con ``R4``, ``VB`` con ``R5`` y ``R6``), que se
+pueden resolver por separado.
+
+``SeparableModel.what_if`` resuelve un lote de escenarios en los que cambian
+sólo lados derechos y cotas de variables. Con la misma matriz y el mismo
+funcional una base óptima sigue siendo dual factible en cualquier escenario,
+así que es óptima en todos aquellos donde además es primal factible. Cada
+bloque guarda las bases que ya encontró; la solución básica es afín en los
+parámetros del escenario, y se evalúa y verifica con NumPy para todo el lote
+de una vez. HiGHS sólo se llama para el primer escenario que ninguna base
+guardada resuelve, y su base se agrega al bloque. Como los bloques se tratan
+por separado, la cantidad de bases es la suma de las de cada bloque y no su
+producto. Del mismo modo, cuando HiGHS declara infactible un escenario se
+guarda su certificado de Farkas (el rayo dual), que se evalúa sobre las
+cotas de todo el lote y descarta de una vez los demás escenarios
+infactibles por la misma causa. Los bloques con variables enteras se
+resuelven con HiGHS, una vez por escenario distinto.
+
+El lote sólo rinde en los bloques lineales. Con bloques enteros cada
+escenario es una llamada a HiGHS (unos 7 ms en el Problema 2), así que el
+comando se niega a pasar de ``--max-mip-scenarios`` escenarios (1000 por
+defecto).
+
+Uso::
+
+    python -m optimizacion.separable --problem 6 --scenarios 1000000 --check 200
+    python -m optimizacion.separable --problem 1 --scenarios 10000 --spread 0.05
+    python -m optimizacion.separable --problem 2 --scenarios 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pulp
+from scipy import sparse
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import splu
+
+from optimizacion.config import SolverOptions, add_arguments
+from optimizacion.matrix import MatrixForm, run_highs, run_without_presolve, to_highs
+
+TOL = 1e-7
+STATUSES = ("Optimal", "Unbounded", "Undefined", "Not Solved", "Infeasible")  # al combinar bloques gana el último
+
+
+@dataclass
+class Block:
+    """Un bloque: columnas y filas (índices en la forma original) y su modelo propio."""
+
+    columns: np.ndarray
+    ub_rows: np.ndarray
+    eq_rows: np.ndarray
+    form: MatrixForm
+
+
+@dataclass
+class WhatIfResult:
+    """Estado y objetivo de cada escenario (``nan`` si no es óptimo) y, opcionalmente, los valores ``(K, n)``."""
+
+    status: np.ndarray
+    objective: np.ndarray
+    values: np.ndarray | None = None
+    solves: int = 0
+    bases: int = 0
+    elapsed: float = 0.0
+
+
+def _subform(form: MatrixForm, cols: np.ndarray, ub_rows: np.ndarray, eq_rows: np.ndarray, name: str) -> MatrixForm:
+    return MatrixForm(
+        c=form.c[cols], A_ub=form.A_ub[ub_rows][:, cols], b_ub=form.b_ub[ub_rows],
+        A_eq=form.A_eq[eq_rows][:, cols], b_eq=form.b_eq[eq_rows], lb=form.lb[cols], ub=form.ub[cols],
+        variables=[form.variables[j] for j in cols], ub_names=[form.ub_names[i] for i in ub_rows],
+        eq_names=[form.eq_names[i] for i in eq_rows],
+        integrality=None if form.integrality is None else form.integrality[cols],
+        sense=form.sense, name=name,
+    )
+
+
+def find_blocks(form: MatrixForm) -> list[Block]:
+    """Componentes conexas del grafo bipartito filas-columnas, en el orden de su primera columna.
+
+    Las filas sin coeficientes no pertenecen a ningún bloque (se verifican
+    aparte en ``SeparableModel``).
+    """
+    n_ub, n_eq, n = form.shape
+    A = sparse.vstack([form.A_ub, form.A_eq]).tocsr()
+    A = sparse.csr_matrix((np.ones(A.nnz), A.indices, A.indptr), shape=A.shape)
+    graph = sparse.bmat([[None, A.T], [A, None]], format="csr") if A.shape[0] else sparse.csr_matrix((n, n))
+    _, labels = csgraph.connected_components(graph, directed=False)
+    col_labels, row_labels = labels[:n], labels[n:]
+    blocks = []
+    for k, label in enumerate(dict.fromkeys(col_labels.tolist())):
+        rows = np.flatnonzero(row_labels == label)
+        ub_rows, eq_rows = rows[rows < n_ub], rows[rows >= n_ub] - n_ub
+        cols = np.flatnonzero(col_labels == label)
+        blocks.append(Block(cols, ub_rows, eq_rows, _subform(form, cols, ub_rows, eq_rows, f"{form.name}_{k + 1}")))
+    return blocks
+
+
+class _Basis:
+    """Base óptima de un bloque: ``z = z0 + Z @ p`` para los parámetros ``p`` del escenario.
+
+    ``z`` son las columnas seguidas de las actividades de las filas
+    (``A x - r = 0``), como en HiGHS. Cada no básica va a la cota que indica
+    el signo de su costo reducido, así la base es dual factible con
+    cualquier cota.
+    """
+
+    def __init__(self, solver: _BlockSolver, status: np.ndarray):
+        n_z = len(solver.lo0)
+        self.basic = np.flatnonzero(status == 1)
+        nonbasic = np.flatnonzero(status != 1)
+        M = solver.M
+        z0, Z = np.zeros(n_z), np.zeros((n_z, solver.n_params))
+        if len(self.basic):
+            lu = splu(M[:, self.basic].tocsc())
+            y = lu.solve(solver.cost[self.basic], trans="T")
+            reduced = solver.cost - M.T @ y
+        else:
+            reduced = solver.cost
+        upper = np.where(reduced < -TOL, True, np.where(reduced > TOL, False, status == 2))
+        for j in nonbasic:
+            if status[j] == 3 and abs(reduced[j]) <= TOL:  # libre no básica
+                continue
+            side = int(upper[j])
+            params = solver.params_at.get((j, side))
+            if params is None:
+                z0[j] = (solver.lo0, solver.hi0)[side][j]
+            else:
+                Z[j, params[-1]] = 1.0
+        if len(self.basic):
+            M_N = M[:, nonbasic]
+            z0[self.basic] = lu.solve(-(M_N @ z0[nonbasic]))
+            Z[self.basic] = lu.solve(-(M_N @ Z[nonbasic])).reshape(len(self.basic), -1)
+        self.z0, self.Z = z0, Z
+        self.valid = bool(np.all(np.isfinite(z0)))
+        c = solver.form.c
+        self.objective = (z0[:solver.n] @ c, Z[:solver.n].T @ c)
+        # Sólo se verifican las básicas con alguna cota finita o variable
+        lo_param, hi_param = (np.array([solver.params_at.get((int(j), side), [-1])[-1] for j in self.basic],
+                                       dtype=np.int64) for side in (0, 1))
+        check = (lo_param >= 0) | (hi_param >= 0) | np.isfinite(solver.lo0[self.basic]) \
+            | np.isfinite(solver.hi0[self.basic])
+        rows = self.basic[check]
+        self.check = (z0[rows], Z[rows].T, lo_param[check], hi_param[check], solver.lo0[rows], solver.hi0[rows])
+
+    def feasible(self, P: np.ndarray) -> np.ndarray:
+        z0, Z, lo_param, hi_param, lo0, hi0 = self.check
+        z = z0 + P @ Z
+        lo = np.where(lo_param >= 0, P[:, lo_param], lo0) if np.any(lo_param >= 0) else lo0
+        hi = np.where(hi_param >= 0, P[:, hi_param], hi0) if np.any(hi_param >= 0) else hi0
+        ok = (z >= lo - TOL * (1 + np.abs(lo))) & (z <= hi + TOL * (1 + np.abs(hi)))
+        return ok.all(axis=1)
+
+
+class _Certificate:
+    """Certificado de Farkas de un bloque: ``y`` con ``max (M^T y) @ z < 0`` sobre la caja de cotas.
+
+    Como ``M z = 0``, todo escenario cuyas cotas den ese máximo negativo es
+    infactible. Las cotas son afines en los parámetros, así que el máximo se
+    evalúa con NumPy para todo el lote, igual que la factibilidad de las bases.
+    """
+
+    def __init__(self, solver: _BlockSolver, y: np.ndarray):
+        w = solver.M.T @ y
+        w[np.abs(w) <= TOL * (1 + np.abs(w).max())] = 0.0
+        self.solver = solver
+        self.positions = np.flatnonzero(w)
+        self.w = w[self.positions]
+        self.scale = 1 + np.abs(y).sum()
+
+    def infeasible(self, P: np.ndarray) -> np.ndarray:
+        lo, hi = self.solver.bounds_at(P, self.positions)
+        with np.errstate(invalid="ignore"):
+            top = np.where(self.w > 0, self.w * hi, self.w * lo).sum(axis=1)
+        return top < -TOL * self.scale
+
+
+class _BlockSolver:
+    """Bases guardadas de un bloque y su modelo HiGHS para los escenarios que no resuelven."""
+
+    def __init__(self, block: Block, params: list[list[tuple[int, int]]], options: dict | None = None):
+        form = block.form
+        n_ub, n_eq, n = form.shape
+        A = sparse.vstack([form.A_ub, form.A_eq])
+        m = A.shape[0]
+        self.form, self.n, self.n_params = form, n, len(params)
+        self.M = sparse.hstack([A, -sparse.identity(m)], format="csc")
+        sign = -1.0 if form.sense == pulp.LpMaximize else 1.0
+        self.cost = np.r_[sign * form.c, np.zeros(m)]
+        self.lo0 = np.r_[form.lb, np.full(n_ub, -np.inf), form.b_eq]
+        self.hi0 = np.r_[form.ub, form.b_ub, form.b_eq]
+        # (posición en z, 0 = cota inferior / 1 = superior) -> parámetros que la fijan
+        self.params_at: dict[tuple[int, int], list[int]] = {}
+        for k, targets in enumerate(params):
+            for target in targets:
+                self.params_at.setdefault(target, []).append(k)
+        self.bases: list[_Basis] = []
+        self.certificates: list[_Certificate] = []
+        self.solves = 0
+        self.options = dict(options or {})
+        self._highs = None
+
+    def bounds_at(self, P: np.ndarray, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Cotas ``(K, len(positions))`` de las posiciones de ``z`` indicadas en cada escenario."""
+        lo = np.repeat(self.lo0[positions][None, :], len(P), axis=0)
+        hi = np.repeat(self.hi0[positions][None, :], len(P), axis=0)
+        where = {int(p): i for i, p in enumerate(positions)}
+        for (pos, side), ks in self.params_at.items():
+            if pos in where:
+                (lo, hi)[side][:, where[pos]] = P[:, ks[-1]]
+        return lo, hi
+
+    def _run(self, p: np.ndarray):
+        if self._highs is None:
+            self._highs = to_highs(self.form)
+            for key, value in self.options.items():
+                self._highs.setOptionValue(key, value)
+        h, n = self._highs, self.n
+        positions = np.arange(len(self.lo0))
+        lo, hi = (b[0] for b in self.bounds_at(p[None, :], positions))
+        h.changeColsBounds(n, np.arange(n, dtype=np.int32), lo[:n], hi[:n])
+        m = len(lo) - n
+        if m:
+            h.changeRowsBounds(m, np.arange(m, dtype=np.int32), lo[n:], hi[n:])
+        status = run_highs(h)
+        self.solves += 1
+        return h, status
+
+    def _certificate(self, h, p: np.ndarray) -> _Certificate | None:
+        """Certificado de Farkas del escenario ``p`` (infactible en ``h``), verificado; ``None`` si HiGHS no da rayo."""
+        _, has_ray, ray = h.getDualRay()
+        if not has_ray:
+            run_without_presolve(h)
+            _, has_ray, ray = h.getDualRay()
+            if not has_ray:
+                return None
+        for y in (np.asarray(ray, dtype=float), -np.asarray(ray, dtype=float)):
+            certificate = _Certificate(self, y)
+            if certificate.infeasible(p[None, :])[0]:
+                return certificate
+        return None
+
+    def _assign(self, basis: _Basis, P, idx, code, objective, values) -> None:
+        base, grad = basis.objective
+        code[idx] = 0
+        objective[idx] = base + P @ grad
+        if values is not None:
+            values[idx] = basis.z0[:self.n] + P @ basis.Z[:self.n].T
+
+    def solve(self, P: np.ndarray, keep_values: bool = False):
+        """Código de estado (índice en ``STATUSES``), objetivo y valores del bloque en cada escenario."""
+        K, n = len(P), self.n
+        code = np.full(K, STATUSES.index("Not Solved"), dtype=np.int8)
+        objective = np.full(K, np.nan)
+        values = np.full((K, n), np.nan) if keep_values else None
+
+        positions = np.array(sorted({pos for pos, _ in self.params_at}), dtype=np.int64)
+        lo, hi = self.bounds_at(P, positions)
+        crossed = np.any(lo > hi + TOL * (1 + np.abs(hi)), axis=1)
+        code[crossed] = STATUSES.index("Infeasible")
+        pending = np.flatnonzero(~crossed)
+        infeasible = STATUSES.index("Infeasible")
+        if not self.form.is_mip:
+            for certificate in self.certificates:
+                if not len(pending):
+                    break
+                proven = certificate.infeasible(P[pending])
+                code[pending[proven]] = infeasible
+                pending = pending[~proven]
+
+        if self.form.is_mip:
+            unique, inverse = np.unique(P[pending], axis=0, return_inverse=True)
+            for u, p in enumerate(unique):
+                h, status = self._run(p)
+                idx = pending[inverse.ravel() == u]
+                code[idx] = STATUSES.index(status)
+                if status == "Optimal":
+                    x = np.asarray(h.getSolution().col_value)
+                    objective[idx] = h.getInfo().objective_function_value
+                    if values is not None:
+                        values[idx] = x
+            return code, objective, values
+
+        candidates = list(self.bases)
+        while len(pending):
+            for basis in candidates:
+                if not len(pending):
+                    break
+                sub = P if len(pending) == K else P[pending]
+                ok = basis.feasible(sub)
+                self._assign(basis, sub[ok], pending[ok], code, objective, values)
+                pending = pending[~ok]
+            if not len(pending):
+                break
+            i = pending[0]
+            h, status = self._run(P[i])
+            if status != "Optimal":
+                code[i] = STATUSES.index(status)
+                pending = pending[1:]
+                candidates = []
+                certificate = self._certificate(h, P[i]) if status == "Infeasible" else None
+                if certificate is not None:
+                    self.certificates.append(certificate)
+                    proven = certificate.infeasible(P[pending])
+                    code[pending[proven]] = infeasible
+                    pending = pending[~proven]
+                continue
+            hb = h.getBasis()
+            status_z = np.array([int(s) for s in hb.col_status] + [int(s) for s in hb.row_status])
+            basis = _Basis(self, status_z)
+            candidates = []
+            if basis.valid:
+                self.bases.append(basis)
+                candidates = [basis]
+            if not basis.valid or not basis.feasible(P[i:i + 1])[0]:
+                # Tolerancias: el escenario que originó la base se toma de HiGHS
+                code[i] = 0
+                objective[i] = h.getInfo().objective_function_value
+                if values is not None:
+                    values[i] = np.asarray(h.getSolution().col_value)
+                pending = pending[1:]
+        return code, objective, values
+
+
+class SeparableModel:
+    """Un ``MatrixForm`` separado en bloques, con consultas en lote sobre lados derechos y cotas.
+
+    ``options`` son opciones de HiGHS para los escenarios que no resuelve una base guardada.
+    """
+
+    def __init__(self, form: MatrixForm, options: dict | None = None):
+        self.form = form
+        self.options = dict(options or {})
+        self.blocks = find_blocks(form)
+        self.ub_index = {name: i for i, name in enumerate(form.ub_names)}
+        self.eq_index = {name: i for i, name in enumerate(form.eq_names)}
+        self.var_index = {name: j for j, name in enumerate(form.variables)}
+        used = np.zeros(form.shape[0] + form.shape[1], dtype=bool)
+        for block in self.blocks:
+            used[block.ub_rows] = True
+            used[form.shape[0] + block.eq_rows] = True
+        self.empty_rows = np.flatnonzero(~used)
+        self._solvers: dict[tuple, list[_BlockSolver]] = {}
+
+    def _targets(self, rhs: dict, lower: dict, upper: dict) -> list[tuple[int, int, int]]:
+        """(bloque, posición en su ``z``, lado) de cada parámetro, en el orden rhs, lower, upper."""
+        where_col = {int(j): (b, k) for b, block in enumerate(self.blocks) for k, j in enumerate(block.columns)}
+        where_ub, where_eq = {}, {}
+        for b, block in enumerate(self.blocks):
+            n = len(block.columns)
+            where_ub.update({int(i): (b, n + k) for k, i in enumerate(block.ub_rows)})
+            where_eq.update({int(i): (b, n + len(block.ub_rows) + k) for k, i in enumerate(block.eq_rows)})
+        targets = []
+        for name in rhs:
+            if name in self.ub_index:
+                b, pos = where_ub.get(self.ub_index[name], (-1, self.ub_index[name]))
+                targets.append([(b, pos, 1)])
+            elif name in self.eq_index:
+                b, pos = where_eq.get(self.eq_index[name], (-1, self.form.shape[0] + self.eq_index[name]))
+                targets.append([(b, pos, 0), (b, pos, 1)])
+            else:
+                raise KeyError(f"restricción desconocida: {name}")
+        for side, names in ((0, lower), (1, upper)):
+            for name in names:
+                if name not in self.var_index:
+                    raise KeyError(f"variable desconocida: {name}")
+                b, pos = where_col[self.var_index[name]]
+                targets.append([(b, pos, side)])
+        return targets
+
+    def what_if(self, rhs: dict | None = None, lower: dict | None = None, upper: dict | None = None,
+                keep_values: bool = False) -> WhatIfResult:
+        """Resuelve el lote de escenarios dado por arreglos de igual largo ``K``.
+
+        ``rhs`` asigna lados derechos por nombre de restricción, tal como
+        están en la ``MatrixForm`` (las filas ``>=`` se guardan negadas:
+        ``V >= 2`` es ``-V <= -2``); ``lower`` y ``upper`` asignan cotas de
+        variables por nombre. Las bases encontradas se conservan para los
+        lotes siguientes con los mismos nombres.
+        """
+        t0 = time.perf_counter()
+        rhs, lower, upper = rhs or {}, lower or {}, upper or {}
+        columns = [np.asarray(v, dtype=float).ravel() for d in (rhs, lower, upper) for v in d.values()]
+        K = len(columns[0]) if columns else 1
+        P = np.column_stack(columns) if columns else np.zeros((1, 0))
+        targets = self._targets(rhs, lower, upper)
+
+        used = [[k for k, t in enumerate(targets) if any(bb == b for bb, _, _ in t)] for b in range(len(self.blocks))]
+        key = (tuple(rhs), tuple(lower), tuple(upper))
+        if key not in self._solvers:
+            self._solvers[key] = [
+                _BlockSolver(block, [[(pos, side) for bb, pos, side in targets[k] if bb == b] for k in used[b]],
+                             self.options)
+                for b, block in enumerate(self.blocks)
+            ]
+        solvers = self._solvers[key]
+
+        code = np.zeros(K, dtype=np.int8)
+        objective = np.full(K, self.form.offset)
+        values = np.full((K, self.form.shape[2]), np.nan) if keep_values else None
+        # Filas vacías: 0 <= b (o 0 == b)
+        n_ub = self.form.shape[0]
+        for i in self.empty_rows:
+            lo, hi = (-np.inf, self.form.b_ub[i]) if i < n_ub else (self.form.b_eq[i - n_ub],) * 2
+            lo, hi = np.full(K, lo), np.full(K, hi)
+            for k, t in enumerate(targets):
+                if t[0][0] == -1 and t[0][1] == i:
+                    hi = P[:, k]
+                    lo = P[:, k] if i >= n_ub else lo
+            code = np.maximum(code, np.where((lo <= TOL) & (hi >= -TOL), 0, STATUSES.index("Infeasible")))
+
+        for b, (block, solver) in enumerate(zip(self.blocks, solvers)):
+            block_code, block_obj, block_values = solver.solve(P[:, used[b]], keep_values)
+            code = np.maximum(code, block_code)
+            objective += block_obj
+            if values is not None:
+                values[:, block.columns] = block_values
+        objective[code != 0] = np.nan
+        return WhatIfResult(
+            status=np.array(STATUSES)[code], objective=objective, values=values,
+            solves=sum(s.solves for s in solvers), bases=sum(len(s.bases) for s in solvers),
+            elapsed=time.perf_counter() - t0,
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    from optimizacion.matrix import solve_matrix
+    from optimizacion.problems import PROBLEMS
+
+    parser = argparse.ArgumentParser(description="Bloques independientes y consultas en lote sobre lados derechos")
+    parser.add_argument("--problem", type=int, default=6, choices=sorted(PROBLEMS))
+    parser.add_argument("--scenarios", type=int, default=100_000)
+    parser.add_argument("--spread", type=float, default=0.5, help="variación relativa de cada lado derecho")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", type=int, default=0, help="escenarios a verificar contra el modelo completo")
+    parser.add_argument("--max-mip-scenarios", type=int, default=1000,
+                        help="máximo de escenarios si hay bloques enteros (cada uno es una llamada a HiGHS)")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    options = SolverOptions.from_args(args)
+
+    form = PROBLEMS[args.problem].build_matrices()
+    model = SeparableModel(form, options.for_backend("highs"))
+    if any(block.form.is_mip for block in model.blocks) and args.scenarios > args.max_mip_scenarios:
+        parser.error(f"el Problema {args.problem} tiene bloques enteros, que se resuelven escenario por escenario: "
+                     f"usar a lo sumo --max-mip-scenarios {args.max_mip_scenarios} escenarios")
+    print(f"Problema {args.problem}: {len(model.blocks)} bloques")
+    for k, block in enumerate(model.blocks, start=1):
+        names = block.form.variables
+        shown = ", ".join(names[:6]) + (", ..." if len(names) > 6 else "")
+        print(f"  {k}: {len(names)} variables ({shown}), {len(block.ub_rows) + len(block.eq_rows)} restricciones")
+
+    # Cada lado derecho no nulo varía en +-spread (en Problema 6, las cotas de tensión)
+    rng = np.random.default_rng(args.seed)
+    rhs = {}
+    for names, b in ((form.ub_names, form.b_ub), (form.eq_names, form.b_eq)):
+        for name, value in zip(names, b):
+            if value:
+                rhs[name] = value * rng.uniform(1 - args.spread, 1 + args.spread, args.scenarios)
+    result = model.what_if(rhs)
+    optimal = result.status == "Optimal"
+    print(f"{args.scenarios} escenarios en {result.elapsed * 1000:.1f} ms: {optimal.sum()} óptimos, "
+          f"{result.bases} bases, {result.solves} llamadas a HiGHS")
+    if optimal.any():
+        print(f"objetivo: mín {np.nanmin(result.objective):.6g}, medio {np.nanmean(result.objective):.6g}, "
+              f"máx {np.nanmax(result.objective):.6g}")
+    print(f"opciones del solver: {options.effective('highs') or 'las del solver'}")
+
+    if args.check:
+        worst, mismatched = 0.0, 0
+        ub_index = {name: i for i, name in enumerate(form.ub_names)}
+        eq_index = {name: i for i, name in enumerate(form.eq_names)}
+        for s in range(min(args.check, args.scenarios)):
+            b_ub, b_eq = form.b_ub.copy(), form.b_eq.copy()
+            for name, values in rhs.items():
+                if name in ub_index:
+                    b_ub[ub_index[name]] = values[s]
+                else:
+                    b_eq[eq_index[name]] = values[s]
+            full = solve_matrix(MatrixForm(**{**form.__dict__, "b_ub": b_ub, "b_eq": b_eq}),
+                                **options.for_backend("scipy"))
+            if full.status != result.status[s]:
+                mismatched += 1
+            elif full.status == "Optimal":
+                worst = max(worst, abs(full.objective - result.objective[s]) / max(1.0, abs(full.objective)))
+        print(f"verificación de {min(args.check, args.scenarios)} escenarios: {mismatched} estados distintos, "
+              f"diferencia relativa máxima {worst:.1e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,208 @@
+"""Escritura incremental y reanudable de los resultados de un barrido.
+
+``SweepSink`` acumula hasta ``flush_rows`` escenarios resueltos (o
+``flush_seconds`` segundos) y los escribe como un bloque columnar
+``part-NNNNNN.npz`` en un directorio: ``index``, ``parameters``
+(escenarios × parámetros), ``status``, ``objective`` y, si se guardan,
+``values`` (escenarios × variables). Cada bloque se escribe en un archivo
+temporal, se sincroniza a disco y se renombra, así que una interrupción
+pierde a lo sumo el bloque en curso y nunca deja un bloque a medias. La
+memoria usada es la de un bloque, sin importar cuántos escenarios tenga el
+barrido.
+
+``meta.json`` guarda las rutas de los parámetros, los nombres de las
+variables y una huella de la matriz de escenarios; al abrir de nuevo el
+mismo directorio con los mismos escenarios, ``completed`` indica cuáles ya
+están escritos y el barrido sigue sólo con el resto. ``read`` junta las
+columnas de todos los bloques.
+
+Uso::
+
+    python -m optimizacion.sweep --problem 3 --sample 100000 --param prices.E=6:7.5 \\
+        --param availability.A=1500:2500 --out barrido_p3
+    python -m optimizacion.sink barrido_p3
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterator, Sequence
+
+import numpy as np
+
+COLUMNS = ("index", "parameters", "status", "objective", "values")
+PART = "part-{:06d}.npz"
+
+
+def scenarios_hash(scenarios: np.ndarray) -> str:
+    """Huella de la matriz de escenarios (forma y valores)."""
+    scenarios = np.ascontiguousarray(scenarios, dtype=float)
+    digest = hashlib.sha256(repr(scenarios.shape).encode())
+    digest.update(scenarios.tobytes())
+    return digest.hexdigest()[:16]
+
+
+class SweepSink:
+    """Directorio de bloques ``.npz`` con los resultados de un barrido; se usa como contexto.
+
+    ``parameters`` son las rutas de los parámetros y ``variables`` los
+    nombres de las variables si se guardan sus valores (``None`` si no).
+    Si el directorio ya tiene un barrido, ``parameters``, ``variables`` y
+    ``scenarios`` deben coincidir con los guardados.
+    """
+
+    def __init__(self, directory: str | Path, parameters: Sequence[str], scenarios=None,
+                 variables: Sequence[str] | None = None, flush_rows: int = 10_000,
+                 flush_seconds: float = 30.0, metadata: dict | None = None):
+        self.directory = Path(directory)
+        self.parameters = list(parameters)
+        self.variables = None if variables is None else list(variables)
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        meta = {"parameters": self.parameters, "variables": self.variables,
+                "scenarios": None if scenarios is None else len(scenarios),
+                "scenarios_hash": None if scenarios is None else scenarios_hash(scenarios), **(metadata or {})}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path = self.directory / "meta.json"
+        if meta_path.exists():
+            saved = json.loads(meta_path.read_text())
+            for key in ("parameters", "variables", "scenarios_hash"):
+                if saved.get(key) != meta[key] and not (key == "scenarios_hash" and scenarios is None):
+                    raise ValueError(f"{self.directory} tiene otro barrido ({key} distinto); usar otro directorio")
+            meta = saved
+        else:
+            _write_atomic(meta_path, lambda f: f.write(json.dumps(meta, indent=2).encode()))
+        self.meta = meta
+        for tmp in self.directory.glob("*.tmp"):  # restos de una escritura interrumpida
+            tmp.unlink()
+
+        parts = self.parts()
+        self._next = 1 + max((int(p.stem.split("-")[1]) for p in parts), default=-1)
+        self._buffer: list = []
+        self._last_flush = time.monotonic()
+        self.written = 0
+
+    def parts(self) -> list[Path]:
+        """Bloques completos, en el orden en que se escribieron."""
+        return sorted(self.directory.glob("part-*.npz"))
+
+    def completed(self, n: int | None = None) -> np.ndarray:
+        """Máscara de los escenarios ya escritos (de largo ``n``, por defecto la cantidad de escenarios)."""
+        n = self.meta["scenarios"] if n is None else n
+        done = np.zeros(n, dtype=bool)
+        for part in self.parts():
+            with np.load(part) as data:
+                done[data["index"]] = True
+        return done
+
+    def pending(self, n: int | None = None) -> np.ndarray:
+        """Índices de los escenarios que faltan escribir."""
+        return np.flatnonzero(~self.completed(n))
+
+    def append(self, index: int, parameters, status: str, objective: float | None, values=None) -> None:
+        """Agrega un escenario; escribe un bloque si se llegó a ``flush_rows`` o a ``flush_seconds``."""
+        if self.variables is not None and values is None:
+            values = np.full(len(self.variables), np.nan)
+        self._buffer.append((index, parameters, status, np.nan if objective is None else objective, values))
+        if len(self._buffer) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def write(self, result) -> None:
+        """Agrega un ``sweep.SweepResult``."""
+        self.append(result.index, [result.parameters[p] for p in self.parameters], result.status,
+                    result.objective, result.values)
+
+    def flush(self) -> None:
+        """Escribe el bloque pendiente (si hay) como ``part-NNNNNN.npz``."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        index, parameters, status, objective, values = zip(*self._buffer)
+        columns = {
+            "index": np.array(index, dtype=np.int64),
+            "parameters": np.array(parameters, dtype=float).reshape(len(index), len(self.parameters)),
+            "status": np.array(status, dtype=str),
+            "objective": np.array(objective, dtype=float),
+        }
+        if self.variables is not None:
+            columns["values"] = np.array(values, dtype=float).reshape(len(index), len(self.variables))
+        _write_atomic(self.directory / PART.format(self._next), lambda f: np.savez(f, **columns))
+        self._next += 1
+        self.written += len(index)
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> SweepSink:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # También ante una excepción: lo ya resuelto queda escrito
+        self.close()
+
+    def iter_parts(self, columns: Sequence[str] = COLUMNS) -> Iterator[dict[str, np.ndarray]]:
+        """Columnas de cada bloque, de a uno (para recorrer barridos que no entran en memoria)."""
+        for part in self.parts():
+            with np.load(part) as data:
+                yield {k: data[k] for k in columns if k in data}
+
+    def read(self, columns: Sequence[str] = COLUMNS) -> dict[str, np.ndarray]:
+        """Columnas de todos los bloques juntas, ordenadas por ``index``."""
+        blocks = list(self.iter_parts(tuple(dict.fromkeys(("index", *columns)))))
+        if not blocks:
+            return {}
+        data = {k: np.concatenate([b[k] for b in blocks]) for k in blocks[0]}
+        order = np.argsort(data["index"], kind="stable")
+        return {k: v[order] for k, v in data.items() if k in columns}
+
+
+def open_sink(directory: str | Path, **kwargs) -> SweepSink:
+    """Abre un directorio ya escrito para leerlo, con los parámetros y variables de su ``meta.json``."""
+    meta = json.loads((Path(directory) / "meta.json").read_text())
+    return SweepSink(directory, meta["parameters"], variables=meta["variables"], **kwargs)
+
+
+def _write_atomic(path: Path, write) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if hasattr(os, "O_DIRECTORY"):  # que el renombre también llegue al disco
+        fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Resumen de un barrido escrito con --out")
+    parser.add_argument("directory", type=Path)
+    args = parser.parse_args(argv)
+
+    sink = open_sink(args.directory)
+    total = sink.meta["scenarios"]
+    count, optimal, best, worst = 0, 0, np.inf, -np.inf
+    for block in sink.iter_parts(("status", "objective")):
+        count += len(block["status"])
+        optimal += int(np.sum(block["status"] == "Optimal"))
+        objective = block["objective"][~np.isnan(block["objective"])]
+        if len(objective):
+            best, worst = min(best, objective.min()), max(worst, objective.max())
+    print(f"{args.directory}: {len(sink.parts())} bloques, {count} de {total} escenarios, {optimal} óptimos")
+    if optimal:
+        print(f"  funcional entre {best:.6g} y {worst:.6g}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,244 @@
+"""Resolución en el mismo proceso (HiGHS vía ``highspy`` o SciPy) con la interfaz de PuLP.
+
+``PULP_CBC_CMD`` escribe un MPS, lanza el binario de CBC y lee el archivo de
+solución; en modelos de 2 a 30 variables eso es casi todo el tiempo.
+``HighsSolver`` y ``ScipySolver`` son solvers de PuLP: ``prob.solve(HighsSolver())``
+deja ``status``, ``varValue``, ``dj``, ``pi`` y ``slack`` igual que CBC,
+así que el código que lee el resultado no cambia. ``solve`` elige el backend
+por nombre y acepta tanto un ``LpProblem`` como una ``MatrixForm``; los
+modelos de dos variables continuas van por ``optimizacion.planar``. El
+comando acepta las opciones de ``optimizacion.config`` (``--threads``, ...).
+
+Uso::
+
+    python -m optimizacion.solvers --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pulp
+
+from optimizacion.config import SolverOptions, add_arguments
+from optimizacion.matrix import MatrixForm, from_lp, run_highs, scipy_solve, solve_matrix, to_highs, to_lp
+from optimizacion.planar import is_planar, solve_planar
+from optimizacion.results import ArrayResult, Result
+
+BACKENDS = ("cbc", "highs", "scipy")
+
+# Estado (nombre de pulp.LpStatus) -> código de PuLP
+_CODES = {name: code for code, name in pulp.LpStatus.items()}
+# Códigos de linprog/milp -> código de PuLP
+_SCIPY_CODES = {0: pulp.LpStatusOptimal, 2: pulp.LpStatusInfeasible, 3: pulp.LpStatusUnbounded}
+
+
+def _assign(prob: pulp.LpProblem, form: MatrixForm, status: int, x, row_activity=None, row_dual=None,
+            col_dual=None) -> None:
+    """Escribe en ``prob`` el resultado de ``form`` (filas ``<=`` y luego ``==``, en el sentido de ``form``)."""
+    prob.assignStatus(status)
+    if x is None:
+        return
+    variables = prob.variables()
+    prob.assignVarsVals(dict(zip((v.name for v in variables), np.asarray(x, dtype=float).tolist())))
+    if col_dual is not None:
+        prob.assignVarsDj(dict(zip((v.name for v in variables), np.asarray(col_dual, dtype=float).tolist())))
+
+    rows = {name: i for i, name in enumerate(form.ub_names)}
+    rows.update({name: len(form.ub_names) + i for i, name in enumerate(form.eq_names)})
+    slacks, pis = {}, {}
+    for name, con in prob.constraints.items():
+        i = rows[name]
+        sign = -1.0 if con.sense == pulp.LpConstraintGE else 1.0  # las >= están negadas en A_ub
+        if row_activity is not None:
+            slacks[name] = -con.constant - sign * float(row_activity[i])
+        if row_dual is not None:
+            pis[name] = sign * float(row_dual[i])
+    prob.assignConsSlack(slacks)
+    if pis:
+        prob.assignConsPi(pis)
+
+
+class HighsSolver(pulp.LpSolver):
+    """Resuelve con ``highspy`` en memoria: ``from_lp`` + ``passModel``, sin archivos ni subprocesos.
+
+    ``timeLimit`` y ``msg`` se traducen a las opciones de HiGHS; cualquier
+    otro argumento con nombre se pasa a ``setOptionValue`` (``mip_rel_gap``,
+    ``threads``, ``presolve``, ...).
+    """
+
+    name = "HighsSolver"
+
+    def __init__(self, mip=True, msg=False, timeLimit=None, **options):
+        super().__init__(mip=mip, msg=msg, timeLimit=timeLimit)
+        self.highs_options = options
+
+    def available(self) -> bool:
+        try:
+            import highspy  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def actualSolve(self, lp: pulp.LpProblem, **kwargs) -> int:
+        form = from_lp(lp)
+        if not self.mip:
+            form.integrality = np.zeros_like(form.integrality)
+        h = to_highs(form)
+        h.setOptionValue("output_flag", bool(self.msg))
+        if self.timeLimit is not None:
+            h.setOptionValue("time_limit", float(self.timeLimit))
+        for key, value in self.highs_options.items():
+            h.setOptionValue(key, value)
+        status = _CODES[run_highs(h)]
+        if not h.getInfo().primal_solution_status:
+            _assign(lp, form, status, None)
+            return status
+        solution = h.getSolution()
+        duals = solution.dual_valid and not form.is_mip
+        _assign(lp, form, status, solution.col_value, row_activity=solution.row_value,
+                row_dual=solution.row_dual if duals else None, col_dual=solution.col_dual if duals else None)
+        return status
+
+
+class ScipySolver(pulp.LpSolver):
+    """Resuelve con ``scipy.optimize.linprog``/``milp`` (HiGHS de SciPy); los argumentos con nombre van a ``options``."""
+
+    name = "ScipySolver"
+
+    def __init__(self, mip=True, msg=False, timeLimit=None, **options):
+        super().__init__(mip=mip, msg=msg, timeLimit=timeLimit)
+        self.scipy_options = options
+
+    def available(self) -> bool:
+        return True
+
+    def actualSolve(self, lp: pulp.LpProblem, **kwargs) -> int:
+        form = from_lp(lp)
+        if not self.mip:
+            form.integrality = np.zeros_like(form.integrality)
+        options = dict(self.scipy_options, disp=bool(self.msg))
+        if self.timeLimit is not None:
+            options["time_limit"] = float(self.timeLimit)
+        res = scipy_solve(form, **options)
+        status = _SCIPY_CODES.get(res.status, pulp.LpStatusNotSolved)
+        if res.x is None:
+            _assign(lp, form, status, None)
+            return status
+        row_activity = np.r_[form.A_ub @ res.x, form.A_eq @ res.x]
+        row_dual = col_dual = None
+        if not form.is_mip:
+            # Las marginales son de min sense * c: se llevan al sentido del funcional original
+            row_dual = form.sense * np.r_[res.ineqlin.marginals, res.eqlin.marginals]
+            col_dual = form.sense * (res.lower.marginals + res.upper.marginals)
+        _assign(lp, form, status, res.x, row_activity=row_activity, row_dual=row_dual, col_dual=col_dual)
+        return status
+
+
+def get_solver(backend: str = "highs", **options) -> pulp.LpSolver:
+    """Solver de PuLP para ``backend`` (``"cbc"``, ``"highs"`` o ``"scipy"``)."""
+    if backend == "cbc":
+        return pulp.PULP_CBC_CMD(msg=options.pop("msg", False), **options)
+    if backend == "highs":
+        return HighsSolver(**options)
+    if backend == "scipy":
+        return ScipySolver(**options)
+    raise ValueError(f"backend desconocido: {backend!r} (opciones: {', '.join(BACKENDS)})")
+
+
+def solve(model: pulp.LpProblem | MatrixForm, backend: str = "highs", planar: bool = True, **options) -> Result:
+    """Resuelve un ``LpProblem`` o una ``MatrixForm`` con ``backend`` y devuelve un ``Result``.
+
+    Un ``LpProblem`` queda resuelto como con ``prob.solve()``; una
+    ``MatrixForm`` se resuelve sin pasar por PuLP (salvo con ``"cbc"``). Con
+    ``planar=True`` los modelos de dos variables continuas (y a lo sumo
+    ``planar.MAX_ROWS`` semiplanos) se resuelven por enumeración de vértices
+    (``optimizacion.planar``) sin llamar al solver.
+    """
+    if planar and (model.numVariables() if isinstance(model, pulp.LpProblem) else len(model.c)) == 2:
+        form = from_lp(model) if isinstance(model, pulp.LpProblem) else model
+        if is_planar(form):
+            result = solve_planar(form)
+            if result.status != "Not Solved":
+                if isinstance(model, pulp.LpProblem):
+                    x = [result.variables[n] for n in form.variables]
+                    activity = None if x[0] is None else np.r_[form.A_ub @ x, form.A_eq @ x]
+                    _assign(model, form, _CODES[result.status], None if x[0] is None else x, row_activity=activity)
+                    return Result.from_problem(model)
+                return result
+    if isinstance(model, pulp.LpProblem):
+        model.solve(get_solver(backend, **options))
+        return Result.from_problem(model)
+    if backend == "scipy":
+        return solve_matrix(model, **options)
+    if backend == "cbc":
+        prob = to_lp(model)
+        prob.solve(get_solver("cbc", **options))
+        return Result.from_problem(prob)
+    if backend != "highs":
+        raise ValueError(f"backend desconocido: {backend!r} (opciones: {', '.join(BACKENDS)})")
+    h = to_highs(model)
+    for key, value in options.items():
+        h.setOptionValue(key, value)
+    status = run_highs(h)
+    if not h.getInfo().primal_solution_status:
+        return Result(status=status, objective=None, variables={n: None for n in model.variables})
+    x = np.asarray(h.getSolution().col_value)
+    return Result(status=status, objective=float(model.c @ x + model.offset) if status == "Optimal" else None,
+                  variables=dict(zip(model.variables, x.tolist())))
+
+
+def solve_arrays(model: pulp.LpProblem | MatrixForm, backend: str = "highs", **options) -> ArrayResult:
+    """Como ``solve``, pero devuelve un ``ArrayResult`` con valores, costos reducidos, precios sombra y holguras.
+
+    Una ``MatrixForm`` con ``"highs"`` se lee directamente del modelo de
+    HiGHS, sin armar un diccionario por variable. No usa la enumeración de
+    vértices, que no da precios sombra ni costos reducidos.
+    """
+    if isinstance(model, MatrixForm) and backend == "highs":
+        h = to_highs(model)
+        for key, value in options.items():
+            h.setOptionValue(key, value)
+        run_highs(h)
+        return ArrayResult.from_highs(model, h)
+    prob = model if isinstance(model, pulp.LpProblem) else to_lp(model)
+    solve(prob, backend, planar=False, **options)
+    return ArrayResult.from_problem(prob)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from optimizacion.problems import PROBLEMS
+
+    parser = argparse.ArgumentParser(description="Tiempo por resolución de cada problema con cada backend")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--backend", choices=BACKENDS, action="append")
+    parser.add_argument("--no-planar", dest="planar", action="store_false",
+                        help="no usar la enumeración de vértices en los modelos de dos variables")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    backends = args.backend or list(BACKENDS)
+    options = SolverOptions.from_args(args)
+
+    print("Problema  " + "  ".join(f"{b:>12}" for b in backends) + "  objetivo")
+    for n, module in PROBLEMS.items():
+        cells, objective = [], None
+        for backend in backends:
+            prob = module.build_model()
+            kwargs = options.for_backend(backend)
+            solve(prob, backend, planar=args.planar, **kwargs)  # importaciones y primera llamada fuera de la medición
+            t0 = time.perf_counter()
+            for _ in range(args.repeat):
+                result = solve(prob, backend, planar=args.planar, **kwargs)
+            cells.append(f"{(time.perf_counter() - t0) / args.repeat * 1000:9.2f} ms")
+            objective = result.objective
+        print(f"{n:<8}  " + "  ".join(cells) + f"  {objective:.6g}")
+    if not options.is_default():
+        for backend in backends:
+            print(f"opciones de {backend}: {options.effective(backend)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,340 @@
+"""Versión estocástica en dos etapas del modelo de arranque (Problema 2).
+
+En ``Problema 2.py`` la demanda de cada período (2500/1800/3500 MW) es cierta.
+Acá los arranques ``I<g>`` se deciden antes de conocerla (primera etapa) y el
+despacho se ajusta a cada escenario de demanda (segunda etapa)::
+
+    min  sum_g startup_g * I_g + sum_s p_s * Q(I, d_s)
+    Q(I, d) = min  sum_{g,t} unit_g * x[g, t] + shortfall * u[t] + surplus * v[t]
+              s.a. sum_g x[g, t] + u[t] - v[t] == d[t]
+                   minimum_g * I_g <= x[g, t] <= capacity_g * I_g
+
+La demanda no abastecida ``u`` y el excedente ``v`` (lo que los mínimos
+técnicos obligan a generar de más) están penalizados, así que todo escenario
+es factible con cualquier arranque.
+
+``solve_benders`` resuelve por el método L-shaped: un maestro entero con los
+``I<g>`` y una cota del costo esperado, y cortes de optimalidad con los
+duales del despacho. Con los arranques fijos el despacho de cada escenario y
+período es el orden de mérito (mínimos técnicos y después las unidades más
+baratas), con solución y duales cerrados, así que cada bloque de escenarios
+se resuelve con NumPy; con ``jobs > 1`` los bloques se reparten entre
+procesos. ``build_extensive`` arma la forma extensiva para validar con pocos
+escenarios. Las opciones de ``optimizacion.config`` van al maestro, a la
+solución determinística y a la forma extensiva (el despacho no usa solver).
+
+Uso::
+
+    python -m optimizacion.stochastic --scenarios 5000 --jobs 4
+    python -m optimizacion.stochastic --generators 30 --periods 24 --scenarios 2000 --extensive
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pulp
+from scipy import sparse
+
+from optimizacion.config import SolverOptions, add_arguments
+from optimizacion.matrix import LazyNames, MatrixForm, run_highs
+from optimizacion.unit_commitment import COLUMNS, synthetic_instance
+
+TOL = 1e-6
+
+
+@dataclass
+class StochasticResult:
+    """Arranques de primera etapa, costo esperado y cotas del método L-shaped.
+
+    ``options`` son las opciones del solver efectivas (``SolverOptions.effective``), si se registraron.
+    """
+
+    status: str
+    objective: float | None
+    committed: dict[str, int] = field(default_factory=dict)
+    lower: float = -np.inf
+    iterations: int = 0
+    history: list[tuple[float, float]] = field(default_factory=list)
+    elapsed: float = 0.0
+    options: dict = field(default_factory=dict)
+
+
+class Dispatch:
+    """Despacho económico de segunda etapa para arreglos por generador, vectorizado sobre escenarios.
+
+    ``shortfall`` y ``surplus`` son los costos por unidad de demanda no
+    abastecida y de excedente (por omisión 100 veces el mayor costo
+    unitario).
+    """
+
+    def __init__(self, unit_cost, capacity, minimum, shortfall: float | None = None, surplus: float | None = None):
+        self.unit_cost, self.capacity, self.minimum = (np.asarray(a, dtype=float) for a in (unit_cost, capacity, minimum))
+        self.shortfall = 100.0 * self.unit_cost.max() if shortfall is None else shortfall
+        self.surplus = 100.0 * self.unit_cost.max() if surplus is None else surplus
+        self.order = np.argsort(self.unit_cost, kind="stable")
+
+    def solve(self, on: np.ndarray, demand: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Costo de cada escenario de ``demand`` ``(S, T)`` con los arranques ``on`` y su subgradiente ``(S, G)``.
+
+        Los generadores encendidos producen su mínimo y el resto de la
+        demanda se cubre en orden de costo; el precio ``lam`` de cada período
+        es el costo del generador marginal (o la penalización de faltante o
+        de excedente). La derivada del costo respecto de ``I_g`` es
+        ``sum_t minimum_g * max(unit_g - lam, 0) - capacity_g * max(lam - unit_g, 0)``.
+        """
+        on = np.asarray(on, dtype=float)
+        demand = np.atleast_2d(np.asarray(demand, dtype=float))
+        unit, cap, low = self.unit_cost, self.capacity * on, self.minimum * on
+        head = cap - low
+        loaded = self.order[head[self.order] > 0]
+        cum = np.cumsum(head[loaded])
+        total = cum[-1] if len(cum) else 0.0
+
+        residual = demand - low.sum()
+        surplus = np.maximum(-residual, 0.0)
+        residual = np.maximum(residual, 0.0)
+        shortfall = np.maximum(residual - total, 0.0)
+        # Carga por encima del mínimo de cada generador en orden de mérito
+        start = np.r_[0.0, cum[:-1]]
+        extra = np.clip(residual[..., None] - start, 0.0, head[loaded])
+        cost = (unit @ low) * demand.shape[1] + (extra @ unit[loaded]).sum(axis=1) \
+            + self.shortfall * shortfall.sum(axis=1) + self.surplus * surplus.sum(axis=1)
+
+        marginal = np.minimum(np.searchsorted(cum, residual, side="left"), max(len(loaded) - 1, 0))
+        lam = unit[loaded][marginal] if len(loaded) else np.zeros_like(residual)
+        lam = np.where(shortfall > TOL, self.shortfall, np.where(surplus > TOL, -self.surplus, lam))
+        if not len(loaded):
+            lam = np.where(surplus > TOL, -self.surplus, self.shortfall)
+        gap = lam[..., None] - unit  # (S, T, G)
+        grad = (self.minimum * np.maximum(-gap, 0.0) - self.capacity * np.maximum(gap, 0.0)).sum(axis=1)
+        return cost, grad
+
+
+def sample_demand(demand, n_scenarios: int, spread: float = 0.1, seed: int = 0) -> np.ndarray:
+    """Escenarios ``(S, T)``: ``demand`` por un factor común a todos los períodos y otro por período.
+
+    Ambos factores son normales de media 1; el común tiene desvío
+    ``spread`` y el de cada período ``spread / 2``. Se recortan en cero.
+    """
+    rng = np.random.default_rng(seed)
+    demand = np.asarray(demand, dtype=float)
+    common = rng.normal(1.0, spread, (n_scenarios, 1))
+    local = rng.normal(1.0, spread / 2, (n_scenarios, len(demand)))
+    return np.maximum(demand * common * local, 0.0).round()
+
+
+def build_extensive(generators: dict, scenarios, probabilities=None, shortfall: float | None = None,
+                    surplus: float | None = None, name: str = "Problema_2_Estocastico") -> MatrixForm:
+    """Forma extensiva: ``I<g>`` compartidos y un despacho por escenario.
+
+    Columnas: ``I<g>`` y por escenario ``s`` los bloques ``<g><t>_<s>``,
+    ``Faltante<t>_<s>`` y ``Excedente<t>_<s>``; filas ``Demanda_<t>_<s>``,
+    ``Cap_<g><t>_<s>`` y ``Min_<g><t>_<s>``. Crece con la cantidad de
+    escenarios; para miles de escenarios conviene ``solve_benders``.
+    """
+    labels = list(generators)
+    startup, unit, cap, low = (np.array([generators[g][k] for g in labels], dtype=float) for k in COLUMNS)
+    scenarios = np.atleast_2d(np.asarray(scenarios, dtype=float))
+    S, T = scenarios.shape
+    G = len(labels)
+    p = np.full(S, 1.0 / S) if probabilities is None else np.asarray(probabilities, dtype=float)
+    dispatch = Dispatch(unit, cap, low, shortfall, surplus)
+    GT, m = G * T, G * T + 2 * T  # columnas de un escenario: x (g mayor), faltante, excedente
+    eye = sparse.identity(S, format="csr")
+
+    # Un escenario: demanda (T filas), Cap y Min (G*T filas cada una) sobre [x, u, v]
+    x = np.arange(GT)
+    demand = sparse.csr_matrix((np.r_[np.ones(GT), np.ones(T), -np.ones(T)],
+                                (np.r_[x % T, np.arange(T), np.arange(T)], np.r_[x, GT + np.arange(2 * T)])),
+                               shape=(T, m))
+    bounds = sparse.csr_matrix((np.r_[np.ones(GT), -np.ones(GT)], (np.arange(2 * GT), np.r_[x, x])),
+                               shape=(2 * GT, m))
+    coupling = sparse.csr_matrix((np.r_[-np.repeat(cap, T), np.repeat(low, T)],
+                                  (np.arange(2 * GT), np.r_[x // T, x // T])), shape=(2 * GT, G))
+    c = np.r_[startup, (p[:, None] * np.r_[np.repeat(unit, T), np.full(T, dispatch.shortfall),
+                                           np.full(T, dispatch.surplus)]).ravel()]
+    n = G + S * m
+    sep = "_" if any(str(g)[-1:].isdigit() for g in labels) else ""
+    periods, cases = range(1, T + 1), range(1, S + 1)
+    return MatrixForm(
+        c=c,
+        A_ub=sparse.hstack([sparse.vstack([coupling] * S), sparse.kron(eye, bounds)], format="csr"),
+        b_ub=np.zeros(2 * GT * S),
+        A_eq=sparse.hstack([sparse.csr_matrix((S * T, G)), sparse.kron(eye, demand)], format="csr"),
+        b_eq=scenarios.ravel(),
+        lb=np.zeros(n), ub=np.r_[np.ones(G), np.full(n - G, np.inf)],
+        variables=LazyNames(("I{}", labels),
+                            ("{1}_{0}", cases, LazyNames(("{}" + sep + "{}", labels, periods),
+                                                         ("Faltante{}", periods), ("Excedente{}", periods)))),
+        ub_names=LazyNames(("{1}_{0}", cases, LazyNames(("Cap_{}" + sep + "{}", labels, periods),
+                                                        ("Min_{}" + sep + "{}", labels, periods)))),
+        eq_names=LazyNames(("Demanda_{1}_{0}", cases, periods)),
+        integrality=np.r_[np.ones(G, dtype=np.int8), np.zeros(n - G, dtype=np.int8)],
+        sense=pulp.LpMinimize, name=name,
+    )
+
+
+_WORKER: tuple[Dispatch, np.ndarray, np.ndarray] | None = None
+
+
+def _init_worker(dispatch: Dispatch, scenarios: np.ndarray, probabilities: np.ndarray) -> None:
+    global _WORKER
+    _WORKER = (dispatch, scenarios, probabilities)
+
+
+def _expected(block: slice, on: np.ndarray) -> tuple[float, np.ndarray]:
+    """Costo esperado y subgradiente del bloque de escenarios ``block`` (ponderados por su probabilidad)."""
+    dispatch, scenarios, p = _WORKER
+    cost, grad = dispatch.solve(on, scenarios[block])
+    return float(p[block] @ cost), p[block] @ grad
+
+
+class _Master:
+    """Maestro L-shaped: ``min startup @ I + theta`` con los cortes ``theta >= Q_k + g_k @ (I - I_k)``."""
+
+    def __init__(self, startup: np.ndarray, options: dict | None = None):
+        import highspy
+
+        G = len(startup)
+        self.G = G
+        self.h = h = highspy.Highs()
+        h.setOptionValue("output_flag", False)
+        for key, value in (options or {}).items():
+            h.setOptionValue(key, value)
+        h.addVars(G + 1, np.zeros(G + 1), np.r_[np.ones(G), np.inf])
+        h.changeColsCost(G + 1, np.arange(G + 1, dtype=np.int32), np.r_[startup, 1.0])
+        h.changeColsIntegrality(G, np.arange(G, dtype=np.int32),
+                                np.full(G, highspy.HighsVarType.kInteger))
+
+    def add_cut(self, value: float, grad: np.ndarray, on: np.ndarray) -> None:
+        G = self.G
+        self.h.addRow(value - grad @ on, np.inf, G + 1, np.arange(G + 1, dtype=np.int32), np.r_[-grad, 1.0])
+
+    def solve(self) -> tuple[float, np.ndarray]:
+        status = run_highs(self.h)
+        if status != "Optimal":
+            raise RuntimeError(f"maestro: {status}")
+        x = np.asarray(self.h.getSolution().col_value)
+        return self.h.getInfo().objective_function_value, np.round(x[:self.G])
+
+
+def solve_benders(generators: dict, scenarios, probabilities=None, jobs: int = 1, chunksize: int = 1000,
+                  tol: float = 1e-6, max_iter: int = 200, shortfall: float | None = None,
+                  surplus: float | None = None, start=None, options: dict | None = None) -> StochasticResult:
+    """Método L-shaped con un corte agregado por iteración y escenarios en bloques de ``chunksize``.
+
+    Arranca con ``start`` (por omisión todos los generadores encendidos);
+    ``options`` son opciones de HiGHS para el maestro.
+    Cada iteración evalúa el costo esperado de los arranques actuales (cota
+    superior), agrega su corte y resuelve el maestro (cota inferior). Como
+    los arranques son binarios, un arranque repetido cierra la brecha, así
+    que termina en finitas iteraciones.
+    """
+    t0 = time.perf_counter()
+    labels = list(generators)
+    startup, unit, cap, low = (np.array([generators[g][k] for g in labels], dtype=float) for k in COLUMNS)
+    scenarios = np.atleast_2d(np.asarray(scenarios, dtype=float))
+    S = len(scenarios)
+    p = np.full(S, 1.0 / S) if probabilities is None else np.asarray(probabilities, dtype=float)
+    dispatch = Dispatch(unit, cap, low, shortfall, surplus)
+    blocks = [slice(k, min(k + chunksize, S)) for k in range(0, S, chunksize)]
+    master = _Master(startup, options)
+    on = np.ones(len(labels)) if start is None else np.asarray(start, dtype=float)
+    result = StochasticResult(status="Not Solved", objective=None)
+    upper, best = np.inf, on
+    pool = ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(dispatch, scenarios, p)) if jobs > 1 \
+        else None
+    if pool is None:
+        _init_worker(dispatch, scenarios, p)
+    try:
+        for iteration in range(1, max_iter + 1):
+            parts = list(pool.map(_expected, blocks, [on] * len(blocks))) if pool else [_expected(b, on) for b in blocks]
+            value = sum(v for v, _ in parts)
+            grad = sum(g for _, g in parts)
+            if startup @ on + value < upper:
+                upper, best = startup @ on + value, on
+            master.add_cut(value, grad, on)
+            lower, on = master.solve()
+            result.history.append((float(lower), float(upper)))
+            if upper - lower <= tol * max(1.0, abs(upper)):
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    result.status = "Optimal" if upper - lower <= tol * max(1.0, abs(upper)) else "Not Solved"
+    result.objective, result.lower, result.iterations = float(upper), float(lower), iteration
+    result.committed = dict(zip(labels, best.astype(int).tolist()))
+    result.elapsed = time.perf_counter() - t0
+    return result
+
+
+def expected_cost(generators: dict, committed, scenarios, probabilities=None, shortfall: float | None = None,
+                  surplus: float | None = None) -> float:
+    """Costo de arranque más costo esperado del despacho con los arranques ``committed`` fijos."""
+    labels = list(generators)
+    startup, unit, cap, low = (np.array([generators[g][k] for g in labels], dtype=float) for k in COLUMNS)
+    on = np.array([committed[g] for g in labels], dtype=float) if isinstance(committed, dict) else \
+        np.asarray(committed, dtype=float)
+    scenarios = np.atleast_2d(np.asarray(scenarios, dtype=float))
+    p = np.full(len(scenarios), 1.0 / len(scenarios)) if probabilities is None else np.asarray(probabilities)
+    cost, _ = Dispatch(unit, cap, low, shortfall, surplus).solve(on, scenarios)
+    return float(startup @ on + p @ cost)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from optimizacion.problems.problem2 import DEFAULT_PARAMS
+    from optimizacion.solvers import solve
+    from optimizacion.unit_commitment import from_table
+
+    parser = argparse.ArgumentParser(description="Arranque de generadores con demanda incierta (dos etapas)")
+    parser.add_argument("--scenarios", type=int, default=1000)
+    parser.add_argument("--spread", type=float, default=0.1, help="desvío relativo de la demanda")
+    parser.add_argument("--generators", type=int, help="instancia sintética en lugar de la del Problema 2")
+    parser.add_argument("--periods", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--chunksize", type=int, default=1000)
+    parser.add_argument("--extensive", action="store_true", help="resolver también la forma extensiva")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    options = SolverOptions.from_args(args)
+    highs = options.for_backend("highs")
+
+    if args.generators:
+        data = synthetic_instance(args.generators, args.periods, seed=args.seed)
+        labels = [f"G{g}" for g in range(1, args.generators + 1)]
+        generators = {g: {k: float(data[k][i]) for k in COLUMNS} for i, g in enumerate(labels)}
+        demand = data["demand"]
+    else:
+        generators, demand = DEFAULT_PARAMS["generators"], DEFAULT_PARAMS["demand"]
+    scenarios = sample_demand(demand, args.scenarios, args.spread, args.seed)
+
+    # Solución determinística con la demanda media, evaluada en los escenarios
+    deterministic = solve(from_table(generators, scenarios.mean(axis=0)), "highs", **highs)
+    det_on = {g: round(deterministic.variables[f"I{g}"]) for g in generators}
+    det_cost = expected_cost(generators, det_on, scenarios)
+    print(f"determinística (demanda media): arranques {det_on}, costo esperado {det_cost:.6g}")
+
+    result = solve_benders(generators, scenarios, jobs=args.jobs, chunksize=args.chunksize, options=highs)
+    result.options = options.effective("highs")
+    print(f"L-shaped ({args.scenarios} escenarios, {args.jobs} procesos): {result.status}, arranques "
+          f"{result.committed}, costo esperado {result.objective:.6g}, {result.iterations} iteraciones en "
+          f"{result.elapsed:.2f} s")
+    print(f"valor de la solución estocástica: {det_cost - result.objective:.6g}")
+    print(f"opciones del solver: {result.options or 'las del solver'}")
+    if args.extensive:
+        t0 = time.perf_counter()
+        form = build_extensive(generators, scenarios)
+        extensive = solve(form, "highs", **highs)
+        print(f"forma extensiva: {len(form.c)} variables, {extensive.status}, objetivo {extensive.objective:.6g} "
+              f"en {time.perf_counter() - t0:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
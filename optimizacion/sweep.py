@@ -0,0 +1,326 @@
+"""Barrido paramétrico sobre un único modelo (por defecto, el Problema 1).
+
+Cada parámetro se indica con su ruta en el diccionario de parámetros del
+problema (``"prices.A1"``, ``"ingredient_costs.Y"``,
+``"specs.energia.bounds.A"``, ``"demand.0"``). Antes de resolver se ubica,
+comparando ``build_matrices`` en el punto base y en puntos perturbados, en qué
+coeficientes de ``c``, ``b_ub``/``b_eq`` y ``A_ub``/``A_eq`` entra cada
+parámetro (la dependencia debe ser afín y no cambiar la estructura). Entre
+escenarios sólo se reescriben esas posiciones sobre el mismo modelo
+``highspy.Highs`` en memoria, que además reutiliza la base de la solución
+anterior.
+
+En el Problema 1 los precios y costos van al funcional, pero las cotas
+nutricionales multiplican al alimento (``contenido <= cota * A``): son
+coeficientes de ``A_ub``, no lados derechos, y se actualizan igual.
+
+Uso::
+
+    python -m optimizacion.sweep --sample 2000 -j 4 \\
+        --param prices.A1=30:40 --param ingredient_costs.Y=5:9 --param specs.energia.bounds.A=3500:4200
+    python -m optimizacion.sweep --grid prices.A2=24,28,32 --grid specs.fibra.bounds.A=45,50,55
+    python -m optimizacion.sweep --problem 3 --sample 1000000 --param prices.E=6:7.5 --out barrido_p3
+
+Con ``--out`` los resultados van a un ``sink.SweepSink`` (bloques ``.npz``
+escritos a medida que avanza el barrido) y, si el directorio ya existe, sólo
+se resuelven los escenarios que faltan. Las opciones de ``optimizacion.config``
+(``--time-limit``, ``--threads``, ``--presolve``, ... u ``OPTIMIZACION_*``) se
+aplican a cada escenario; las efectivas van en cada línea JSON (``options``)
+o en ``meta.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import itertools
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from optimizacion.config import SolverOptions, add_arguments
+from optimizacion.matrix import run_highs, solve_matrix, to_highs
+from optimizacion.params import merge_params
+from optimizacion.problems import PROBLEMS
+
+BACKENDS = ("highs", "scipy")
+TARGETS = ("c", "b_ub", "b_eq", "A_ub", "A_eq")
+
+
+@dataclass
+class SweepResult:
+    """Resultado de un escenario: los valores de los parámetros y la solución."""
+
+    index: int
+    parameters: dict[str, float]
+    status: str
+    objective: float | None
+    values: np.ndarray | None = field(default=None, repr=False)
+
+
+def _split(path: str) -> list:
+    return [int(k) if k.isdigit() else k for k in path.split(".")]
+
+
+def get_path(params: dict, path: str):
+    """Valor de ``params`` en la ruta ``"a.b.c"`` (los enteros indexan listas)."""
+    node = params
+    for key in _split(path):
+        node = node[key]
+    return node
+
+
+def set_path(params: dict, path: str, value) -> None:
+    """Asigna ``value`` en la ruta ``"a.b.c"`` de ``params`` (en el lugar)."""
+    *parents, last = _split(path)
+    node = params
+    for key in parents:
+        node = node[key]
+    node[last] = value
+
+
+def _arrays(form) -> dict[str, np.ndarray]:
+    return {"c": form.c, "b_ub": form.b_ub, "b_eq": form.b_eq, "A_ub": form.A_ub.data, "A_eq": form.A_eq.data}
+
+
+def _same_structure(a, b) -> bool:
+    return all(
+        x.shape == y.shape and np.array_equal(x.indptr, y.indptr) and np.array_equal(x.indices, y.indices)
+        for x, y in ((a.A_ub, b.A_ub), (a.A_eq, b.A_eq))
+    ) and np.array_equal(a.lb, b.lb) and np.array_equal(a.ub, b.ub)
+
+
+class ParametricModel:
+    """Modelo de un problema con ``parameters`` libres; ``solve(theta)`` resuelve un escenario.
+
+    ``base`` son parámetros adicionales sobre ``DEFAULT_PARAMS`` que fijan el
+    punto base. ``backend="highs"`` mantiene un ``highspy.Highs`` y le cambia
+    costos, cotas de filas y coeficientes; ``backend="scipy"`` actualiza la
+    ``MatrixForm`` en el lugar y llama a ``solve_matrix``. ``options`` son
+    opciones del backend (``config.SolverOptions.for_backend``).
+    """
+
+    def __init__(self, problem: int = 1, parameters: list[str] = (), base: dict | None = None,
+                 backend: str = "highs", options: dict | None = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend desconocido: {backend!r} (opciones: {', '.join(BACKENDS)})")
+        module = PROBLEMS[problem]
+        self.problem = problem
+        self.parameters = list(parameters)
+        self.backend = backend
+        self.options = dict(options or {})
+        self.base_params = merge_params(module.DEFAULT_PARAMS, base)
+        self.theta0 = np.array([float(get_path(self.base_params, p)) for p in self.parameters])
+        self.form = module.build_matrices(self.base_params)
+        base_arrays = {k: v.copy() for k, v in _arrays(self.form).items()}
+
+        slopes = {k: np.zeros((len(v), len(self.parameters))) for k, v in base_arrays.items()}
+        for j, path in enumerate(self.parameters):
+            points = []
+            for step in (1.0, 2.0):
+                params = copy.deepcopy(self.base_params)
+                set_path(params, path, self.theta0[j] + step)
+                perturbed = module.build_matrices(params)
+                if not _same_structure(self.form, perturbed):
+                    raise ValueError(f"{path!r} cambia la estructura del modelo (coeficiente nulo o cota de variable)")
+                points.append(_arrays(perturbed))
+            for k in TARGETS:
+                d1, d2 = points[0][k] - base_arrays[k], points[1][k] - base_arrays[k]
+                if not np.allclose(d2, 2 * d1):
+                    raise ValueError(f"{path!r} no entra en forma afín en {k}")
+                slopes[k][:, j] = d1
+
+        # Sólo se guardan las posiciones que dependen de algún parámetro
+        self._updates = {}
+        for k in TARGETS:
+            touched = np.flatnonzero(np.any(slopes[k] != 0, axis=1))
+            if len(touched):
+                self._updates[k] = (touched, base_arrays[k][touched], slopes[k][touched])
+
+        n_ub = self.form.A_ub.shape[0]
+        self._coords = {}  # posición en A.data -> (fila, columna) en el modelo de HiGHS (<= y luego ==)
+        for k, offset in (("A_ub", 0), ("A_eq", n_ub)):
+            if k in self._updates:
+                A = getattr(self.form, k)
+                rows = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+                touched = self._updates[k][0]
+                self._coords[k] = (rows[touched] + offset, A.indices[touched])
+        self._highs = to_highs(self.form) if backend == "highs" else None
+        if self._highs is not None:
+            for key, value in self.options.items():
+                self._highs.setOptionValue(key, value)
+
+    def touched(self) -> dict[str, int]:
+        """Cantidad de coeficientes que se reescriben por escenario, por arreglo."""
+        return {k: len(v[0]) for k, v in self._updates.items()}
+
+    def solve(self, theta, index: int = 0, keep_values: bool = False) -> SweepResult:
+        theta = np.asarray(theta, dtype=float)
+        delta = theta - self.theta0
+        arrays = _arrays(self.form)
+        new = {}
+        for k, (idx, base, slope) in self._updates.items():
+            new[k] = base + slope @ delta
+            arrays[k][idx] = new[k]
+
+        parameters = dict(zip(self.parameters, theta.tolist()))
+        if self.backend == "scipy":
+            res = solve_matrix(self.form, **self.options)
+            values = np.array([res.variables[n] for n in self.form.variables], dtype=float) \
+                if res.objective is not None else None
+            return SweepResult(index, parameters, res.status, res.objective, values if keep_values else None)
+
+        h = self._highs
+        n_ub = self.form.A_ub.shape[0]
+        if "c" in new:
+            idx = self._updates["c"][0]
+            h.changeColsCost(len(idx), idx.astype(np.int32), new["c"])
+        if "b_ub" in new:
+            idx = self._updates["b_ub"][0]
+            h.changeRowsBounds(len(idx), idx.astype(np.int32), np.full(len(idx), -np.inf), new["b_ub"])
+        if "b_eq" in new:
+            idx = self._updates["b_eq"][0] + n_ub
+            h.changeRowsBounds(len(idx), idx.astype(np.int32), new["b_eq"], new["b_eq"])
+        for k, (rows, cols) in self._coords.items():
+            for r, col, v in zip(rows.tolist(), cols.tolist(), new[k].tolist()):
+                h.changeCoeff(r, col, v)
+        status = run_highs(h)
+        if status != "Optimal":
+            return SweepResult(index, parameters, status, None)
+        objective = h.getInfo().objective_function_value
+        values = np.asarray(h.getSolution().col_value) if keep_values else None
+        return SweepResult(index, parameters, status, objective, values)
+
+
+def grid(axes: dict[str, list]) -> tuple[list[str], np.ndarray]:
+    """Producto cartesiano de los valores de cada parámetro: ``(rutas, escenarios)``."""
+    paths = list(axes)
+    values = np.array(list(itertools.product(*(axes[p] for p in paths))), dtype=float).reshape(-1, len(paths))
+    return paths, values
+
+
+def monte_carlo(ranges: dict[str, tuple[float, float]], n: int, seed: int = 0) -> tuple[list[str], np.ndarray]:
+    """``n`` escenarios con cada parámetro uniforme en ``(mínimo, máximo)``: ``(rutas, escenarios)``."""
+    paths = list(ranges)
+    low, high = np.array([ranges[p] for p in paths], dtype=float).T
+    return paths, np.random.default_rng(seed).uniform(low, high, size=(n, len(paths)))
+
+
+_WORKER: ParametricModel | None = None
+
+
+def _init_worker(problem, parameters, base, backend, options) -> None:
+    global _WORKER
+    _WORKER = ParametricModel(problem, parameters, base, backend, options)
+
+
+def _solve_chunk(indices: np.ndarray, chunk: np.ndarray, keep_values: bool) -> list[SweepResult]:
+    return [_WORKER.solve(theta, k, keep_values) for k, theta in zip(indices.tolist(), chunk)]
+
+
+def sweep(parameters: list[str], scenarios, problem: int = 1, base: dict | None = None, jobs: int = 1,
+          chunksize: int = 64, backend: str = "highs", keep_values: bool = False,
+          indices=None, options: dict | None = None) -> Iterator[SweepResult]:
+    """Resuelve cada fila de ``scenarios`` y entrega los resultados en orden, a medida que salen.
+
+    Con ``jobs > 1`` cada proceso arma el modelo una sola vez y resuelve
+    bloques de ``chunksize`` escenarios; hay a lo sumo ``2 * jobs`` bloques en
+    vuelo, así que la memoria no crece con la cantidad de escenarios.
+    ``indices`` restringe el barrido a esas filas (por ejemplo, las que faltan
+    en un ``sink.SweepSink``); cada resultado conserva el índice de su fila.
+    ``options`` son opciones del backend, como en ``ParametricModel``.
+    """
+    scenarios = np.asarray(scenarios, dtype=float).reshape(-1, len(parameters))
+    indices = np.arange(len(scenarios)) if indices is None else np.asarray(indices, dtype=np.int64)
+    if jobs <= 1:
+        model = ParametricModel(problem, parameters, base, backend, options)
+        for k in indices.tolist():
+            yield model.solve(scenarios[k], k, keep_values)
+        return
+
+    starts = iter(range(0, len(indices), chunksize))
+    submit = lambda pool, start: pool.submit(  # noqa: E731
+        _solve_chunk, indices[start:start + chunksize], scenarios[indices[start:start + chunksize]], keep_values)
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(problem, parameters, base, backend, options)) as pool:
+        pending = deque()
+        for start in itertools.islice(starts, 2 * jobs):
+            pending.append(submit(pool, start))
+        while pending:
+            results = pending.popleft().result()
+            for start in itertools.islice(starts, 1):
+                pending.append(submit(pool, start))
+            yield from results
+
+
+def _parse_axis(text: str) -> tuple[str, str]:
+    path, sep, values = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"se esperaba ruta=valores: {text!r}")
+    return path, values
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Barrido paramétrico sobre un modelo reutilizado (JSON por línea)")
+    parser.add_argument("--problem", type=int, default=1, choices=sorted(PROBLEMS))
+    parser.add_argument("--param", type=_parse_axis, action="append", default=[],
+                        help="ruta=min:max, muestreado uniforme (con --sample)")
+    parser.add_argument("--grid", type=_parse_axis, action="append", default=[], help="ruta=v1,v2,...")
+    parser.add_argument("--sample", type=int, default=1000, help="cantidad de escenarios Monte Carlo")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("--chunksize", type=int, default=64)
+    parser.add_argument("--backend", choices=BACKENDS, default="highs")
+    parser.add_argument("--values", action="store_true", help="incluir los valores de las variables")
+    parser.add_argument("--out", type=Path, help="directorio de bloques .npz (reanuda si ya existe) en lugar de JSON")
+    parser.add_argument("--flush", type=int, default=10_000, help="escenarios por bloque con --out")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    if bool(args.param) == bool(args.grid):
+        parser.error("indicar --param (Monte Carlo) o --grid, no ambos")
+
+    if args.grid:
+        paths, scenarios = grid({p: [float(v) for v in values.split(",")] for p, values in args.grid})
+    else:
+        ranges = {p: tuple(float(v) for v in values.split(":")) for p, values in args.param}
+        paths, scenarios = monte_carlo(ranges, args.sample, seed=args.seed)
+
+    options = SolverOptions.from_args(args)
+    effective = options.effective(args.backend)
+    names = list(PROBLEMS[args.problem].build_matrices().variables) if args.values else None
+    run = lambda indices=None: sweep(  # noqa: E731
+        paths, scenarios, problem=args.problem, jobs=args.jobs, chunksize=args.chunksize,
+        backend=args.backend, keep_values=args.values, indices=indices, options=options.for_backend(args.backend))
+    t0 = time.perf_counter()
+    if args.out is not None:
+        from optimizacion.sink import SweepSink
+
+        with SweepSink(args.out, paths, scenarios, variables=names, flush_rows=args.flush,
+                       metadata={"problem": args.problem, "backend": args.backend, "options": effective}) as sink:
+            pending = sink.pending()
+            if len(pending) < len(scenarios):
+                print(f"{args.out}: {len(scenarios) - len(pending)} escenarios ya escritos", file=sys.stderr)
+            for res in run(pending):
+                sink.write(res)
+        solved = len(pending)
+    else:
+        for res in run():
+            row = {"scenario": res.index, **res.parameters, "status": res.status, "objective": res.objective,
+                   "options": effective}
+            if names is not None and res.values is not None:
+                row["variables"] = dict(zip(names, res.values.tolist()))
+            print(json.dumps(row))
+        solved = len(scenarios)
+    elapsed = time.perf_counter() - t0
+    print(f"{solved} escenarios en {elapsed:.2f} s ({solved / max(elapsed, 1e-9):.0f}/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
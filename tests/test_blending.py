@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from optimizacion.matrix import MatrixForm, from_lp
+from optimizacion.problems import problem3
+
+
+def _rows(form: MatrixForm) -> dict[str, tuple[str, dict[str, float], float]]:
+    """``{nombre: (sentido, {variable: coeficiente}, lado derecho)}`` de cada fila."""
+    rows = {}
+    for kind, A, b, names in (("<=", form.A_ub, form.b_ub, form.ub_names), ("==", form.A_eq, form.b_eq, form.eq_names)):
+        A = A.tocsr()
+        for i, name in enumerate(names):
+            lo, hi = A.indptr[i], A.indptr[i + 1]
+            coefs = {form.variables[j]: round(float(a), 12) for j, a in zip(A.indices[lo:hi], A.data[lo:hi]) if a}
+            rows[name] = (kind, coefs, round(float(b[i]), 12))
+    return rows
+
+
+@pytest.mark.parametrize("params", [
+    None,
+    {"max_fraction": {"K": {"A": 0.5}}},
+    {"min_fraction": {"T": {"C": 0.1, "A": 0.2}}, "max_fraction": {"E": {"B": 0.3}}},
+])
+def test_build_matrices_matches_build_model_row_by_row(params):
+    script = from_lp(problem3.build_model(params))
+    matrices = problem3.build_matrices(params)
+    assert _rows(matrices) == _rows(script)
+    c_script = dict(zip(script.variables, script.c))
+    assert np.allclose([c_script[v] for v in matrices.variables], matrices.c)
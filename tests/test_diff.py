@@ -0,0 +1,39 @@
+import itertools
+
+import pulp
+import pytest
+
+from optimizacion.diff import diff_models
+
+SENSES = {"<=": pulp.LpConstraintLE, ">=": pulp.LpConstraintGE, "==": pulp.LpConstraintEQ}
+
+
+def _model(sense: str) -> pulp.LpProblem:
+    prob = pulp.LpProblem("modelo", pulp.LpMinimize)
+    x, y = pulp.LpVariable("x", 0, 10), pulp.LpVariable("y", 0, 10)
+    prob += x + 2 * y
+    prob += pulp.LpConstraint(x + y, SENSES[sense], "suma", 3)
+    prob += x - y <= 5, "resta"
+    return prob
+
+
+@pytest.mark.parametrize("a, b", itertools.permutations(SENSES, 2))
+def test_sense_change_reports_written_senses(a, b):
+    result = diff_models(_model(a), _model(b))
+    change, = result.constraint_changes
+    assert (change.constraint, change.other) == ("suma", "suma")
+    assert change.sense == (a, b)
+    assert change.coefficients == [] and change.rhs is None
+
+
+@pytest.mark.parametrize("sense", SENSES)
+def test_same_sense_reports_no_change(sense):
+    assert diff_models(_model(sense), _model(sense)).constraint_changes == []
+
+
+def test_negated_inequality_with_opposite_sense_is_unchanged():
+    a = _model("<=")
+    b = _model("<=")
+    x, y = (v for v in b.variables())
+    b.constraints["suma"] = pulp.LpConstraint(-x - y, pulp.LpConstraintGE, "suma", -3)
+    assert diff_models(a, b).constraint_changes == []
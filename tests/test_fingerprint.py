@@ -0,0 +1,33 @@
+import pulp
+
+from optimizacion.fingerprint import SolutionCache, fingerprint
+
+
+def _stable_set(edges: list[tuple[int, int]]) -> pulp.LpProblem:
+    """max sum x  s.a.  x_i + x_j <= 1 por arista, x binaria (conjunto independiente máximo)."""
+    prob = pulp.LpProblem("conjunto", pulp.LpMaximize)
+    x = [pulp.LpVariable(f"x{i}", cat=pulp.LpBinary) for i in range(6)]
+    prob += pulp.lpSum(x)
+    for k, (i, j) in enumerate(edges):
+        prob += x[i] + x[j] <= 1, f"arista_{k}"
+    return prob
+
+
+def test_cache_does_not_serve_non_isomorphic_model_with_same_fingerprint(tmp_path):
+    triangles = _stable_set([(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3)])
+    hexagon = _stable_set([(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 0)])
+    assert fingerprint(triangles).digest == fingerprint(hexagon).digest
+
+    cache = SolutionCache(tmp_path)
+    assert cache.solve(triangles, "highs").objective == 2
+    assert cache.solve(hexagon, "highs").objective == 3
+    assert cache.hits == 0
+
+
+def test_cache_serves_renamed_model(tmp_path):
+    edges = [(0, 1), (1, 2), (2, 0), (3, 4)]
+    cache = SolutionCache(tmp_path)
+    first = cache.solve(_stable_set(edges), "highs")
+    again = cache.solve(_stable_set(edges[::-1]), "highs")
+    assert cache.hits == 1
+    assert again.objective == first.objective
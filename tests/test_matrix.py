@@ -0,0 +1,42 @@
+import highspy
+
+from optimizacion.matrix import highs_status, run_highs
+
+AMBIGUOUS = highspy.HighsModelStatus.kUnboundedOrInfeasible
+
+
+class _Presolved:
+    """Modelo infactible que el presolve sólo reconoce como no acotado o infactible."""
+
+    def __init__(self):
+        self.options = {"presolve": "choose"}
+        self.runs = 0
+        self.status = highspy.HighsModelStatus.kNotset
+
+    def getOptionValue(self, key):
+        return highspy.HighsStatus.kOk, self.options[key]
+
+    def setOptionValue(self, key, value):
+        self.options[key] = value
+
+    def run(self):
+        self.runs += 1
+        self.status = AMBIGUOUS if self.options["presolve"] != "off" else highspy.HighsModelStatus.kInfeasible
+
+    def getModelStatus(self):
+        return self.status
+
+
+def test_highs_status_only_reads():
+    h = _Presolved()
+    h.run()
+    assert highs_status(h) == "Undefined"
+    assert h.runs == 1
+
+
+def test_run_highs_resolves_without_presolve():
+    h = _Presolved()
+    assert run_highs(h) == "Infeasible"
+    assert h.runs == 2
+    assert h.options["presolve"] == "choose"
+    assert highs_status(h) == "Infeasible"
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from optimizacion.matrix import MatrixForm
+from optimizacion.presolve import PresolveInfeasible, presolve, solve_presolved
+
+
+def _integer_singleton(a: float, b: float) -> MatrixForm:
+    """min x  s.a.  a * x == b, x entero en [0, 10]."""
+    return MatrixForm(
+        c=np.array([1.0]), A_ub=sparse.csr_matrix((0, 1)), b_ub=np.zeros(0),
+        A_eq=sparse.csr_matrix([[a]]), b_eq=np.array([b]), lb=np.zeros(1), ub=np.full(1, 10.0),
+        variables=["x"], eq_names=["fila"], integrality=np.ones(1, dtype=np.int8),
+    )
+
+
+def test_integer_singleton_equality_with_fractional_value_is_infeasible():
+    form = _integer_singleton(3.0, 4.0)
+    with pytest.raises(PresolveInfeasible):
+        presolve(form)
+    assert solve_presolved(form).status == "Infeasible"
+
+
+def test_integer_singleton_equality_with_integral_value_is_fixed():
+    result = solve_presolved(_integer_singleton(3.0, 6.0))
+    assert result.status == "Optimal"
+    assert result.variables["x"] == 2
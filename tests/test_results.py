@@ -0,0 +1,65 @@
+import json
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from optimizacion.matrix import LazyNames, to_highs
+from optimizacion.problems import problem1
+from optimizacion.results import ArrayResult
+from optimizacion.solvers import solve, solve_arrays
+from optimizacion.unit_commitment import COLUMNS, build_unit_commitment, synthetic_instance
+
+
+@pytest.fixture(scope="module")
+def result():
+    data = synthetic_instance(5, 6)
+    form = build_unit_commitment(*(data[k] for k in COLUMNS), data["demand"])
+    form.integrality = None
+    h = to_highs(form)
+    h.run()
+    return ArrayResult.from_highs(form, h)
+
+
+def test_no_objective_unless_optimal():
+    form = problem1.build_matrices()
+    assert solve(form, "highs", planar=False, time_limit=0.0).status != "Optimal"
+    assert solve(form, "highs", planar=False, time_limit=0.0).objective is None
+    arrays = solve_arrays(form, "highs", time_limit=0.0)
+    assert arrays.status != "Optimal" and arrays.objective is None
+
+
+def test_npz_keeps_lazy_names(result, tmp_path):
+    result.to_npz(tmp_path / "r.npz")
+    with np.load(tmp_path / "r.npz") as data:
+        assert "variable_name_blocks" in data and "variable_names" not in data
+    loaded = ArrayResult.from_npz(tmp_path / "r.npz")
+    assert isinstance(loaded.variables, LazyNames)
+    assert list(loaded.variables) == list(result.variables)
+    assert list(loaded.constraints) == list(result.constraints)
+    assert loaded.objective == result.objective
+    assert np.array_equal(loaded.duals, result.duals)
+
+
+def test_npz_plain_names(tmp_path):
+    result = ArrayResult(status="Optimal", objective=1.0, variables=["x", "y"], values=np.array([1.0, np.nan]))
+    result.to_npz(tmp_path / "r.npz")
+    loaded = ArrayResult.from_npz(tmp_path / "r.npz")
+    assert list(loaded.variables) == ["x", "y"] and list(loaded.constraints) == []
+    assert np.array_equal(loaded.values, result.values, equal_nan=True)
+
+
+def test_jsonl_matches_columns(result, tmp_path):
+    result = replace(result, values=np.r_[np.nan, result.values[1:]])
+    result.to_jsonl(tmp_path / "r.jsonl")
+    lines = [json.loads(line) for line in (tmp_path / "r.jsonl").read_text().splitlines()]
+    assert lines[0] == {"kind": "model", "name": result.name, "status": "Optimal", "objective": result.objective}
+    rows = lines[1:]
+    assert len(rows) == len(result.variables) + len(result.constraints)
+    for kind, columns in result.columns().items():
+        records = [row for row in rows if row["kind"] == kind]
+        assert [row["name"] for row in records] == columns["name"].tolist()
+        for key, array in columns.items():
+            if key != "name":
+                expected = [None if v != v else v for v in array.tolist()]
+                assert [row[key] for row in records] == expected